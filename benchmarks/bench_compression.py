@@ -0,0 +1,104 @@
+"""
+Бенчмарк сжатия снапшотов LocalStorage.
+
+Сохраняет синтетический нормализованный снапшот без сжатия и с каждым
+доступным кодеком и уровнем, затем загружает его обратно и печатает
+размер файла, степень сжатия и время записи и чтения::
+
+    python -m benchmarks.bench_compression --vacancies 5000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage import compression, paths
+from skillradar.core.storage.local import LocalStorage
+from skillradar.devtools.fake_hh import SKILLS
+
+LEVELS = {"gzip": (1, 6, 9), "xz": (0, 6), "zstd": (1, 3, 10, 19)}
+
+
+def make_vacancies(count: int, description_size: int, seed: int = 0) -> List[NormalizedVacancy]:
+    """
+    Вакансии с HTML-описаниями, похожими на описания hh.ru: общая
+    разметка и словарь, но у каждой вакансии свой текст.
+    """
+    rng = random.Random(seed)
+    alphabet = "абвгдежзиклмнопрстуфхцчшэюя"
+    words = ["".join(rng.choices(alphabet, k=rng.randint(3, 11))) for _ in range(5000)] + list(SKILLS)
+    vacancies = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, 4)
+        parts = []
+        length = 0
+        while length < description_size:
+            sentence = " ".join(rng.choices(words, k=rng.randint(6, 16)))
+            part = f"<li>{sentence.capitalize()}.</li>" if rng.random() < 0.7 else f"<p><strong>{sentence}</strong></p>"
+            parts.append(part)
+            length += len(part)
+        vacancies.append(NormalizedVacancy(
+            id=str(100000 + i),
+            title=f"{skills[0]} developer",
+            url=f"https://hh.ru/vacancy/{100000 + i}",
+            source="hh",
+            company_name=f"Компания {rng.randint(1, 300)}",
+            description="<ul>" + "".join(parts)[:description_size] + "</ul>",
+            skills=skills,
+            location=rng.choice(("Москва", "Санкт-Петербург", "Казань", "Новосибирск")),
+        ))
+    return vacancies
+
+
+def measure(vacancies: List[NormalizedVacancy], codec: Optional[str], level: Optional[int]) -> Tuple[int, float, float]:
+    """Возвращает размер файла, время записи и время чтения снапшота."""
+    storage = LocalStorage(compression=codec, level=level)
+    started = time.perf_counter()
+    storage.save_normalized("bench", vacancies)
+    written = time.perf_counter() - started
+
+    suffix = compression.SUFFIXES[codec] if codec else ""
+    size = (paths.NORMALIZED_DIR / f"bench.json{suffix}").stat().st_size
+
+    started = time.perf_counter()
+    loaded = storage.load_normalized("bench")
+    read = time.perf_counter() - started
+    assert len(loaded) == len(vacancies)
+    return size, written, read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vacancies", type=int, default=2000)
+    parser.add_argument("--description-size", type=int, default=3000, help="длина описания, символов")
+    args = parser.parse_args()
+
+    vacancies = make_vacancies(args.vacancies, args.description_size)
+    runs: List[Tuple[Optional[str], Optional[int]]] = [(None, None)]
+    for codec, levels in LEVELS.items():
+        if codec == "zstd" and compression.zstandard is None:
+            print("zstd: skipped, install the 'zstd' extra")
+            continue
+        runs.extend((codec, level) for level in levels)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # LocalStorage создает все каталоги данных, поэтому переносим их все
+        for attr in ("RAW_DIR", "NORMALIZED_DIR", "ANALYSIS_DIR", "EXTRACTION_DIR"):
+            setattr(paths, attr, Path(tmp) / attr.lower())
+        paths.CATALOG_PATH = Path(tmp) / "catalog.jsonl"
+        print(f"{'codec':<8}{'level':>6}{'size, MB':>11}{'ratio':>8}{'write, s':>10}{'read, s':>9}")
+        plain_size = None
+        for codec, level in runs:
+            size, written, read = measure(vacancies, codec, level)
+            plain_size = plain_size or size
+            print(
+                f"{codec or 'none':<8}{'' if level is None else level:>6}{size / 2**20:>11.2f}"
+                f"{plain_size / size:>8.1f}{written:>10.2f}{read:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
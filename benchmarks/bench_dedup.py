@@ -0,0 +1,102 @@
+"""
+Бенчмарк поиска повторов вакансий (MinHash + LSH).
+
+Генерирует синтетические вакансии, часть из которых — перепосты других
+с небольшими правками, и прогоняет их через MinHashDeduplicator. Печатает
+скорость, точность и полноту найденных повторов, а затем — время второго
+запуска, который загружает индекс с диска и проверяет только новые
+вакансии::
+
+    python -m benchmarks.bench_dedup --vacancies 100000 --reposts 0.2
+"""
+import argparse
+import random
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from skillradar.core.dedup.minhash import MinHashDeduplicator
+from skillradar.core.normalize.models import NormalizedVacancy
+
+from .bench_compression import make_vacancies
+
+
+def with_reposts(
+    count: int, description_size: int, reposts: float, edits: int, seed: int
+) -> Tuple[List[NormalizedVacancy], Dict[str, str]]:
+    """Вакансии вперемешку с перепостами и словарь ID перепоста -> ID оригинала."""
+    rng = random.Random(seed)
+    # ID зависят от seed, чтобы вакансии второго запуска были новыми для индекса
+    originals = [
+        replace(vacancy, id=f"{seed}-{vacancy.id}")
+        for vacancy in make_vacancies(count - int(count * reposts), description_size, seed=seed)
+    ]
+    vacancies = list(originals)
+    truth: Dict[str, str] = {}
+    for i in range(count - len(originals)):
+        original = rng.choice(originals)
+        words = original.description.split(" ")
+        for _ in range(edits):
+            words[rng.randrange(len(words))] = "правка"
+        repost_id = f"{seed}-repost-{i}"
+        vacancies.append(replace(original, id=repost_id, description=" ".join(words)))
+        truth[repost_id] = original.id
+    rng.shuffle(vacancies)
+    return vacancies, truth
+
+
+def check_all(dedup: MinHashDeduplicator, vacancies: List[NormalizedVacancy]) -> Tuple[float, Dict[str, str]]:
+    started = time.perf_counter()
+    found = {}
+    for vacancy in vacancies:
+        duplicate = dedup.check(vacancy)
+        if duplicate is not None:
+            found[duplicate.vacancy_id] = duplicate.duplicate_of
+    return time.perf_counter() - started, found
+
+
+def groups(vacancies: List[NormalizedVacancy], links: Dict[str, str]) -> Dict[str, str]:
+    """ID вакансии -> ID оригинала ее группы (для оригинала — он сам)."""
+    return {v.id: links.get(v.id, v.id) for v in vacancies}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vacancies", type=int, default=20000)
+    parser.add_argument("--reposts", type=float, default=0.2, help="доля перепостов")
+    parser.add_argument("--edits", type=int, default=3, help="сколько слов меняется в перепосте")
+    parser.add_argument("--description-size", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--new", type=int, default=1000, help="новых вакансий во втором запуске")
+    args = parser.parse_args()
+
+    vacancies, truth = with_reposts(args.vacancies, args.description_size, args.reposts, args.edits, seed=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "minhash.jsonl"
+        dedup = MinHashDeduplicator(path, threshold=args.threshold)
+        elapsed, found = check_all(dedup, vacancies)
+        dedup.save()
+
+        # Оригинал и перепост могут прийти в любом порядке: сравниваем группы, а не направление ссылки
+        expected, actual = groups(vacancies, truth), groups(vacancies, found)
+        pairs = [(v.id, expected[v.id] == expected[actual[v.id]]) for v in vacancies if v.id in found]
+        true_found = sum(1 for _, correct in pairs if correct)
+        print(f"vacancies:  {len(vacancies)} in {elapsed:.2f}s ({len(vacancies) / elapsed:.0f}/s)")
+        print(f"duplicates: {len(found)} found, {len(truth)} planted")
+        print(f"precision:  {true_found / max(len(found), 1):.3f}")
+        print(f"recall:     {true_found / max(len(truth), 1):.3f}")
+        print(f"index:      {path.stat().st_size / 2**20:.1f} MB")
+
+        new, _ = with_reposts(args.new, args.description_size, args.reposts, args.edits, seed=1)
+        started = time.perf_counter()
+        second = MinHashDeduplicator(path, threshold=args.threshold)
+        second_found = check_all(second, vacancies[:args.new] + new)[1]
+        elapsed = time.perf_counter() - started
+        print(f"second run: {args.new} known + {len(new)} new in {elapsed:.2f}s "
+              f"(index load included), {len(second_found)} duplicates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Бенчмарк загрузки вакансий на локальной заглушке API hh.ru.
+
+Запускает HHFetcher или весь Pipeline против FakeHHServer и печатает
+скорость загрузки (вакансий в секунду), p50/p99 задержки HTTP-запросов
+и пиковое потребление памяти процессом (RSS). Пиковый RSS считается
+на весь процесс, поэтому каждый сценарий стоит запускать отдельно::
+
+    python -m benchmarks.bench_fetch --scenario fetch --vacancies 5000 --latency 0.02
+    python -m benchmarks.bench_fetch --scenario pipeline --throttle-rate 0.05
+    python -m benchmarks.bench_fetch --scenario pipeline --normalize-workers 4 --queue-size 16
+"""
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import requests
+
+from skillradar.core.fetch.hh import HHFetcher, HHRegionFetcher
+from skillradar.core.fetch.ratelimit import AdaptiveRateLimiter
+from skillradar.core.fetch.session import HttpConfig, build_session
+from skillradar.core.normalize.hh import HhNormalizer
+from skillradar.core.pipeline import Pipeline
+from skillradar.core.storage.local import LocalStorage
+from skillradar.devtools.fake_hh import FakeHHConfig, FakeHHServer
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль ``q`` (0..100) методом ближайшего ранга."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb() -> float:
+    """Пиковый RSS процесса в мегабайтах."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS ru_maxrss в байтах, на Linux — в килобайтах
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=("fetch", "pipeline"), default="fetch")
+    parser.add_argument("--vacancies", type=int, default=2000, help="сколько вакансий загружать")
+    parser.add_argument("--dataset", type=int, default=None, help="размер набора на сервере (по умолчанию --vacancies)")
+    parser.add_argument("--latency", type=float, default=0.01, help="задержка ответа сервера, с")
+    parser.add_argument("--jitter", type=float, default=0.0, help="случайная добавка к задержке, с")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="доля ответов 429")
+    parser.add_argument("--workers", type=int, default=8, help="max_workers HHFetcher")
+    parser.add_argument("--rate", type=float, default=1000.0, help="начальная скорость ограничителя, запросов/с")
+    parser.add_argument("--min-rate", type=float, default=100.0, help="нижняя граница скорости ограничителя")
+    parser.add_argument("--normalize-workers", type=int, default=1, help="потоков стадии normalize в Pipeline")
+    parser.add_argument("--queue-size", type=int, default=64, help="емкость очередей между стадиями Pipeline")
+    args = parser.parse_args()
+
+    server_config = FakeHHConfig(
+        vacancies=args.dataset or args.vacancies,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=0,
+    )
+    # Каждый 429 вдвое снижает скорость ограничителя; без нижней границы
+    # случайные 429 заглушки замедлили бы прогон до min_rate по умолчанию
+    limiter = AdaptiveRateLimiter(
+        rate=args.rate, burst=args.workers, min_rate=min(args.min_rate, args.rate), max_rate=max(args.rate, 50.0)
+    )
+    session = build_session(
+        HttpConfig(pool_size=max(args.workers, 1), backoff_factor=0.01), limiter=limiter
+    )
+
+    latencies: List[float] = []
+
+    def record_latency(response: requests.Response, *hook_args, **hook_kwargs) -> None:
+        latencies.append(response.elapsed.total_seconds())
+
+    session.hooks["response"].append(record_latency)
+
+    with FakeHHServer(server_config) as server, tempfile.TemporaryDirectory() as tmp:
+        regions = HHRegionFetcher(session=session, base_url=server.base_url)
+        fetcher = HHFetcher(max_workers=args.workers, session=session, regions=regions, base_url=server.base_url)
+        kwargs = {"search_query": "python", "total_vacancies": args.vacancies}
+
+        run: Callable[[], int]
+        if args.scenario == "fetch":
+            def run() -> int:
+                return sum(1 for _ in fetcher.iter_fetch(**kwargs))
+        else:
+            pipeline = Pipeline(
+                fetcher=fetcher,
+                normalizer=HhNormalizer(),
+                # Все данные прогона, включая каталог снапшотов, остаются во временном каталоге
+                storage=LocalStorage(root=Path(tmp)),
+                normalize_workers=args.normalize_workers,
+                queue_size=args.queue_size,
+            )
+
+            def run() -> int:
+                return len(pipeline.run(**kwargs))
+
+        started = time.perf_counter()
+        count = run()
+        elapsed = time.perf_counter() - started
+
+    print(f"scenario:        {args.scenario}")
+    print(f"vacancies:       {count} in {elapsed:.2f}s ({count / elapsed:.1f}/s)")
+    print(f"requests:        {len(latencies)} (failed details: {len(fetcher.errors)})")
+    print(f"latency p50/p99: {percentile(latencies, 50) * 1000:.1f} / {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"server statuses: {dict(sorted(server.stats.items()))}")
+    print(f"peak RSS:        {peak_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Бенчмарк пакетной нормализации.
+
+Нормализует синтетические raw-вакансии в формате hh.ru с разным числом
+процессов и размером пачки и печатает пропускную способность::
+
+    python -m benchmarks.bench_normalize --vacancies 200000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+from typing import Any, Dict, List
+
+from skillradar.core.normalize.hh import HhNormalizer
+
+from .bench_compression import make_vacancies
+
+
+def make_raw(count: int, description_size: int) -> List[Dict[str, Any]]:
+    """Raw-вакансии в том виде, в каком они лежат в raw-снапшоте."""
+    return [
+        {
+            "id": vacancy.id,
+            "name": vacancy.title,
+            "description": vacancy.description,
+            "branded_description": None,
+            "key_skills": [{"name": skill} for skill in vacancy.skills],
+            "area": {"id": "1", "name": vacancy.location},
+        }
+        for vacancy in make_vacancies(count, description_size)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vacancies", type=int, default=50000)
+    parser.add_argument("--description-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[1000])
+    args = parser.parse_args()
+
+    raw = make_raw(args.vacancies, args.description_size)
+    normalizer = HhNormalizer()
+    print(f"{'workers':>8}{'chunk':>8}{'time, s':>9}{'vacancies/s':>13}")
+    for workers in args.workers:
+        for chunk_size in args.chunk_size:
+            started = time.perf_counter()
+            count = sum(1 for _ in normalizer.normalize_many(raw, chunk_size=chunk_size, workers=workers))
+            elapsed = time.perf_counter() - started
+            assert count == len(raw) and not normalizer.errors
+            print(f"{workers:>8}{chunk_size:>8}{elapsed:>9.2f}{count / elapsed:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Бенчмарк LocalStorage на tmpfs и на диске.
+
+Несколько процессов одновременно пишут в один корень хранилища, каждый в
+свое пространство имен: нормализованный снапшот и по файлу анализа на
+вакансию. Для каждого корня печатается время и пропускная способность::
+
+    python -m benchmarks.bench_storage_root --workers 4 --vacancies 2000
+
+По умолчанию tmpfs — ``/dev/shm``, диск — текущий каталог.
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+from skillradar.core.analysis.models import AnalysisResult
+from skillradar.core.storage.local import LocalStorage
+
+from .bench_compression import make_vacancies
+
+
+def write_run(root: str, run: int, count: int, description_size: int, shard_depth: int) -> int:
+    """Записывает один запуск пайплайна и возвращает число записанных вакансий."""
+    vacancies = make_vacancies(count, description_size, seed=run)
+    storage = LocalStorage(root=Path(root), namespace=f"run-{run}", shard_depth=shard_depth)
+    storage.save_normalized("vacancies", vacancies)
+    for vacancy in vacancies:
+        storage.save_analysis(AnalysisResult(vacancy_id=vacancy.id, data={"skills": vacancy.skills}))
+    return len(vacancies)
+
+
+def measure(root: Path, workers: int, count: int, description_size: int, shard_depth: int) -> Tuple[float, int]:
+    """Возвращает время и число вакансий, записанных всеми процессами в ``root``."""
+    with tempfile.TemporaryDirectory(dir=root) as tmp, ProcessPoolExecutor(max_workers=workers) as executor:
+        started = time.perf_counter()
+        futures = [
+            executor.submit(write_run, tmp, run, count, description_size, shard_depth) for run in range(workers)
+        ]
+        written = sum(future.result() for future in futures)
+        return time.perf_counter() - started, written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="число параллельных пайплайнов")
+    parser.add_argument("--vacancies", type=int, default=1000, help="вакансий на пайплайн")
+    parser.add_argument("--description-size", type=int, default=2000)
+    parser.add_argument("--shard-depth", type=int, default=1)
+    parser.add_argument("--tmpfs", type=Path, default=Path("/dev/shm"))
+    parser.add_argument("--disk", type=Path, default=Path.cwd())
+    args = parser.parse_args()
+
+    roots: List[Tuple[str, Path]] = [("tmpfs", args.tmpfs), ("disk", args.disk)]
+    print(f"{'root':<7}{'path':<30}{'time, s':>9}{'vacancies/s':>13}")
+    for label, root in roots:
+        if not root.is_dir():
+            print(f"{label:<7}{str(root):<30} skipped, no such directory")
+            continue
+        elapsed, written = measure(root, args.workers, args.vacancies, args.description_size, args.shard_depth)
+        print(f"{label:<7}{str(root):<30}{elapsed:>9.2f}{written / elapsed:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
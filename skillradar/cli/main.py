@@ -1,5 +1,7 @@
-from skillradar.core.fetch.hh import HHFetcher
+from skillradar.core.fetch.hh import DEFAULT_AREAS_CACHE, HHFetcher, HHRegionFetcher
+from skillradar.core.fetch.index import VacancyIndex
 from skillradar.core.pipeline import Pipeline
+from skillradar.core.storage.blobs import BlobStore
 from skillradar.core.storage.local import LocalStorage
 from skillradar.core.normalize.hh import HhNormalizer
 
@@ -8,15 +10,17 @@ def main():
     # config = parse_args()  # Предполагается, что здесь будет парсинг аргументов
 
     # 1. Создание зависимостей
-    fetcher = HHFetcher()
-    storage = LocalStorage()
-
-    # 2. Внедрение зависимостей в Pipeline
-    pipeline = Pipeline(fetcher=fetcher, storage=storage, normalizer=HhNormalizer())
-
-    # 3. Запуск pipeline с параметрами
-    # В реальном приложении параметры придут из config
-    vacancies = pipeline.run(search_query="Python developer", region_id="1", total_vacancies=5)
+    regions = HHRegionFetcher(cache_path=DEFAULT_AREAS_CACHE)
+    fetcher = HHFetcher(index=VacancyIndex(), regions=regions)
+    # Описания одинаковы во многих снапшотах, поэтому хранятся один раз.
+    # Запись идет в фоновом потоке; выход из with дожидается ее окончания
+    with LocalStorage(blobs=BlobStore(), write_behind=True) as storage:
+        # 2. Внедрение зависимостей в Pipeline
+        pipeline = Pipeline(fetcher=fetcher, storage=storage, normalizer=HhNormalizer())
+
+        # 3. Запуск pipeline с параметрами
+        # В реальном приложении параметры придут из config
+        vacancies = pipeline.run(search_query="Python developer", region_id="1", total_vacancies=5)
 
     print(f"Successfully fetched and saved {len(vacancies)} vacancies.")
 
@@ -0,0 +1,152 @@
+"""
+Контрольные точки запусков пайплайна.
+
+Журнал запуска — JSON Lines файл ``~/.skillradar/data/runs/<run_id>.jsonl``.
+По мере работы в него дописываются загруженные raw-вакансии, результаты
+нормализации и отметки стадий extract и analyze. Если запуск упал,
+запуск с тем же ``run_id`` читает журнал и продолжает с места остановки:
+загруженные вакансии не запрашиваются заново, а уже обработанные не
+обрабатываются повторно.
+
+Каждая строка пишется одним ``write`` в файл, открытый на дозапись, поэтому
+после падения процесса журнал содержит все строки, кроме, возможно,
+оборванной последней. Такая строка отрезается при чтении журнала, чтобы
+записи продолженного запуска начинались с новой строки.
+"""
+import json
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from .normalize.models import NormalizationError, NormalizedVacancy
+from .storage import paths
+from .storage.writer import drop_partial_line
+
+
+class RunCheckpoint:
+    """
+    Журнал одного запуска пайплайна.
+
+    При создании журнал читается с диска: ``raw``, ``normalized``,
+    ``errors`` и ``done`` описывают прогресс предыдущих попыток запуска.
+    Записи текущей попытки дописываются в файл, но в эти поля не попадают.
+    Методы ``record_*`` потокобезопасны.
+    """
+
+    def __init__(self, run_id: str, directory: Optional[Path] = None) -> None:
+        """
+        Args:
+            run_id: Идентификатор запуска, имя файла журнала.
+            directory: Каталог журналов. По умолчанию ``paths.RUNS_DIR``.
+        """
+        if not run_id or run_id.startswith(".") or any(sep in run_id for sep in ("/", "\\", os.sep)):
+            raise ValueError(f"Invalid run ID: {run_id!r}")
+        self.run_id = run_id
+        self.path = Path(directory or paths.RUNS_DIR) / f"{run_id}.jsonl"
+        # Имя снапшота и параметры запуска; None, если запуск еще не начинался
+        self.snapshot: Optional[str] = None
+        self.params: Dict[str, Any] = {}
+        self.finished = False
+        # Номер вакансии в выдаче -> raw-вакансия в виде для storage
+        self.raw: Dict[int, Any] = {}
+        self.normalized: Dict[int, NormalizedVacancy] = {}
+        self.errors: Dict[int, NormalizationError] = {}
+        # Стадия -> номера вакансий, которые она уже обработала
+        self.done: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def started(self) -> bool:
+        """Начинался ли запуск с этим ID раньше."""
+        return self.snapshot is not None
+
+    def fetched_ids(self) -> Set[str]:
+        """ID уже загруженных вакансий."""
+        return {str(record["id"]) for record in self.raw.values()}
+
+    def check_params(self, params: Dict[str, Any]) -> None:
+        """
+        Проверяет, что запуск продолжается с теми же параметрами.
+
+        Raises:
+            ValueError: Если параметры отличаются от сохраненных.
+        """
+        if _jsonable(params) != self.params:
+            raise ValueError(
+                f"Run '{self.run_id}' was started with {self.params}, cannot resume it with {_jsonable(params)}"
+            )
+
+    def start(self, snapshot: str, params: Dict[str, Any]) -> None:
+        """Записывает начало запуска: имя снапшота и параметры загрузки."""
+        self.snapshot = snapshot
+        self.params = _jsonable(params)
+        self._append({"run": {"snapshot": snapshot, "params": self.params}})
+
+    def record_fetched(self, index: int, record: Any) -> None:
+        """Запоминает загруженную raw-вакансию (в виде, в котором ее сохраняет storage)."""
+        self._append({"fetched": index, "raw": record})
+
+    def record_normalized(self, index: int, vacancy: NormalizedVacancy) -> None:
+        """Запоминает результат нормализации вакансии."""
+        self._append({"normalized": index, "vacancy": asdict(vacancy)})
+
+    def record_failed(self, error: NormalizationError) -> None:
+        """Запоминает вакансию, которую не удалось нормализовать."""
+        self._append({"failed": error.index, "id": error.vacancy_id, "message": error.message})
+
+    def record_done(self, stage: str, index: int) -> None:
+        """Отмечает, что стадия обработала вакансию и сохранила результат."""
+        self._append({"done": stage, "index": index})
+
+    def finish(self) -> None:
+        """Отмечает, что запуск завершен и снапшоты сохранены."""
+        self.finished = True
+        self._append({"finished": True})
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        data = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Одна строка — один write, так что строки потоков не перемешиваются
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def _load(self) -> None:
+        drop_partial_line(self.path)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Испорченная строка
+                        continue
+                    if "run" in entry:
+                        self.snapshot = entry["run"]["snapshot"]
+                        self.params = entry["run"]["params"]
+                    elif "fetched" in entry:
+                        self.raw[entry["fetched"]] = entry["raw"]
+                    elif "normalized" in entry:
+                        self.normalized[entry["normalized"]] = NormalizedVacancy(**entry["vacancy"])
+                    elif "failed" in entry:
+                        index = entry["failed"]
+                        self.errors[index] = NormalizationError(
+                            index=index, vacancy_id=entry["id"], message=entry["message"]
+                        )
+                    elif "done" in entry:
+                        self.done.setdefault(entry["done"], set()).add(entry["index"])
+                    elif entry.get("finished"):
+                        self.finished = True
+        except FileNotFoundError:
+            return
+
+
+def _jsonable(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Параметры в том виде, в каком они читаются из журнала (кортежи становятся списками и т.п.)."""
+    return json.loads(json.dumps(params, ensure_ascii=False))
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..normalize.models import NormalizedVacancy
+from .models import Duplicate
+
+
+class BaseDeduplicator(ABC):
+    """
+    Абстрактный базовый класс для поиска повторов вакансий.
+    """
+
+    @abstractmethod
+    def check(self, vacancy: NormalizedVacancy) -> Optional[Duplicate]:
+        """
+        Запоминает вакансию и возвращает Duplicate, если она повторяет
+        уже известную вакансию, иначе None.
+        """
+        raise NotImplementedError
+
+    def save(self) -> None:
+        """Сохраняет состояние между запусками; по умолчанию ничего не делает."""
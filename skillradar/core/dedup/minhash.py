@@ -0,0 +1,266 @@
+"""
+Поиск точных и почти точных повторов вакансий: шинглы, MinHash и LSH.
+
+Текст вакансии (название и описание без HTML) разбивается на шинглы —
+последовательности из ``shingle_size`` слов. Сигнатура MinHash из
+``num_perm`` чисел сохраняет коэффициент Жаккара между множествами
+шинглов: доля совпавших позиций двух сигнатур — его оценка. Сигнатура
+считается одним хешем на шингл (one permutation hashing): хеш выбирает
+ячейку и значение, в ячейке остается минимум, а пустые ячейки коротких
+текстов заполняются из соседних (densification).
+
+Чтобы не сравнивать каждую вакансию со всеми, сигнатура делится на
+``bands`` полос, и кандидатами считаются только вакансии, совпавшие с
+новой хотя бы в одной полосе целиком (LSH). Кандидаты проверяются по
+полной сигнатуре. В полосы попадает только первая вакансия каждой группы
+повторов, поэтому число кандидатов не растет с числом перепостов.
+
+Индекс хранится в JSON Lines файле и только дописывается, так что
+следующие запуски сверяют с ним лишь новые вакансии. Строка, оборванная
+падением процесса, отрезается при загрузке индекса.
+"""
+import base64
+import hashlib
+import html
+import json
+import operator
+import os
+import re
+import threading
+import zlib
+from array import array
+from bisect import bisect
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..normalize.models import NormalizedVacancy
+from ..storage import paths
+from ..storage.writer import drop_partial_line
+from .base import BaseDeduplicator
+from .models import Duplicate
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+
+_MASK64 = (1 << 64) - 1
+# Нечетные константы для перемешивания хешей
+_GOLDEN64 = 0x9E3779B97F4A7C15
+_ROTATION = 0x9E3779B1
+# Значение пустой ячейки, больше любого 32-битного
+_EMPTY = 1 << 32
+
+
+def tokenize(text: str) -> List[str]:
+    """Слова текста в нижнем регистре, без HTML-разметки и пунктуации."""
+    return _WORD_RE.findall(html.unescape(_TAG_RE.sub(" ", text)).lower())
+
+
+def minhash(tokens: Sequence[str], shingle_size: int = 5, num_perm: int = 128) -> array:
+    """
+    Возвращает MinHash-сигнатуру множества шинглов текста.
+
+    Текст короче ``shingle_size`` слов считается одним шинглом.
+    """
+    if len(tokens) < shingle_size:
+        shingles: Iterator[str] = iter([" ".join(tokens)])
+    else:
+        shingles = map(" ".join, zip(*(tokens[i:] for i in range(shingle_size))))
+    bins = [_EMPTY] * num_perm
+    for value in set(map(zlib.crc32, map(str.encode, shingles))):
+        # Старшая половина выбирает ячейку, младшая — значение в ней
+        value = (value * _GOLDEN64) & _MASK64
+        cell = (value >> 32) % num_perm
+        value &= 0xFFFFFFFF
+        if value < bins[cell]:
+            bins[cell] = value
+    _densify(bins)
+    return array("I", bins)
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Оценка коэффициента Жаккара по двум сигнатурам одной длины."""
+    return sum(map(operator.eq, a, b)) / len(a)
+
+
+def _densify(bins: List[int]) -> None:
+    # Пустая ячейка берет значение ближайшей непустой справа (по кругу),
+    # сдвинутое на расстояние до нее, чтобы у одинаковых текстов заполнение совпадало
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+    if len(filled) == len(bins):
+        return
+    n = len(bins)
+    for i in range(n):
+        if bins[i] == _EMPTY:
+            j = filled[bisect(filled, i) % len(filled)]
+            bins[i] = (bins[j] + ((j - i) % n) * _ROTATION) & 0xFFFFFFFF
+
+
+class MinHashDeduplicator(BaseDeduplicator):
+    """
+    Находит повторы вакансий по сохраняемому между запусками индексу.
+
+    Каждая вакансия, переданная в ``check``, попадает в индекс. Первая
+    вакансия группы повторов остается в ней главной, остальные ссылаются
+    на нее: на точную копию текста — по хешу нормализованного текста, на
+    почти точную — если оценка коэффициента Жаккара не ниже ``threshold``.
+    Вакансия, уже бывшая в индексе, сохраняет свою группу.
+
+    Индекс загружается при первом обращении; новые записи дописываются в
+    файл вызовом ``save``. ``check`` потокобезопасен.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        threshold: float = 0.8,
+        shingle_size: int = 5,
+        num_perm: int = 128,
+        bands: int = 16,
+    ) -> None:
+        """
+        Args:
+            path: Файл индекса. По умолчанию ``~/.skillradar/data/index/minhash.jsonl``.
+            threshold: Минимальная оценка коэффициента Жаккара для повтора.
+            shingle_size: Число слов в шингле.
+            num_perm: Длина сигнатуры.
+            bands: Число полос LSH; ``num_perm`` должно делиться на него.
+                Больше полос — больше кандидатов и меньше пропущенных повторов.
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if shingle_size < 1:
+            raise ValueError("shingle_size must be at least 1")
+        if bands < 1 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+        self.path = Path(path or paths.INDEX_DIR / "minhash.jsonl")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self._rows = num_perm // bands
+        self._loaded = False
+        # ID вакансии -> (ID главной вакансии группы, оценка сходства с ней)
+        self._known: Dict[str, Tuple[str, float]] = {}
+        # Хеш нормализованного текста -> ID главной вакансии группы
+        self._exact: Dict[str, str] = {}
+        # Сигнатуры главных вакансий подряд, по num_perm чисел
+        self._signatures = array("I")
+        self._roots: List[str] = []
+        # Полоса -> хеш полосы сигнатуры -> номера главных вакансий
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._known)
+
+    def check(self, vacancy: NormalizedVacancy) -> Optional[Duplicate]:
+        tokens = tokenize(f"{vacancy.title}\n{vacancy.description or ''}")
+        with self._lock:
+            self._load()
+            known = self._known.get(vacancy.id)
+            if known is None:
+                known = self._add(vacancy.id, tokens)
+        duplicate_of, score = known
+        if duplicate_of == vacancy.id:
+            return None
+        return Duplicate(vacancy_id=vacancy.id, duplicate_of=duplicate_of, similarity=score)
+
+    def save(self) -> None:
+        """Дописывает в файл индекса вакансии, добавленные с прошлого сохранения."""
+        with self._lock:
+            if not self._pending:
+                return
+            lines = self._pending
+            if not self.path.exists():
+                lines = [{"params": self._params()}] + lines
+            data = "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines).encode("utf-8")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            self._pending = []
+
+    def _add(self, vacancy_id: str, tokens: List[str]) -> Tuple[str, float]:
+        if not tokens:
+            # Пустой текст не с чем сравнивать
+            self._known[vacancy_id] = (vacancy_id, 1.0)
+            return vacancy_id, 1.0
+        exact = hashlib.blake2b(" ".join(tokens).encode("utf-8"), digest_size=16).hexdigest()
+        entry: Dict[str, Any] = {"id": vacancy_id, "exact": exact}
+        duplicate_of = self._exact.get(exact)
+        score = 1.0
+        if duplicate_of is None:
+            signature = minhash(tokens, self.shingle_size, self.num_perm)
+            duplicate_of, score = self._closest(signature)
+            if duplicate_of is None:
+                duplicate_of, score = vacancy_id, 1.0
+                self._add_root(vacancy_id, signature)
+                entry["sig"] = base64.b64encode(signature.tobytes()).decode("ascii")
+            self._exact[exact] = duplicate_of
+        entry.update(of=duplicate_of, sim=round(score, 4))
+        self._pending.append(entry)
+        self._known[vacancy_id] = (duplicate_of, score)
+        return duplicate_of, score
+
+    def _closest(self, signature: array) -> Tuple[Optional[str], float]:
+        """Главная вакансия с самой похожей сигнатурой, если сходство не ниже порога."""
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        best, best_score = None, self.threshold
+        for position in candidates:
+            start = position * self.num_perm
+            score = similarity(signature, self._signatures[start:start + self.num_perm])
+            if score >= best_score:
+                best, best_score = position, score
+        if best is None:
+            return None, 0.0
+        return self._roots[best], best_score
+
+    def _add_root(self, vacancy_id: str, signature: array) -> None:
+        position = len(self._roots)
+        self._roots.append(vacancy_id)
+        self._signatures.extend(signature)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(position)
+
+    def _band_keys(self, signature: array) -> Iterator[int]:
+        for band in range(self.bands):
+            yield hash(signature[band * self._rows:(band + 1) * self._rows].tobytes())
+
+    def _params(self) -> Dict[str, int]:
+        return {"shingle_size": self.shingle_size, "num_perm": self.num_perm}
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        # Иначе следующий save допишет строку к оборванной, и обе пропадут
+        drop_partial_line(self.path)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Испорченная строка
+                        continue
+                    if "params" in entry:
+                        if entry["params"] != self._params():
+                            raise ValueError(
+                                f"Index {self.path} was built with {entry['params']}, not {self._params()}"
+                            )
+                        continue
+                    self._known[entry["id"]] = (entry["of"], entry["sim"])
+                    self._exact.setdefault(entry["exact"], entry["of"])
+                    if "sig" in entry:
+                        signature = array("I")
+                        signature.frombytes(base64.b64decode(entry["sig"]))
+                        self._add_root(entry["id"], signature)
+        except FileNotFoundError:
+            pass
+        self._loaded = True
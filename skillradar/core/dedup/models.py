@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Duplicate:
+    """
+    Вакансия, повторяющая другую вакансию.
+    """
+
+    vacancy_id: str
+    # ID вакансии, которая остается вместо этой
+    duplicate_of: str
+    # Оценка коэффициента Жаккара между текстами, 1.0 — точная копия
+    similarity: float
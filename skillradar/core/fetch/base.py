@@ -1,6 +1,7 @@
 import functools
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Collection, Dict, Iterator, List, Optional
 
 from requests.exceptions import ConnectionError, RequestException, Timeout
 
@@ -16,6 +17,34 @@ class VacancyFetcher(ABC):
     ) -> List[Dict[str, Any]]:
         pass
 
+    def iter_fetch(
+        self,
+        *,
+        search_query: str,
+        total_vacancies: int,
+        region_id: Optional[int] = None,
+        skip_ids: Optional[Collection[str]] = None,
+    ) -> Iterator[Any]:
+        """
+        Отдает вакансии по одной по мере получения.
+
+        Вакансии с ID из ``skip_ids`` (уже загруженные прерванным запуском)
+        пропускаются и не входят в ``total_vacancies``.
+
+        Реализация по умолчанию просто проходит по результату ``fetch``;
+        fetcher'ы, умеющие работать потоково, переопределяют этот метод.
+        """
+        skip = set(skip_ids or ())
+        vacancies = self.fetch(
+            search_query=search_query, total_vacancies=total_vacancies + len(skip), region_id=region_id
+        )
+        fresh = (vacancy for vacancy in vacancies if str(_vacancy_id(vacancy)) not in skip)
+        yield from islice(fresh, total_vacancies)
+
+
+def _vacancy_id(vacancy: Any) -> Any:
+    return vacancy.get("id") if isinstance(vacancy, dict) else getattr(vacancy, "id", None)
+
 
 class RegionFetcher(ABC):
     @abstractmethod
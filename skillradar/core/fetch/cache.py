@@ -0,0 +1,259 @@
+"""
+Дисковый кэш HTTP-ответов для fetcher'ов.
+
+Подключается к сессии через ``session.build_session(cache=...)``.
+Свежие записи отдаются без обращения к сети, устаревшие
+перепроверяются условным запросом (If-None-Match / If-Modified-Since).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from ..storage import paths
+
+# Заголовки, которые теряют смысл после того, как requests раскодировал тело
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+@dataclass
+class CacheStats:
+    """Счетчики обращений к кэшу."""
+
+    hits: int = 0
+    misses: int = 0
+    # Устаревшие записи, которые сервер подтвердил ответом 304
+    revalidated: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class CacheEntry:
+    """Закэшированный ответ: метаданные и тело."""
+
+    key: str
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    stored_at: float
+    body: bytes
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Заголовки для условного запроса на перепроверку записи."""
+        headers = CaseInsensitiveDict(self.headers)
+        validators = {}
+        if "ETag" in headers:
+            validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        return validators
+
+    def to_response(self, request: requests.PreparedRequest) -> requests.Response:
+        """Собирает requests.Response из записи кэша."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url or self.url
+        response.request = request
+        response.reason = "OK"
+        return response
+
+
+class ResponseCache:
+    """
+    Кэш ответов на диске с ограничением размера и вытеснением LRU.
+
+    Ключ записи — метод и полный URL запроса вместе с параметрами.
+    Каждая запись хранится в двух файлах: ``<key>.json`` с метаданными
+    и ``<key>.body`` с телом ответа. Порядок LRU восстанавливается
+    при создании кэша по времени изменения файлов метаданных.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl: float = 3600.0,
+    ) -> None:
+        """
+        Args:
+            directory: Каталог кэша. По умолчанию ``~/.skillradar/cache/http``.
+            max_bytes: Предельный суммарный размер тел ответов в байтах.
+            ttl: Сколько секунд запись считается свежей и отдается
+                без перепроверки.
+        """
+        self.directory = directory or paths.HTTP_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # key -> размер тела; порядок — от давно использованных к недавним
+        self._lru: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._scan()
+
+    @property
+    def size(self) -> int:
+        """Суммарный размер закэшированных тел в байтах."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @staticmethod
+    def key_for(method: str, url: str) -> str:
+        return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        send: Callable[[requests.PreparedRequest], requests.Response],
+    ) -> requests.Response:
+        """
+        Отдает ответ на GET-запрос из кэша или выполняет его функцией ``send``.
+
+        Свежая запись возвращается без обращения к сети. Для устаревшей
+        к запросу добавляются валидаторы, и при ответе 304 возвращается
+        закэшированное тело. Успешные ответы сохраняются в кэш.
+        """
+        if request.method != "GET" or not request.url:
+            return send(request)
+
+        key = self.key_for(request.method, request.url)
+        entry = self.get(key)
+        if entry is not None and entry.is_fresh(self.ttl):
+            self._count("hits")
+            return entry.to_response(request)
+        if entry is not None:
+            request.headers.update(entry.validators())
+
+        response = send(request)
+        if entry is not None and response.status_code == 304:
+            self._count("revalidated")
+            self.refresh(entry, response)
+            # Ответ 304 без тела больше не нужен: соединение возвращается в пул
+            response.close()
+            return entry.to_response(request)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self.put(key, response)
+        return response
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Возвращает запись и отмечает ее как недавно использованную."""
+        with self._lock:
+            if key not in self._lru:
+                return None
+            self._lru.move_to_end(key)
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            body = self._body_path(key).read_bytes()
+            os.utime(self._meta_path(key))
+        except (OSError, ValueError):
+            # Запись повреждена или удалена извне — считаем, что ее нет
+            self._remove(key)
+            return None
+        return CacheEntry(key=key, body=body, **meta)
+
+    def put(self, key: str, response: requests.Response) -> None:
+        """Сохраняет успешный ответ и вытесняет старые записи при переполнении."""
+        body = response.content
+        meta: Dict[str, Any] = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "stored_at": time.time(),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(self._body_path(key), body)
+        self._write_atomic(self._meta_path(key), json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._size += len(body) - self._lru.pop(key, 0)
+            self._lru[key] = len(body)
+        self._evict()
+
+    def refresh(self, entry: CacheEntry, response: requests.Response) -> None:
+        """Продлевает запись после ответа 304, обновляя ее заголовки."""
+        headers = CaseInsensitiveDict(entry.headers)
+        for name in ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date"):
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        entry.headers = dict(headers)
+        entry.stored_at = time.time()
+        meta = {
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "stored_at": entry.stored_at,
+        }
+        self._write_atomic(self._meta_path(entry.key), json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        with self._lock:
+            keys = list(self._lru)
+        for key in keys:
+            self._remove(key)
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                if self._size <= self.max_bytes or not self._lru:
+                    return
+                key = next(iter(self._lru))
+            self._remove(key)
+            self._count("evictions")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self._size -= self._lru.pop(key, 0)
+        for path in (self._meta_path(key), self._body_path(key)):
+            path.unlink(missing_ok=True)
+
+    def _scan(self) -> None:
+        if not self.directory.exists():
+            return
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                entries.append((meta_path.stat().st_mtime, meta_path.stem, body_path.stat().st_size))
+            except FileNotFoundError:
+                meta_path.unlink(missing_ok=True)
+        for _, key, size in sorted(entries):
+            self._lru[key] = size
+            self._size += size
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.body"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        # Уникальное имя: кэшем могут одновременно пользоваться несколько процессов
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
@@ -1,22 +1,123 @@
-from typing import Any, Dict, List, Optional
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Collection, Deque, Dict, Iterator, List, Optional, Tuple
 
 import requests
 
-from .base import RegionFetcher, VacancyFetcher, fetch_exceptions
+from ..storage import paths
+from . import partition
+from .base import FetcherException, RegionFetcher, VacancyFetcher, fetch_exceptions
+from .index import VacancyIndex
 from .models import RawVacancy
-
+from .partition import Filters, SearchPartitioner
+from .regions import RegionIndex
+from .session import get_session
 
 BASE_URL = "https://api.hh.ru/"
 
+# Максимальный размер страницы поиска hh.ru
+PER_PAGE = 100
+
+# Файл для кэша дерева регионов между запусками
+DEFAULT_AREAS_CACHE = paths.CACHE_DIR / "hh_areas.json"
+
+
+def build_search_params(
+    search_query: str,
+    region_id: Optional[int],
+    page: int,
+    per_page: int,
+    filters: Optional[Filters] = None,
+) -> Dict[str, Any]:
+    """
+    Формирует параметры запроса к эндпоинту поиска вакансий.
+
+    ``filters`` — дополнительные параметры поиска (``area``, ``date_from``,
+    ``date_to``), например подзапрос из SearchPartitioner.
+    """
+    params: Dict[str, Any] = {
+        "text": search_query,
+        "per_page": per_page,
+        "page": page,
+        "search_field": ["name", "description"],
+    }
+    if region_id:
+        params["area"] = region_id
+    if filters:
+        params.update(filters)
+    return params
+
+
+def parse_vacancy(details: Dict[str, Any]) -> RawVacancy:
+    """Приводит детальную информацию о вакансии к нужной структуре RawVacancy."""
+    return RawVacancy(
+        id=details.get("id", ""),
+        name=details.get("name", ""),
+        description=details.get("description"),
+        branded_description=details.get("branded_description"),
+        key_skills=[skill["name"] for skill in details.get("key_skills", [])],
+        area=details.get("area"),
+    )
+
 
 class HHFetcher(VacancyFetcher):
     """
     Класс для получения вакансий с HeadHunter API.
 
     Получает детальную информацию по каждой вакансии,
-    включая описание и ключевые навыки.
+    включая описание и ключевые навыки. Детали вакансий страницы
+    запрашиваются параллельно пулом из ``max_workers`` потоков.
+
+    Если передан ``index``, детали запрашиваются только для новых вакансий
+    и вакансий, у которых изменился ``published_at`` в поисковой выдаче;
+    остальные берутся из индекса.
+
+    Если запрошено больше вакансий, чем API отдает на один поиск
+    (``partition.MAX_SEARCH_DEPTH``), поиск делится на подзапросы по регионам
+    и датам публикации (см. SearchPartitioner). Их выдача загружается
+    параллельно, а повторы вакансий отбрасываются по ID.
     """
 
+    def __init__(
+        self,
+        max_workers: int = 8,
+        session: Optional[requests.Session] = None,
+        index: Optional[VacancyIndex] = None,
+        partition_search: bool = True,
+        regions: Optional["HHRegionFetcher"] = None,
+        base_url: str = BASE_URL,
+    ) -> None:
+        """
+        Args:
+            max_workers: Максимальное число одновременных запросов деталей вакансий
+                и страниц подзапросов. Не должно превышать размер пула соединений сессии.
+            session: HTTP-сессия (см. ``session.build_session``). По умолчанию
+                используется общая сессия процесса.
+            index: Индекс уже загруженных вакансий для инкрементальной загрузки.
+            partition_search: Делить ли большие поиски на подзапросы.
+            regions: Источник дерева регионов для деления поиска.
+            base_url: Адрес API, например локальной заглушки для тестов и бенчмарков.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers должен быть не меньше 1")
+        self.max_workers = max_workers
+        self.session = session or get_session()
+        self.base_url = base_url
+        self.index = index
+        self.partition_search = partition_search
+        self.regions = regions or HHRegionFetcher(session=self.session, base_url=base_url)
+        # Ошибки получения деталей за последний вызов fetch: ID вакансии -> исключение
+        self.errors: Dict[str, FetcherException] = {}
+        # Сколько вакансий за последний вызов fetch взято из индекса без запроса деталей
+        self.reused = 0
+
     @fetch_exceptions
     def fetch(
         self,
@@ -34,66 +135,284 @@ class HHFetcher(VacancyFetcher):
             region_id: ID региона для поиска (опционально).
 
         Returns:
-            Список объектов RawVacancy.
+            Список объектов RawVacancy в порядке выдачи поиска.
+            Вакансии, детали которых получить не удалось, пропускаются
+            и записываются в ``self.errors``.
         """
-        vacancies = []
-        per_page = 100
-        page = 0
+        return list(
+            self.iter_fetch(search_query=search_query, total_vacancies=total_vacancies, region_id=region_id)
+        )
+
+    def iter_fetch(
+        self,
+        *,
+        search_query: str,
+        total_vacancies: int,
+        region_id: Optional[int] = None,
+        skip_ids: Optional[Collection[str]] = None,
+    ) -> Iterator[RawVacancy]:
+        """
+        Потоковый вариант ``fetch``: отдает вакансии в порядке выдачи поиска
+        сразу по мере получения их деталей, не накапливая весь список.
+
+        В памяти одновременно находится не больше одной страницы поиска.
+        Ошибки запросов выбрасываются как FetcherException во время итерации.
 
-        while len(vacancies) < total_vacancies:
-            params: Dict[str, Any] = {
-                "text": search_query,
-                "per_page": per_page,
-                "page": page,
-                "search_field": ["name", "description"],
-            }
-            if region_id:
-                params["area"] = region_id
-
-            r = requests.get(f"{BASE_URL}vacancies", params)
-            r.raise_for_status()
-            data = r.json()
-
-            found_items = data.get("items", [])
-            if not found_items:
-                break
-
-            for item in found_items:
-                if len(vacancies) >= total_vacancies:
-                    break
-                details = self._get_vacancy_details(item["id"])
-                if details:
-                    vacancies.append(self._parse_vacancy(details))
+        Для вакансий из ``skip_ids`` детали не запрашиваются: при
+        продолжении прерванного запуска заново читается только выдача
+        (один запрос на страницу), а ``total_vacancies`` — сколько
+        вакансий догрузить сверх уже загруженных.
+        """
+        fetched = 0
+        self.errors = {}
+        self.reused = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                skip = set(skip_ids or ())
+                listing = self._iter_listing(search_query, region_id, total_vacancies + len(skip))
+                if skip:
+                    listing = (item for item in listing if item["id"] not in skip)
+                # Загружаем ровно столько вакансий, сколько не хватает; если часть
+                # запросов упала, добираем следующие вакансии из выдачи.
+                while fetched < total_vacancies:
+                    batch = list(islice(listing, min(total_vacancies - fetched, PER_PAGE)))
+                    if not batch:
+                        break
+                    for vacancy in self._iter_batch(executor, batch):
+                        if vacancy:
+                            fetched += 1
+                            yield vacancy
+        finally:
+            # Новые вакансии уже дописаны в индекс; убираем из него устаревшие строки
+            if self.index is not None:
+                self.index.save()
+
+    def _iter_listing(
+        self, search_query: str, region_id: Optional[int], total_vacancies: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Отдает элементы поисковой выдачи без повторов.
+
+        Если нужно больше вакансий, чем отдает один поиск, выдача собирается
+        из подзапросов, которые загружаются параллельно. Подзапросы
+        запускаются по мере надобности: пока уже запущенные не покрывают
+        ``total_vacancies`` и их не больше ``max_workers`` одновременно.
+        """
+        filters: Filters = {"area": region_id} if region_id else {}
+        if not self.partition_search or total_vacancies <= partition.MAX_SEARCH_DEPTH:
+            yield from self._iter_search(search_query, filters, total_vacancies)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            partitioner = SearchPartitioner(
+                count=lambda part: self._count(search_query, part),
+                child_areas=self._child_areas,
+                executor=executor,
+            )
+            parts = partitioner.plan(filters)
+            seen = set()
+            # Загружаемые подзапросы в порядке плана и сколько вакансий от каждого ждем
+            pending: Deque[Tuple[Future, int]] = deque()
+            expected = 0
+            try:
+                while True:
+                    while len(pending) < self.max_workers and len(seen) + expected < total_vacancies:
+                        part = next(parts, None)
+                        if part is None:
+                            break
+                        part_filters, found = part
+                        limit = min(found, partition.MAX_SEARCH_DEPTH, total_vacancies - len(seen) - expected)
+                        pending.append(
+                            (executor.submit(self._collect_search, search_query, part_filters, limit), limit)
+                        )
+                        expected += limit
+                    if not pending:
+                        return
+                    future, limit = pending.popleft()
+                    expected -= limit
+                    for item in future.result():
+                        if item["id"] not in seen:
+                            seen.add(item["id"])
+                            yield item
+            finally:
+                # Выдача больше не нужна: не начатые подзапросы не загружаем
+                for future, _ in pending:
+                    future.cancel()
+
+    def _iter_search(self, search_query: str, filters: Filters, limit: int) -> Iterator[Dict[str, Any]]:
+        """
+        Постранично отдает выдачу одного поиска, пока не наберется ``limit``
+        элементов или не будет достигнута максимальная глубина выдачи.
+        Следующая страница запрашивается только когда она понадобится.
+        """
+        page = 0
+        yielded = 0
+        while yielded < limit and page * PER_PAGE < partition.MAX_SEARCH_DEPTH:
+            data = self._search_page(search_query, filters, page, PER_PAGE)
+            items = data.get("items", [])
+            if not items:
+                return
+            yield from items
+            yielded += len(items)
 
             page += 1
             if page >= data.get("pages", page):
-                break
+                return
+
+    def _collect_search(self, search_query: str, filters: Filters, limit: int) -> List[Dict[str, Any]]:
+        """
+        Загружает выдачу подзапроса целиком, оставляя от элементов только
+        поля, нужные для загрузки деталей, чтобы не держать в памяти сниппеты.
+        """
+        return [
+            {"id": item["id"], "published_at": item.get("published_at")}
+            for item in islice(self._iter_search(search_query, filters, limit), limit)
+        ]
+
+    def _count(self, search_query: str, filters: Filters) -> int:
+        """Возвращает число вакансий, найденных поиском с фильтрами."""
+        return self._search_page(search_query, filters, 0, 1).get("found", 0)
+
+    def _child_areas(self, area_id: Optional[str]) -> List[str]:
+        """Возвращает ID дочерних регионов (для None — регионы верхнего уровня)."""
+        return list(self.regions.index().children(area_id))
+
+    def _iter_batch(
+        self, executor: ThreadPoolExecutor, items: List[Dict[str, Any]]
+    ) -> Iterator[Optional[RawVacancy]]:
+        """
+        Отдает вакансии для элементов поисковой выдачи в том же порядке.
 
-        return vacancies[:total_vacancies]
+        Неизменившиеся вакансии берутся из индекса, детали остальных
+        запрашиваются параллельно. Для неудачных запросов отдается None.
+        """
+        cached = [self._from_index(item) for item in items]
+        to_fetch = [item for item, vacancy in zip(items, cached) if vacancy is None]
+        self.reused += len(items) - len(to_fetch)
+        # executor.map отдает результаты в порядке выдачи поиска, как только они готовы
+        fetched = executor.map(self._fetch_vacancy, to_fetch)
+        for vacancy in cached:
+            yield vacancy if vacancy is not None else next(fetched)
+
+    def _from_index(self, item: Dict[str, Any]) -> Optional[RawVacancy]:
+        if self.index is None:
+            return None
+        return self.index.get(item["id"], item.get("published_at"))
+
+    def _fetch_vacancy(self, item: Dict[str, Any]) -> Optional[RawVacancy]:
+        """Запрашивает детали вакансии и обновляет индекс."""
+        details = self._try_get_vacancy_details(item["id"])
+        if not details:
+            return None
+        vacancy = parse_vacancy(details)
+        if self.index is not None:
+            self.index.put(vacancy, item.get("published_at"))
+        return vacancy
+
+    @fetch_exceptions
+    def _search_page(self, search_query: str, filters: Filters, page: int, per_page: int) -> Dict[str, Any]:
+        """Получает одну страницу результатов поиска вакансий."""
+        params = build_search_params(search_query, None, page, per_page, filters)
+        r = self.session.get(f"{self.base_url}vacancies", params=params)
+        r.raise_for_status()
+        return r.json()
+
+    def _try_get_vacancy_details(self, vacancy_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Как ``_get_vacancy_details``, но не прерывает загрузку страницы:
+        ошибка сохраняется в ``self.errors``, а вместо деталей возвращается None.
+        """
+        try:
+            return self._get_vacancy_details(vacancy_id)
+        except FetcherException as e:
+            self.errors[vacancy_id] = e
+            return None
 
     @fetch_exceptions
     def _get_vacancy_details(self, vacancy_id: str) -> Optional[Dict[str, Any]]:
         """Получает полную информацию о вакансии по ее ID."""
-        r = requests.get(f"{BASE_URL}vacancies/{vacancy_id}")
+        r = self.session.get(f"{self.base_url}vacancies/{vacancy_id}")
         r.raise_for_status()
         return r.json()
 
-    def _parse_vacancy(self, details: Dict[str, Any]) -> RawVacancy:
-        """Приводит детальную информацию о вакансии к нужной структуре RawVacancy."""
-        return RawVacancy(
-            id=details.get("id", ""),
-            name=details.get("name", ""),
-            description=details.get("description"),
-            branded_description=details.get("branded_description"),
-            key_skills=[skill["name"] for skill in details.get("key_skills", [])],
-            area=details.get("area"),
-        )
 
+class HHRegionFetcher(RegionFetcher):
+    """
+    Получает дерево регионов HeadHunter.
 
+    Дерево меняется редко, поэтому оно кэшируется в памяти на ``ttl``
+    секунд, а если задан ``cache_path`` — еще и на диске, чтобы им
+    пользовались следующие запуски. Для поиска по дереву используйте
+    ``index()``.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        cache_path: Optional[Path] = None,
+        ttl: float = 24 * 60 * 60,
+        base_url: str = BASE_URL,
+    ) -> None:
+        """
+        Args:
+            session: HTTP-сессия. По умолчанию используется общая сессия процесса.
+            cache_path: Файл для хранения дерева между запусками
+                (например, ``DEFAULT_AREAS_CACHE``). Без него кэш только в памяти.
+            ttl: Время жизни кэша в секундах.
+            base_url: Адрес API.
+        """
+        self.session = session or get_session()
+        self.base_url = base_url
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._tree: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at = 0.0
+        self._index: Optional[RegionIndex] = None
+        self._lock = threading.Lock()
 
-class HHRegionFetcher(RegionFetcher):
-    @fetch_exceptions
     def fetch(self) -> List[Dict[str, Any]]:
-        r = requests.get(f"{BASE_URL}areas")
+        """Возвращает дерево регионов из кэша или загружает его заново."""
+        with self._lock:
+            if self._tree is None or not self._is_fresh(self._fetched_at):
+                self._tree, self._fetched_at = self._load_cached() or self._download()
+                self._index = None
+            return self._tree
+
+    def index(self) -> RegionIndex:
+        """Возвращает плоский индекс актуального дерева регионов."""
+        tree = self.fetch()
+        with self._lock:
+            if self._index is None or self._tree is not tree:
+                self._index = RegionIndex(tree)
+            return self._index
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl
+
+    def _load_cached(self) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            tree, fetched_at = cached["areas"], float(cached["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # Испорченный кэш считается промахом: дерево загружается заново
+            return None
+        if not isinstance(tree, list) or not self._is_fresh(fetched_at):
+            return None
+        return tree, fetched_at
+
+    @fetch_exceptions
+    def _download(self) -> Tuple[List[Dict[str, Any]], float]:
+        r = self.session.get(f"{self.base_url}areas")
         r.raise_for_status()
-        return r.json()
+        tree, fetched_at = r.json(), time.time()
+        if self.cache_path is not None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{uuid.uuid4().hex}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": fetched_at, "areas": tree}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        return tree, fetched_at
@@ -0,0 +1,239 @@
+"""
+Асинхронный fetcher вакансий HeadHunter на asyncio.
+
+Требует опциональную зависимость ``httpx`` (``pip install skill-radar[async]``).
+"""
+import asyncio
+import functools
+import math
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .base import FetcherException
+from .hh import BASE_URL, build_search_params, parse_vacancy
+from .models import RawVacancy
+from .ratelimit import AdaptiveRateLimiter, get_rate_limiter
+from .session import HttpConfig, parse_retry_after
+
+
+def async_fetch_exceptions(func):
+    """
+    Асинхронный аналог ``fetch_exceptions``: перевыбрасывает ошибки httpx
+    в виде того же FetcherException, что и синхронные fetcher'ы.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except httpx.NetworkError as e:
+            raise FetcherException("Ошибка сети. Не удалось подключиться к серверу.") from e
+        except httpx.TimeoutException as e:
+            raise FetcherException("Превышено время ожидания ответа от сервера.") from e
+        except httpx.HTTPError as e:
+            raise FetcherException(f"Произошла ошибка при выполнении запроса: {e}") from e
+        except (ValueError, TypeError) as e:
+            raise FetcherException("Ошибка парсинга ответа от сервера.") from e
+
+    return wrapper
+
+
+def build_async_client(config: Optional[HttpConfig] = None) -> httpx.AsyncClient:
+    """
+    Создает httpx.AsyncClient с пулом соединений и таймаутом из ``config``.
+
+    Ожидание свободного соединения в пуле не ограничено по времени:
+    число одновременных запросов ограничивает семафор fetcher'а.
+    """
+    config = config or HttpConfig()
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=config.pool_size, max_keepalive_connections=config.pool_size),
+        timeout=httpx.Timeout(config.timeout, pool=None),
+    )
+
+
+class AsyncHHFetcher:
+    """
+    Асинхронный аналог HHFetcher для работы внутри event loop.
+
+    Реализует тот же контракт, что и ``VacancyFetcher.fetch``, но в виде
+    корутины. Страницы поиска и детали вакансий запрашиваются конкурентно;
+    число одновременных запросов ограничено семафором ``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 50,
+        client: Optional[httpx.AsyncClient] = None,
+        config: Optional[HttpConfig] = None,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        base_url: str = BASE_URL,
+    ) -> None:
+        """
+        Args:
+            max_concurrency: Максимальное число одновременных HTTP-запросов.
+            client: Общий httpx.AsyncClient. Если не передан, на каждый вызов
+                fetch создается собственный клиент (см. ``build_async_client``).
+            config: Настройки пула, таймаутов и повторов.
+            limiter: Ограничитель частоты запросов. По умолчанию общий
+                для процесса, тот же, что у синхронных fetcher'ов.
+            base_url: Адрес API.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency должен быть не меньше 1")
+        self.max_concurrency = max_concurrency
+        self.client = client
+        self.config = config or HttpConfig()
+        self.limiter = limiter or get_rate_limiter()
+        self.base_url = base_url
+        # Ошибки получения деталей за последний вызов fetch: ID вакансии -> исключение
+        self.errors: Dict[str, FetcherException] = {}
+
+    @async_fetch_exceptions
+    async def fetch(
+        self,
+        *,
+        search_query: str,
+        total_vacancies: int,
+        region_id: Optional[int] = None,
+    ) -> List[RawVacancy]:
+        """
+        Собирает вакансии с HeadHunter API с учетом пагинации и обогащения.
+
+        Args:
+            search_query: Поисковый запрос (название вакансии, ключевые слова).
+            total_vacancies: Желаемое количество вакансий для получения.
+            region_id: ID региона для поиска (опционально).
+
+        Returns:
+            Список объектов RawVacancy в порядке выдачи поиска.
+            Вакансии, детали которых получить не удалось, пропускаются
+            и записываются в ``self.errors``.
+        """
+        self.errors = {}
+        if total_vacancies <= 0:
+            return []
+
+        if self.client is not None:
+            return await self._fetch(self.client, search_query, total_vacancies, region_id)
+        async with build_async_client(self.config) as client:
+            return await self._fetch(client, search_query, total_vacancies, region_id)
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        search_query: str,
+        total_vacancies: int,
+        region_id: Optional[int],
+    ) -> List[RawVacancy]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        per_page = 100
+
+        first_page = await self._search_page(client, semaphore, search_query, region_id, 0, per_page)
+        total_pages = first_page.get("pages", 1)
+        # Остальные нужные страницы поиска запрашиваем одновременно
+        wanted_pages = min(total_pages, math.ceil(total_vacancies / per_page))
+        pages = [first_page] + list(
+            await asyncio.gather(
+                *(
+                    self._search_page(client, semaphore, search_query, region_id, page, per_page)
+                    for page in range(1, wanted_pages)
+                )
+            )
+        )
+        next_page = wanted_pages
+
+        pending_ids = [item["id"] for data in pages for item in data.get("items", [])]
+        vacancies: List[RawVacancy] = []
+        while len(vacancies) < total_vacancies:
+            if not pending_ids:
+                # Часть деталей не загрузилась — добираем со следующей страницы
+                if next_page >= total_pages:
+                    break
+                data = await self._search_page(client, semaphore, search_query, region_id, next_page, per_page)
+                pending_ids = [item["id"] for item in data.get("items", [])]
+                next_page += 1
+                if not pending_ids:
+                    break
+                continue
+
+            needed = total_vacancies - len(vacancies)
+            batch, pending_ids = pending_ids[:needed], pending_ids[needed:]
+            # gather возвращает результаты в порядке выдачи поиска
+            results = await asyncio.gather(
+                *(self._try_get_vacancy_details(client, semaphore, vacancy_id) for vacancy_id in batch)
+            )
+            vacancies.extend(parse_vacancy(details) for details in results if details)
+
+        return vacancies
+
+    @async_fetch_exceptions
+    async def _search_page(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        search_query: str,
+        region_id: Optional[int],
+        page: int,
+        per_page: int,
+    ) -> Dict[str, Any]:
+        """Получает одну страницу результатов поиска вакансий."""
+        r = await self._get(
+            client, semaphore, f"{self.base_url}vacancies", build_search_params(search_query, region_id, page, per_page)
+        )
+        r.raise_for_status()
+        return r.json()
+
+    async def _try_get_vacancy_details(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, vacancy_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Как ``_get_vacancy_details``, но не прерывает загрузку:
+        ошибка сохраняется в ``self.errors``, а вместо деталей возвращается None.
+        """
+        try:
+            return await self._get_vacancy_details(client, semaphore, vacancy_id)
+        except FetcherException as e:
+            self.errors[vacancy_id] = e
+            return None
+
+    @async_fetch_exceptions
+    async def _get_vacancy_details(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, vacancy_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Получает полную информацию о вакансии по ее ID."""
+        r = await self._get(client, semaphore, f"{self.base_url}vacancies/{vacancy_id}")
+        r.raise_for_status()
+        return r.json()
+
+    async def _get(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """
+        Выполняет GET-запрос с повторами по правилам ``self.config``
+        и с учетом ограничителя частоты, как это делает RetryingAdapter
+        для синхронных fetcher'ов. Во время ожидания слот семафора не занимается.
+        """
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async()
+            try:
+                async with semaphore:
+                    r = await client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = self.config.backoff(attempt)
+            else:
+                retry_after = r.headers.get("Retry-After")
+                self.limiter.on_response(r.status_code, parse_retry_after(retry_after))
+                if r.status_code not in self.config.retry_statuses or attempt >= self.config.max_retries:
+                    return r
+                delay = self.config.backoff(attempt, retry_after)
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,153 @@
+"""
+Локальный индекс уже загруженных вакансий.
+
+Позволяет fetcher'ам не запрашивать повторно детали вакансий, которые
+не изменились с прошлого запуска.
+
+Индекс — JSON Lines файл, по строке на каждую запомненную вакансию.
+Строки только дописываются, а в памяти хранятся отметки вакансий и
+положения их строк в файле, так что сами вакансии читаются с диска по
+одной, когда нужны.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ..storage import paths
+from .models import RawVacancy
+
+logger = logging.getLogger(__name__)
+
+
+class VacancyIndex:
+    """
+    Индекс известных вакансий: ID -> отметка из поисковой выдачи и RawVacancy.
+
+    Отметка (например, ``published_at``) берется из результатов поиска,
+    поэтому проверить, изменилась ли вакансия, можно без запроса деталей.
+    Вместе с отметкой хранится сама RawVacancy, чтобы неизменившиеся
+    вакансии можно было восстановить без обращения к API.
+
+    Индекс загружается с диска при первом обращении. ``put`` сразу
+    дописывает вакансию в файл; изменившаяся вакансия оставляет в нем
+    устаревшую строку, и ``save`` переписывает файл без таких строк, когда
+    их становится больше, чем актуальных. Нечитаемые строки (например,
+    оборванная падением процесса) пропускаются, а их вакансии загружаются
+    заново. Методы get/put потокобезопасны; файлом индекса пользуется
+    один процесс.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Args:
+            path: Путь к файлу индекса. По умолчанию
+                ``~/.skillradar/data/index/hh_vacancies.jsonl``.
+        """
+        self.path = path or paths.INDEX_DIR / "hh_vacancies.jsonl"
+        # ID вакансии -> (отметка, смещение строки в файле, длина строки)
+        self._entries: Optional[Dict[str, Tuple[str, int, int]]] = None
+        self._size = 0
+        # Строк в файле, включая устаревшие и нечитаемые
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def get(self, vacancy_id: str, stamp: Optional[str]) -> Optional[RawVacancy]:
+        """
+        Возвращает сохраненную вакансию, если ее отметка совпадает со ``stamp``.
+
+        Returns:
+            RawVacancy или None, если вакансия новая, изменилась
+            или отметка неизвестна.
+        """
+        if stamp is None:
+            return None
+        with self._lock:
+            entry = self._load().get(vacancy_id)
+            if entry is None or entry[0] != stamp:
+                return None
+            with open(self.path, "rb") as f:
+                f.seek(entry[1])
+                line = f.read(entry[2])
+        try:
+            return RawVacancy(**json.loads(line)["vacancy"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Vacancy %s in index %s is unreadable, fetching it again", vacancy_id, self.path)
+            return None
+
+    def put(self, vacancy: RawVacancy, stamp: Optional[str]) -> None:
+        """Запоминает вакансию с отметкой из поисковой выдачи."""
+        if stamp is None:
+            return
+        entry = {"id": vacancy.id, "stamp": stamp, "vacancy": vacancy.to_dict()}
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            entries = self._load()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            entries[vacancy.id] = (stamp, self._size, len(line))
+            self._size += len(line)
+            self._lines += 1
+
+    def save(self) -> None:
+        """Переписывает файл индекса без устаревших строк, если их больше, чем актуальных."""
+        with self._lock:
+            if self._entries is None or self._lines - len(self._entries) <= len(self._entries):
+                return
+            entries: Dict[str, Tuple[str, int, int]] = {}
+            offset = 0
+            tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+                    for vacancy_id, (stamp, position, length) in self._entries.items():
+                        src.seek(position)
+                        dst.write(src.read(length))
+                        entries[vacancy_id] = (stamp, offset, length)
+                        offset += length
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            self._entries, self._size, self._lines = entries, offset, len(entries)
+
+    def _load(self) -> Dict[str, Tuple[str, int, int]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries, self._size, self._lines = {}, 0, 0
+        skipped = 0
+        torn = False
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Строка, оборванная падением процесса; новые строки запишутся на ее место
+                        torn = True
+                        skipped += 1
+                        break
+                    try:
+                        entry = json.loads(line)
+                        self._entries[str(entry["id"])] = (str(entry["stamp"]), self._size, len(line))
+                    except (ValueError, KeyError, TypeError):
+                        skipped += 1
+                    self._size += len(line)
+                    self._lines += 1
+        except FileNotFoundError:
+            return self._entries
+        if torn:
+            os.truncate(self.path, self._size)
+        if skipped:
+            logger.warning(
+                "Skipped %d unreadable lines of index %s, their vacancies will be fetched again", skipped, self.path
+            )
+        return self._entries
@@ -20,3 +20,19 @@ class RawVacancy:
     branded_description: Optional[str] = None
     key_skills: List[str] = field(default_factory=list)
     area: Optional[Dict[str, Any]] = None  # For 'location'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the dictionary that storages save for this vacancy.
+
+        Unlike ``dataclasses.asdict``, nested values are not deep-copied:
+        the dictionary is only serialized and shares them with the vacancy.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "branded_description": self.branded_description,
+            "key_skills": self.key_skills,
+            "area": self.area,
+        }
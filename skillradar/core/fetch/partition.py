@@ -0,0 +1,127 @@
+"""
+Разбиение большого поиска на непересекающиеся подзапросы.
+
+API hh.ru отдает не больше ``MAX_SEARCH_DEPTH`` результатов на один поисковый
+запрос, сколько бы вакансий ни было найдено. Чтобы получить их все, поиск
+делится по регионам из дерева ``areas``, а если этого мало — по окнам даты
+публикации, пока каждый подзапрос не уложится в лимит.
+"""
+import logging
+from concurrent.futures import Executor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Максимальная глубина выдачи поиска hh.ru: page * per_page < 2000
+MAX_SEARCH_DEPTH = 2000
+
+# Период, за который hh.ru ищет вакансии по умолчанию
+SEARCH_PERIOD = timedelta(days=30)
+
+# Окна короче этого не делятся: остаток выдачи будет обрезан лимитом API
+MIN_WINDOW = timedelta(minutes=10)
+
+Filters = Dict[str, Any]
+
+logger = logging.getLogger(__name__)
+
+
+class SearchPartitioner:
+    """
+    Строит набор фильтров поиска, каждый из которых находит не больше
+    ``MAX_SEARCH_DEPTH`` вакансий, а вместе они покрывают исходный поиск.
+
+    Сначала поиск делится на дочерние регионы, затем — пополам по
+    интервалу ``date_from``/``date_to``. Запросы количества найденных
+    вакансий для соседних подзапросов выполняются параллельно, а следующая
+    ветвь дерева делится только когда до нее доходит очередь.
+
+    Вакансии, привязанные к самому родительскому региону, а не к одному
+    из дочерних, не нашел бы ни один поиск по дочерним регионам. Поэтому
+    если дочерние регионы вместе находят меньше вакансий, чем родительский,
+    родительский регион делится не по ним, а по окнам дат.
+    """
+
+    def __init__(
+        self,
+        count: Callable[[Filters], int],
+        child_areas: Callable[[Optional[str]], List[str]],
+        executor: Executor,
+    ) -> None:
+        """
+        Args:
+            count: Возвращает число вакансий, найденных с данными фильтрами.
+            child_areas: Возвращает ID дочерних регионов; для None —
+                регионы верхнего уровня.
+            executor: Пул для параллельных запросов количества.
+        """
+        self.count = count
+        self.child_areas = child_areas
+        self.executor = executor
+
+    def plan(self, filters: Filters, found: Optional[int] = None) -> Iterator[Tuple[Filters, int]]:
+        """
+        Отдает подзапросы, покрывающие поиск с фильтрами ``filters``, вместе
+        с числом найденных ими вакансий.
+
+        Подзапросы без результатов пропускаются.
+        """
+        if found is None:
+            found = self.count(filters)
+        if found <= MAX_SEARCH_DEPTH:
+            if found:
+                yield filters, found
+            return
+
+        parts, counts = self._split(filters, found)
+        if not parts:
+            # Делить дальше некуда: берем столько, сколько отдаст API
+            yield filters, found
+            return
+
+        for part, part_found in zip(parts, counts):
+            yield from self.plan(part, part_found)
+
+    def _split(self, filters: Filters, found: int) -> Tuple[List[Filters], List[int]]:
+        # После перехода к окнам дат регионы больше не делим
+        if "date_from" not in filters:
+            area = filters.get("area")
+            children = self.child_areas(str(area) if area else None)
+            if children:
+                parts = [{**filters, "area": child} for child in children]
+                counts = list(self.executor.map(self.count, parts))
+                missing = found - sum(counts)
+                if missing <= 0:
+                    return parts, counts
+                logger.warning(
+                    "%d vacancies of area %s are outside its child areas, splitting it by date instead",
+                    missing,
+                    area or "all",
+                )
+        parts = split_window(filters)
+        return parts, list(self.executor.map(self.count, parts))
+
+
+def split_window(filters: Filters) -> List[Filters]:
+    """
+    Делит интервал публикации из фильтров пополам.
+
+    Если интервал не задан, делится период поиска по умолчанию,
+    заканчивающийся текущим моментом. Слишком короткие окна не делятся.
+    """
+    date_to = _parse(filters.get("date_to")) or datetime.now(timezone.utc)
+    date_from = _parse(filters.get("date_from")) or date_to - SEARCH_PERIOD
+    if date_to - date_from <= MIN_WINDOW:
+        return []
+    middle = date_from + (date_to - date_from) / 2
+    return [
+        {**filters, "date_from": _format(date_from), "date_to": _format(middle)},
+        {**filters, "date_from": _format(middle), "date_to": _format(date_to)},
+    ]
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _format(value: datetime) -> str:
+    return value.isoformat(timespec="seconds")
@@ -0,0 +1,147 @@
+"""
+Адаптивный ограничитель частоты запросов к API.
+
+Один ограничитель делится всеми fetcher'ами процесса (см. ``get_rate_limiter``),
+поэтому суммарная нагрузка на API не зависит от числа потоков и fetcher'ов.
+"""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket, скорость которого подстраивается под ответы сервера.
+
+    Каждый запрос забирает один токен; токены пополняются со скоростью
+    ``rate`` в секунду, копится их не больше ``burst``. При ответе 429
+    скорость умножается на ``decrease_factor``, а если пришел Retry-After,
+    выдача токенов приостанавливается на указанное время. Каждый успешный
+    ответ увеличивает скорость на ``increase_step``, но не раньше чем через
+    ``cooldown`` секунд после последнего снижения и не выше ``max_rate``.
+
+    Ожидающий запрос заранее резервирует свой токен, поэтому очередь
+    обслуживается по порядку без активного ожидания.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 10,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        increase_step: float = 0.1,
+        decrease_factor: float = 0.5,
+        cooldown: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            rate: Начальная скорость, запросов в секунду.
+            burst: Емкость ведра: сколько запросов можно сделать разом после простоя.
+            min_rate: Нижняя граница скорости.
+            max_rate: Верхняя граница скорости.
+            increase_step: Прибавка к скорости за каждый успешный ответ.
+            decrease_factor: Множитель скорости при ответе 429.
+            cooldown: Сколько секунд после снижения скорость не растет.
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("Должно выполняться 0 < min_rate <= rate <= max_rate")
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self._rate = rate
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = float("-inf")
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Текущая скорость, запросов в секунду."""
+        return self._rate
+
+    @property
+    def queue_depth(self) -> int:
+        """Сколько запросов сейчас ждут своего токена."""
+        return self._waiting
+
+    def reserve(self) -> float:
+        """
+        Резервирует токен и возвращает, сколько секунд нужно подождать,
+        прежде чем отправлять запрос.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens / self._rate)
+            return delay + max(0.0, self._paused_until - now)
+
+    def acquire(self) -> None:
+        """Блокирует поток, пока запрос не будет разрешен."""
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        with self._lock:
+            self._waiting += 1
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    async def acquire_async(self) -> None:
+        """Асинхронный вариант ``acquire``, не блокирующий event loop."""
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        with self._lock:
+            self._waiting += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def on_response(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        """
+        Учитывает ответ сервера: замедляется на 429 и ускоряется на успешных ответах.
+
+        Args:
+            status_code: HTTP-статус ответа.
+            retry_after: Значение Retry-After в секундах, если сервер его прислал.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if status_code == 429 or (retry_after is not None and status_code == 503):
+                self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+                self._decreased_at = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif status_code < 500 and now - self._decreased_at >= self.cooldown:
+                self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+
+_default_limiter: Optional[AdaptiveRateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Возвращает общий для процесса ограничитель с настройками по умолчанию."""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = AdaptiveRateLimiter()
+        return _default_limiter
@@ -0,0 +1,85 @@
+"""
+Плоский индекс дерева регионов hh.ru.
+
+Эндпоинт ``areas`` отдает вложенное дерево: страны, внутри них регионы,
+внутри регионов города. RegionIndex один раз обходит дерево и строит
+словари, по которым любые запросы к нему выполняются за O(1).
+"""
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RegionIndex:
+    """
+    Индекс дерева регионов: id -> название, id -> родитель,
+    название -> id, дочерние регионы и все потомки узла.
+
+    ID регионов хранятся строками, как их отдает API; методы принимают
+    и числовые ID. Поиск по названию не зависит от регистра.
+    """
+
+    def __init__(self, tree: List[Dict[str, Any]]) -> None:
+        """
+        Args:
+            tree: Дерево регионов в формате ответа ``GET /areas``.
+        """
+        self._names: Dict[str, str] = {}
+        self._parents: Dict[str, Optional[str]] = {}
+        self._children: Dict[Optional[str], Tuple[str, ...]] = {}
+        self._ids_by_name: Dict[str, Tuple[str, ...]] = {}
+        self._descendants: Dict[str, Tuple[str, ...]] = {}
+
+        children: Dict[Optional[str], List[str]] = {None: []}
+        ids_by_name: Dict[str, List[str]] = {}
+        # Обход в ширину сохраняет порядок регионов из ответа API
+        order: List[str] = []
+        queue = deque((None, area) for area in tree)
+        while queue:
+            parent_id, area = queue.popleft()
+            area_id = str(area["id"])
+            order.append(area_id)
+            self._names[area_id] = area["name"]
+            self._parents[area_id] = parent_id
+            children.setdefault(parent_id, []).append(area_id)
+            children.setdefault(area_id, [])
+            ids_by_name.setdefault(area["name"].casefold(), []).append(area_id)
+            queue.extend((area_id, child) for child in area.get("areas", []))
+
+        # Потомков собираем снизу вверх: дети узла обработаны раньше него
+        descendants: Dict[str, List[str]] = {}
+        for area_id in reversed(order):
+            collected: List[str] = []
+            for child_id in children[area_id]:
+                collected.append(child_id)
+                collected.extend(descendants[child_id])
+            descendants[area_id] = collected
+
+        self._children = {key: tuple(value) for key, value in children.items()}
+        self._ids_by_name = {key: tuple(value) for key, value in ids_by_name.items()}
+        self._descendants = {key: tuple(value) for key, value in descendants.items()}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, area_id: object) -> bool:
+        return str(area_id) in self._names
+
+    def name(self, area_id: Any) -> Optional[str]:
+        """Название региона или None, если такого ID нет."""
+        return self._names.get(str(area_id))
+
+    def parent(self, area_id: Any) -> Optional[str]:
+        """ID родительского региона; None для стран и неизвестных ID."""
+        return self._parents.get(str(area_id))
+
+    def children(self, area_id: Any = None) -> Tuple[str, ...]:
+        """ID непосредственных дочерних регионов; для None — страны."""
+        return self._children.get(None if area_id is None else str(area_id), ())
+
+    def descendants(self, area_id: Any) -> Tuple[str, ...]:
+        """ID всех регионов внутри данного, без него самого."""
+        return self._descendants.get(str(area_id), ())
+
+    def find(self, name: str) -> Tuple[str, ...]:
+        """ID всех регионов с таким названием."""
+        return self._ids_by_name.get(name.casefold(), ())
@@ -0,0 +1,175 @@
+"""
+Общий HTTP-слой для fetcher'ов.
+
+Все запросы к API идут через ``requests.Session`` с пулом keep-alive
+соединений, таймаутом по умолчанию и повторами с экспоненциальной
+задержкой для ответов 429/5xx и сетевых сбоев.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import ResponseCache
+from .ratelimit import AdaptiveRateLimiter, get_rate_limiter
+
+# Статусы, при которых запрос имеет смысл повторить
+RETRY_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class HttpConfig:
+    """Настройки HTTP-слоя fetcher'ов."""
+
+    # Число соединений в пуле на один хост
+    pool_size: int = 20
+    # Таймаут запроса в секундах, если он не передан явно
+    timeout: float = 10.0
+    # Сколько раз повторять запрос после первой неудачной попытки
+    max_retries: int = 3
+    # Задержка перед n-м повтором: backoff_factor * 2 ** n секунд
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    retry_statuses: Tuple[int, ...] = RETRY_STATUSES
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Возвращает задержку в секундах перед повтором номер ``attempt`` (с нуля).
+
+        Значение заголовка ``Retry-After``, если сервер его прислал,
+        имеет приоритет над экспоненциальной задержкой.
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff_factor * 2**attempt
+        return min(delay, self.max_backoff)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разбирает заголовок Retry-After (секунды или HTTP-дата) в секунды."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter с пулом соединений размера ``config.pool_size``,
+    таймаутом по умолчанию и повторами для ``config.retry_statuses``.
+
+    Сетевые сбои повторяет urllib3, а повторы по статусу ответа
+    выполняются здесь, чтобы учитывать Retry-After. Если задан ``limiter``,
+    каждая попытка ждет его разрешения и сообщает ему статус ответа.
+    """
+
+    def __init__(self, config: HttpConfig, limiter: Optional[AdaptiveRateLimiter] = None) -> None:
+        # Атрибут config уже занят HTTPAdapter
+        self.http_config = config
+        self.limiter = limiter
+        super().__init__(
+            pool_connections=config.pool_size,
+            pool_maxsize=config.pool_size,
+            max_retries=Retry(
+                total=config.max_retries,
+                status=0,
+                backoff_factor=config.backoff_factor,
+                respect_retry_after_header=False,
+            ),
+        )
+
+    def send(self, request, **kwargs) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.http_config.timeout
+
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            response = super().send(request, **kwargs)
+            retry_after = response.headers.get("Retry-After")
+            if self.limiter is not None:
+                self.limiter.on_response(response.status_code, parse_retry_after(retry_after))
+            if (
+                response.status_code not in self.http_config.retry_statuses
+                or request.method not in ("GET", "HEAD")
+                or attempt >= self.http_config.max_retries
+            ):
+                return response
+            delay = self.http_config.backoff(attempt, retry_after)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+
+class CachingAdapter(RetryingAdapter):
+    """
+    RetryingAdapter, который сначала обращается к дисковому кэшу ответов.
+
+    Повторы и таймауты применяются только к запросам, ушедшим в сеть.
+    """
+
+    def __init__(
+        self, config: HttpConfig, cache: ResponseCache, limiter: Optional[AdaptiveRateLimiter] = None
+    ) -> None:
+        self.cache = cache
+        super().__init__(config, limiter)
+
+    def send(self, request, **kwargs) -> requests.Response:
+        return self.cache.send(request, lambda req: super(CachingAdapter, self).send(req, **kwargs))
+
+
+def build_session(
+    config: Optional[HttpConfig] = None,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+) -> requests.Session:
+    """
+    Создает новую сессию для http и https.
+
+    Args:
+        config: Настройки пула, таймаутов и повторов.
+        cache: Дисковый кэш ответов (опционально).
+        limiter: Ограничитель частоты запросов (опционально). Чтобы
+            сессии не мешали друг другу, передавайте им общий ``get_rate_limiter()``.
+    """
+    config = config or HttpConfig()
+    if cache is not None:
+        adapter: RetryingAdapter = CachingAdapter(config, cache, limiter)
+    else:
+        adapter = RetryingAdapter(config, limiter)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_default_session: Optional[requests.Session] = None
+_default_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Возвращает общую для процесса сессию с настройками по умолчанию.
+
+    Используется fetcher'ами, которым сессия не была передана явно,
+    чтобы все они делили один пул соединений и один ограничитель частоты.
+    """
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = build_session(limiter=get_rate_limiter())
+        return _default_session
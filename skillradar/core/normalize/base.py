@@ -1,21 +1,140 @@
+import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.fetch.models import RawVacancy
+from skillradar.core.normalize.models import NormalizationError, NormalizedVacancy
 
 
 class BaseNormalizer(ABC):
     """Abstract base class for data normalizers."""
 
+    # Items that failed in the last normalize_many call
+    errors: List[NormalizationError]
+
     @abstractmethod
-    def normalize(self, raw_data: Dict[str, Any]) -> NormalizedVacancy:
+    def normalize(self, raw_data: Union[RawVacancy, Dict[str, Any]]) -> NormalizedVacancy:
         """
         Normalizes raw data into a NormalizedVacancy object.
 
         Args:
-            raw_data: The raw JSON data (as a dict) from a specific source.
+            raw_data: A RawVacancy as returned by a fetcher, or the raw
+                JSON data (as a dict) loaded from storage.
 
         Returns:
             A NormalizedVacancy object.
         """
         pass
+
+    def normalize_many(
+        self, raw_items: Iterable[Union[RawVacancy, Dict[str, Any]]], chunk_size: int = 1000, workers: Optional[int] = 1
+    ) -> Iterator[NormalizedVacancy]:
+        """
+        Normalizes many raw vacancies, yielding them in input order.
+
+        The input is read in chunks of ``chunk_size`` items. With more
+        than one worker, chunks are normalized in a process pool, so the
+        normalizer must be picklable; at most two chunks per worker are
+        in flight, which bounds memory for any input size. Sending items
+        to the processes and back costs time too, so the pool pays off
+        for normalizers that spend longer on an item than it takes to
+        pickle it (see ``benchmarks/bench_normalize.py``).
+
+        Items that fail to normalize are skipped and recorded in
+        ``self.errors``, which is reset by each call and complete once
+        the returned iterator is exhausted.
+
+        Args:
+            raw_items: Raw vacancies; a generator is consumed lazily.
+            chunk_size: Number of items per chunk.
+            workers: Number of processes; 1 normalizes in the calling
+                process and None uses every CPU.
+
+        Returns:
+            An iterator over the normalized vacancies.
+
+        Raises:
+            ValueError: If ``chunk_size`` or ``workers`` is less than 1.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.errors = []
+        chunks = _chunks(raw_items, chunk_size)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1:
+            return self._normalize_serial(chunks)
+        return self._normalize_parallel(chunks, workers)
+
+    def _normalize_serial(self, chunks: Iterator[Tuple[int, List[Dict[str, Any]]]]) -> Iterator[NormalizedVacancy]:
+        for start, chunk in chunks:
+            vacancies, errors = _normalize_chunk(self, start, chunk)
+            self.errors.extend(errors)
+            yield from vacancies
+
+    def _normalize_parallel(
+        self, chunks: Iterator[Tuple[int, List[Dict[str, Any]]]], workers: int
+    ) -> Iterator[NormalizedVacancy]:
+        # The normalizer is sent to each process once, not with every chunk
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+            pending: Deque[Future] = deque()
+            limit = 2 * workers
+            for start, chunk in chunks:
+                pending.append(executor.submit(_normalize_in_worker, start, chunk))
+                if len(pending) >= limit:
+                    yield from self._collect(pending.popleft())
+            while pending:
+                yield from self._collect(pending.popleft())
+
+    def _collect(self, future: Future) -> List[NormalizedVacancy]:
+        vacancies, errors = future.result()
+        self.errors.extend(errors)
+        return vacancies
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """Yields ``(index of the first item, items)`` chunks."""
+    iterator = iter(items)
+    start = 0
+    while chunk := list(islice(iterator, size)):
+        yield start, chunk
+        start += len(chunk)
+
+
+# Normalizer of the current worker process, set by _init_worker
+_worker_normalizer: Optional[BaseNormalizer] = None
+
+
+def _init_worker(normalizer: BaseNormalizer) -> None:
+    global _worker_normalizer
+    _worker_normalizer = normalizer
+
+
+def _normalize_in_worker(
+    start: int, chunk: List[Dict[str, Any]]
+) -> Tuple[List[NormalizedVacancy], List[NormalizationError]]:
+    return _normalize_chunk(_worker_normalizer, start, chunk)
+
+
+def _normalize_chunk(
+    normalizer: BaseNormalizer, start: int, chunk: List[Dict[str, Any]]
+) -> Tuple[List[NormalizedVacancy], List[NormalizationError]]:
+    """Normalizes one chunk, recording the items that fail."""
+    vacancies = []
+    errors = []
+    for index, raw_data in enumerate(chunk, start):
+        try:
+            vacancies.append(normalizer.normalize(raw_data))
+        except Exception as e:
+            vacancy_id = raw_data.get("id") if isinstance(raw_data, dict) else getattr(raw_data, "id", None)
+            errors.append(NormalizationError(
+                index=index,
+                vacancy_id=None if vacancy_id is None else str(vacancy_id),
+                message=f"{type(e).__name__}: {e}",
+            ))
+    return vacancies, errors
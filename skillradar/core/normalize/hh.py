@@ -1,12 +1,19 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
+from skillradar.core.fetch.models import RawVacancy
 from skillradar.core.normalize.base import BaseNormalizer
 from skillradar.core.normalize.models import NormalizedVacancy
 
 class HhNormalizer(BaseNormalizer):
-    def normalize(self, raw_data: Dict[str, Any]) -> NormalizedVacancy:
+    def normalize(self, raw_data: Union[RawVacancy, Dict[str, Any]]) -> NormalizedVacancy:
+        # RawVacancy objects come straight from HHFetcher and are read
+        # by attribute, without converting them to a dictionary first
+        if isinstance(raw_data, RawVacancy):
+            return self._normalize_raw_vacancy(raw_data)
+
         # The input raw_data is the output of HHFetcher._parse_vacancy
-        # The actual full details from the HH API are often stored under the 'raw' key
-        full_details = raw_data.get("raw", {})
+        # The actual full details from the HH API are often stored under the 'raw' key;
+        # a saved RawVacancy has no such key and holds the details at the top level
+        full_details = raw_data.get("raw") or raw_data
 
         vacancy_id: Optional[str] = None
         url: Optional[str] = None
@@ -19,29 +26,23 @@ class HhNormalizer(BaseNormalizer):
         title = raw_data.get("name")
         
         # Extract company name from the 'employer' details within the full raw data
-        company_name = full_details.get("employer", {}).get("name")
+        company_name = (full_details.get("employer") or {}).get("name")
 
         # Description handling
         # Prefer description from full_details, which is typically the most complete
-        full_description = full_details.get("description", "") 
-        branded_description = full_details.get("branded_description", "") 
-        
-        # If there's a branded description and it's different from the main description, combine them
-        if branded_description and branded_description != full_description:
-            if full_description:
-                full_description = f"{full_description}\n\n---\n\n{branded_description}"
-            else: # If main description was empty, but branded exists
-                full_description = branded_description
+        full_description = _combine_descriptions(
+            full_details.get("description") or "", full_details.get("branded_description") or ""
+        )
         
         # Fallback: if no description found yet, try raw_data.description
         if not full_description.strip() and raw_data.get("description"):
             full_description = raw_data.get("description")
 
-        # Extract skills - now correctly extracting the 'name' from each skill dict
-        skills = [skill.get("name") for skill in raw_data.get("key_skills", []) if isinstance(skill, dict) and skill.get("name")]
+        # Skills are dicts with a 'name' in API responses and plain names in saved RawVacancy data
+        skills = _skill_names(raw_data.get("key_skills", []))
 
         # Extract location name - _parse_vacancy already extracts area name
-        location = raw_data.get("area", {}).get("name")
+        location = (raw_data.get("area") or {}).get("name")
 
         # Basic validation for required fields
         if not vacancy_id or not title or not url:
@@ -57,3 +58,38 @@ class HhNormalizer(BaseNormalizer):
             skills=skills,
             location=location,
         )
+
+    def _normalize_raw_vacancy(self, raw: RawVacancy) -> NormalizedVacancy:
+        vacancy_id = str(raw.id) if raw.id else None
+        if not vacancy_id or not raw.name:
+            raise ValueError(f"Missing required fields for normalization: id={vacancy_id}, title={raw.name}")
+
+        return NormalizedVacancy(
+            id=vacancy_id,
+            title=raw.name,
+            url=f"https://hh.ru/vacancy/{vacancy_id}",
+            source="HeadHunter",
+            description=_combine_descriptions(raw.description or "", raw.branded_description or ""),
+            # The fetcher builds a fresh list for every vacancy, so it is shared rather than copied
+            skills=raw.key_skills,
+            location=raw.area.get("name") if raw.area else None,
+        )
+
+
+def _combine_descriptions(description: str, branded_description: str) -> str:
+    # If there's a branded description and it's different from the main description, combine them
+    if branded_description and branded_description != description:
+        if description:
+            return f"{description}\n\n---\n\n{branded_description}"
+        # If main description was empty, but branded exists
+        return branded_description
+    return description
+
+
+def _skill_names(key_skills: List[Any]) -> List[str]:
+    names = []
+    for skill in key_skills:
+        name = skill.get("name") if isinstance(skill, dict) else skill
+        if isinstance(name, str) and name:
+            names.append(name)
+    return names
@@ -16,3 +16,13 @@ class NormalizedVacancy:
     skills: List[str] = field(default_factory=list)
 
     location: Optional[str] = None
+
+
+@dataclass
+class NormalizationError:
+    """A raw vacancy that could not be normalized."""
+
+    # Position of the vacancy in the normalized sequence
+    index: int
+    vacancy_id: Optional[str]
+    message: str
@@ -1,37 +1,286 @@
 from datetime import datetime
-from typing import List
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from .analysis.base import BaseAnalyzer
+from .checkpoint import RunCheckpoint
+from .dedup.base import BaseDeduplicator
+from .dedup.models import Duplicate
+from .extract.base import BaseExtractor
 from .fetch.base import VacancyFetcher
-from .storage.base import Storage
+from .stages import Stage, StageEngine
+from .storage.base import Storage, to_record
 from .normalize.base import BaseNormalizer
-from .normalize.models import NormalizedVacancy
+from .normalize.models import NormalizationError, NormalizedVacancy
+
+# Элемент между стадиями: номер вакансии в выдаче и сама вакансия
+Item = Tuple[int, Any]
 
 
 class Pipeline:
-    def __init__(self, fetcher: VacancyFetcher, normalizer: BaseNormalizer, storage: Storage):
+    def __init__(
+        self,
+        fetcher: VacancyFetcher,
+        normalizer: BaseNormalizer,
+        storage: Storage,
+        extractor: Optional[BaseExtractor] = None,
+        analyzer: Optional[BaseAnalyzer] = None,
+        deduplicator: Optional[BaseDeduplicator] = None,
+        normalize_workers: int = 1,
+        extract_workers: int = 1,
+        analyze_workers: int = 1,
+        queue_size: int = 64,
+        checkpoint_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            fetcher: Источник raw-вакансий.
+            normalizer: Нормализатор raw-вакансий.
+            storage: Хранилище снапшотов и результатов.
+            extractor: Извлекатель навыков; без него стадии extract нет.
+            analyzer: Анализатор текста; без него стадии analyze нет.
+            deduplicator: Поиск повторов вакансий; без него стадии dedup нет.
+            normalize_workers: Число потоков стадии normalize.
+            extract_workers: Число потоков стадии extract.
+            analyze_workers: Число потоков стадии analyze.
+            queue_size: Емкость очереди перед каждой стадией.
+            checkpoint_dir: Каталог журналов запусков с ``run_id``.
+                По умолчанию ``~/.skillradar/data/runs``.
+        """
         self.fetcher = fetcher
         self.normalizer = normalizer
         self.storage = storage
+        self.extractor = extractor
+        self.analyzer = analyzer
+        self.deduplicator = deduplicator
+        self.normalize_workers = normalize_workers
+        self.extract_workers = extract_workers
+        self.analyze_workers = analyze_workers
+        self.queue_size = queue_size
+        self.checkpoint_dir = checkpoint_dir
+        # Вакансии, которые не удалось нормализовать при последнем запуске
+        self.errors: List[NormalizationError] = []
+        # Повторы, отброшенные при последнем запуске
+        self.duplicates: List[Duplicate] = []
+        # Главная вакансия группы повторов -> оставленная в запуске вакансия этой группы
+        self._kept: Dict[str, str] = {}
+        self._engine: Optional[StageEngine] = None
+        self._checkpoint: Optional[RunCheckpoint] = None
 
-    def run(self, **kwargs) -> List[NormalizedVacancy]:
-        raw_vacancies = self.fetcher.fetch(**kwargs)
+    def run(self, run_id: Optional[str] = None, **kwargs) -> List[NormalizedVacancy]:
+        """
+        Загружает вакансии и прогоняет их через стадии save_raw, normalize,
+        dedup, extract и analyze (последние три — если заданы deduplicator,
+        extractor и analyzer).
 
-        # Сохраняем raw данные
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_name = f"vacancies_{timestamp}"
-        self.storage.save_raw(file_name, raw_vacancies)
+        Стадия dedup оставляет по одной вакансии из каждой группы повторов
+        (перепосты одной вакансии под разными ID и в разных регионах), чтобы
+        они не завышали спрос на навыки; отброшенные попадают в
+        ``self.duplicates``, а в raw-снапшоте остаются.
 
-        # Нормализация
-        normalized_vacancies: List[NormalizedVacancy] = []
-        for raw_vacancy in raw_vacancies:
-            try:
-                normalized_vacancies.append(self.normalizer.normalize(raw_vacancy))
-            except ValueError as e:
-                print(f"Error normalizing vacancy {raw_vacancy.get('id')}: {e}")
-                # Optionally, log the error or handle it differently
+        Стадии работают одновременно и связаны ограниченными очередями:
+        пока fetcher ждет сеть, уже полученные вакансии пишутся на диск и
+        нормализуются. Результаты extract и analyze сохраняются в storage
+        по мере готовности, нормализованный снапшот — в конце запуска.
 
-        # Сохраняем нормализованные данные
-        self.storage.save_normalized(file_name, normalized_vacancies)
+        С ``run_id`` прогресс запуска записывается в журнал (см.
+        ``RunCheckpoint``). Если запуск с таким ID уже начинался и упал или
+        был отменен, он продолжается: загруженные вакансии берутся из
+        журнала, fetcher догружает только недостающие, а нормализация,
+        extract и analyze не повторяются для уже обработанных вакансий.
+        Снапшоты сохраняются под именем, выбранным при первой попытке.
+
+        Если загрузка оборвалась, уже полученные вакансии дообрабатываются
+        и попадают в raw-снапшот, после чего ошибка выбрасывается;
+        нормализованный снапшот сохраняется только при успешном запуске.
+
+        Raises:
+            StageCancelled: Если запуск остановлен через ``cancel``.
+            ValueError: Если запуск ``run_id`` уже завершен или начинался
+                с другими параметрами.
+        """
+        self.errors = []
+        self.duplicates = []
+        self._kept = {}
+        checkpoint = None if run_id is None else RunCheckpoint(run_id, self.checkpoint_dir)
+        if checkpoint is not None and checkpoint.started:
+            if checkpoint.finished:
+                raise ValueError(f"Run '{run_id}' is already finished")
+            checkpoint.check_params(kwargs)
+            file_name = checkpoint.snapshot
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            file_name = f"vacancies_{timestamp}"
+            # Запрос и регион попадают в каталог снапшотов, чтобы по ним можно было найти запуск
+            self.storage.describe_snapshot(
+                file_name, query=kwargs.get("search_query"), region=kwargs.get("region_id")
+            )
+            if checkpoint is not None:
+                checkpoint.start(file_name, kwargs)
+
+        # Вакансии приходят потоком, весь raw-список в памяти не хранится.
+        # Storage с фоновой записью (write_behind) передает поток в свой
+        # поток записи пачками
+        stages = [
+            Stage("save_raw", self._save_raw_stage(file_name), queue_size=self.queue_size, stream=True),
+            Stage("normalize", self._normalize, workers=self.normalize_workers, queue_size=self.queue_size),
+        ]
+        if self.deduplicator is not None:
+            # Индекс повторов общий, а порядок групп зависит от порядка проверки: один поток
+            stages.append(Stage("dedup", self._dedup, queue_size=self.queue_size))
+        if self.extractor is not None:
+            stages.append(Stage("extract", self._extract, workers=self.extract_workers, queue_size=self.queue_size))
+        if self.analyzer is not None:
+            stages.append(Stage("analyze", self._analyze, workers=self.analyze_workers, queue_size=self.queue_size))
+
+        self._engine = StageEngine(stages)
+        self._checkpoint = checkpoint
+        try:
+            results = sorted(self._engine.run(self._source(kwargs)), key=lambda item: item[0])
+        finally:
+            self._engine = None
+            self._checkpoint = None
+            if self.deduplicator is not None:
+                self.deduplicator.save()
+        self.errors.sort(key=lambda error: error.index)
 
-        # TODO: дальше будут extract, analyze
+        # Сохраняем нормализованные данные в порядке выдачи
+        normalized_vacancies = [vacancy for _, vacancy in results]
+        self.storage.save_normalized(file_name, normalized_vacancies)
+        if checkpoint is not None:
+            self.storage.flush()
+            checkpoint.finish()
         return normalized_vacancies
+
+    def cancel(self) -> None:
+        """
+        Останавливает текущий ``run`` из другого потока: стадии
+        прекращают работу, а ``run`` выбрасывает ``StageCancelled``.
+        Нормализованный снапшот при этом не сохраняется.
+        """
+        engine = self._engine
+        if engine is not None:
+            engine.cancel()
+
+    def renormalize(
+        self, name: str, workers: Optional[int] = None, chunk_size: int = 1000
+    ) -> List[NormalizedVacancy]:
+        """
+        Заново нормализует сохраненный raw-снапшот и перезаписывает его
+        нормализованную версию, например после изменения нормализатора.
+
+        Вакансии обрабатываются пачками по ``chunk_size`` в ``workers``
+        процессах (по умолчанию на всех ядрах). Ошибки отдельных вакансий
+        собираются в ``self.errors``.
+
+        Raises:
+            FileNotFoundError: Если raw-снапшота нет.
+            ValueError: Если raw-снапшот не список вакансий.
+        """
+        raw_vacancies = self.storage.load_raw(name)
+        if isinstance(raw_vacancies, dict):
+            raise ValueError(f"Raw snapshot '{name}' is not a list of vacancies")
+        vacancies = list(self.normalizer.normalize_many(raw_vacancies, chunk_size=chunk_size, workers=workers))
+        self.errors = self.normalizer.errors
+        self.storage.save_normalized(name, vacancies)
+        return vacancies
+
+    def _source(self, kwargs: Dict[str, Any]) -> Iterator[Item]:
+        """Вакансии запуска с номерами: сначала загруженные прерванной попыткой, затем новые."""
+        checkpoint = self._checkpoint
+        if checkpoint is None or not checkpoint.raw:
+            yield from enumerate(self.fetcher.iter_fetch(**kwargs))
+            return
+        yield from sorted(checkpoint.raw.items(), key=lambda item: item[0])
+        remaining = kwargs["total_vacancies"] - len(checkpoint.raw)
+        if remaining > 0:
+            fresh = self.fetcher.iter_fetch(
+                **dict(kwargs, total_vacancies=remaining), skip_ids=checkpoint.fetched_ids()
+            )
+            yield from enumerate(fresh, max(checkpoint.raw) + 1)
+
+    def _save_raw_stage(self, file_name: str) -> Callable[[Iterable[Item], Callable[[Item], None]], None]:
+        """Потоковая стадия: передает вакансии дальше и одновременно пишет их в raw-снапшот."""
+        def save_raw(items: Iterable[Item], emit: Callable[[Item], None]) -> None:
+            checkpoint = self._checkpoint
+
+            def forward() -> Iterable[Any]:
+                for item in items:
+                    if checkpoint is not None and item[0] not in checkpoint.raw:
+                        checkpoint.record_fetched(item[0], to_record(item[1]))
+                    # Нормализация не ждет, пока storage запишет вакансию
+                    emit(item)
+                    yield item[1]
+
+            self.storage.save_raw(file_name, forward())
+
+        return save_raw
+
+    def _normalize(self, item: Item) -> Optional[Tuple[int, NormalizedVacancy]]:
+        index, raw_vacancy = item
+        checkpoint = self._checkpoint
+        if checkpoint is not None:
+            if index in checkpoint.normalized:
+                return index, checkpoint.normalized[index]
+            if index in checkpoint.errors:
+                self.errors.append(checkpoint.errors[index])
+                return None
+        # Нормализатор получает тот же объект, что и storage, без промежуточного словаря
+        try:
+            vacancy = self.normalizer.normalize(raw_vacancy)
+        except Exception as e:
+            # Ошибка одной вакансии не останавливает запуск, а попадает в self.errors
+            if isinstance(raw_vacancy, dict):
+                vacancy_id = raw_vacancy.get("id")
+            else:
+                vacancy_id = getattr(raw_vacancy, "id", None)
+            error = NormalizationError(
+                index=index,
+                vacancy_id=None if vacancy_id is None else str(vacancy_id),
+                message=f"{type(e).__name__}: {e}",
+            )
+            self.errors.append(error)
+            if checkpoint is not None:
+                checkpoint.record_failed(error)
+            return None
+        if checkpoint is not None:
+            checkpoint.record_normalized(index, vacancy)
+        return index, vacancy
+
+    def _dedup(self, item: Tuple[int, NormalizedVacancy]) -> Optional[Tuple[int, NormalizedVacancy]]:
+        vacancy = item[1]
+        duplicate = self.deduplicator.check(vacancy)
+        group = vacancy.id if duplicate is None else duplicate.duplicate_of
+        kept = self._kept.setdefault(group, vacancy.id)
+        if kept == vacancy.id:
+            # Первая вакансия группы в этом запуске остается, даже если главная — из прошлых запусков
+            return item
+        similarity = 1.0 if duplicate is None else duplicate.similarity
+        self.duplicates.append(Duplicate(vacancy_id=vacancy.id, duplicate_of=kept, similarity=similarity))
+        return None
+
+    def _extract(self, item: Tuple[int, NormalizedVacancy]) -> Tuple[int, NormalizedVacancy]:
+        if not self._is_done("extract", item[0]):
+            vacancy = item[1]
+            self.storage.save_extraction(self.extractor.extract(vacancy.id, vacancy.description or ""))
+            self._mark_done("extract", item[0])
+        return item
+
+    def _analyze(self, item: Tuple[int, NormalizedVacancy]) -> Tuple[int, NormalizedVacancy]:
+        if not self._is_done("analyze", item[0]):
+            vacancy = item[1]
+            self.storage.save_analysis(self.analyzer.analyze(vacancy.id, vacancy.description or ""))
+            self._mark_done("analyze", item[0])
+        return item
+
+    def _is_done(self, stage: str, index: int) -> bool:
+        checkpoint = self._checkpoint
+        return checkpoint is not None and index in checkpoint.done.get(stage, ())
+
+    def _mark_done(self, stage: str, index: int) -> None:
+        checkpoint = self._checkpoint
+        if checkpoint is not None:
+            # Storage с фоновой записью мог только поставить результат в очередь:
+            # отметка пишется, когда он записан на диск
+            self.storage.after_writes(partial(checkpoint.record_done, stage, index))
@@ -0,0 +1,226 @@
+"""
+Движок конвейера из параллельных стадий.
+
+Каждая стадия работает в своих потоках и получает элементы из
+ограниченной очереди от предыдущей стадии. Загрузка из сети, разбор и
+запись на диск идут одновременно, и время всего конвейера определяет
+самая медленная стадия, а не сумма всех.
+
+Очереди ограничены: когда стадия не успевает, предыдущая блокируется на
+``put`` и не копит элементы в памяти (backpressure). Ошибка в любой
+стадии или вызов ``cancel`` останавливает все стадии и источник. Ошибка
+источника (например, обрыв загрузки) стадии не останавливает: они
+дообрабатывают уже полученные элементы, и только потом ошибка
+выбрасывается.
+"""
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+# Признак конца потока; каждый поток стадии, получив его, возвращает его в очередь для соседей
+_DONE = object()
+
+
+class StageCancelled(Exception):
+    """Конвейер остановлен вызовом ``cancel`` или ошибкой в другой стадии."""
+
+
+@dataclass
+class Stage:
+    """
+    Стадия конвейера.
+
+    Обычная стадия вызывает ``func(item)`` для каждого элемента в
+    ``workers`` потоках и передает дальше результат; ``None`` отбрасывается.
+    При нескольких потоках порядок элементов не сохраняется.
+
+    Потоковая стадия (``stream=True``) работает в одном потоке и вызывается
+    один раз как ``func(items, emit)``: ``items`` — итератор входных
+    элементов, ``emit(item)`` передает элемент следующей стадии. Так
+    оборачиваются API, которым нужен весь поток сразу, например
+    ``Storage.save_raw``.
+
+    ``queue_size`` — емкость очереди на входе стадии.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    workers: int = 1
+    queue_size: int = 64
+    stream: bool = False
+
+    def __post_init__(self) -> None:
+        if self.workers < 1:
+            raise ValueError(f"Stage '{self.name}': workers must be at least 1")
+        if self.queue_size < 1:
+            raise ValueError(f"Stage '{self.name}': queue_size must be at least 1")
+        if self.stream and self.workers != 1:
+            raise ValueError(f"Stage '{self.name}': a stream stage runs in exactly one worker")
+
+
+class StageEngine:
+    """
+    Запускает стадии над потоком элементов.
+
+    ``run(source)`` — генератор результатов последней стадии. Источник
+    читается в отдельном потоке, так что загрузка идет, пока стадии
+    обрабатывают уже полученное. Если стадия упала, остальные
+    останавливаются, а ``run`` выбрасывает ее исключение. После ``cancel``
+    (из любого потока) ``run`` выбрасывает ``StageCancelled``; если
+    потребитель сам перестал читать результаты, стадии тоже останавливаются.
+    """
+
+    def __init__(self, stages: Sequence[Stage], poll_interval: float = 0.1):
+        """
+        Args:
+            stages: Стадии в порядке обработки.
+            poll_interval: Как часто заблокированные потоки проверяют отмену, с.
+        """
+        if not stages:
+            raise ValueError("At least one stage is required")
+        self.stages = list(stages)
+        self.poll_interval = poll_interval
+        self._cancelled = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Остановлен ли текущий запуск."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Останавливает источник и все стадии текущего запуска."""
+        self._cancelled.set()
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Пропускает элементы ``source`` через все стадии.
+
+        Raises:
+            StageCancelled: Если запуск отменен через ``cancel``.
+            Exception: Первое исключение, выброшенное источником или стадией.
+        """
+        self._cancelled.clear()
+        self._error = None
+        # queues[i] — вход стадии i, последняя очередь — выход конвейера
+        queues: List[queue.Queue] = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        queues.append(queue.Queue(maxsize=self.stages[-1].queue_size))
+
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0]), name="stage-source", daemon=True)]
+        for stage, inbox, outbox in zip(self.stages, queues, queues[1:]):
+            remaining = [stage.workers]
+            for i in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, inbox, outbox, remaining),
+                    name=f"stage-{stage.name}-{i}",
+                    daemon=True,
+                ))
+        for thread in threads:
+            thread.start()
+
+        finished = False
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    finished = True
+                    break
+                yield item
+        except StageCancelled:
+            pass
+        finally:
+            # Сюда попадаем и когда потребитель бросил генератор: стадии нужно остановить
+            if not finished:
+                self._cancelled.set()
+            for thread in threads:
+                thread.join()
+        if self._error is not None:
+            raise self._error
+        if not finished:
+            raise StageCancelled("Pipeline was cancelled")
+
+    def _feed(self, source: Iterable[Any], outbox: queue.Queue) -> None:
+        items = iter(source)
+        try:
+            for item in items:
+                self._put(outbox, item)
+            self._put(outbox, _DONE)
+        except StageCancelled:
+            pass
+        except BaseException as e:
+            # Уже полученные элементы дообрабатываются, ошибка выбрасывается в конце run
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+            try:
+                self._put(outbox, _DONE)
+            except StageCancelled:
+                pass
+        finally:
+            # Закрываем генератор источника в том же потоке, где он работал
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox: queue.Queue, remaining: List[int]) -> None:
+        try:
+            if stage.stream:
+                stage.func(self._iter(inbox), lambda item: self._put(outbox, item))
+            else:
+                while True:
+                    item = self._get(inbox)
+                    if item is _DONE:
+                        self._put(inbox, _DONE)
+                        break
+                    result = stage.func(item)
+                    if result is not None:
+                        self._put(outbox, result)
+        except StageCancelled:
+            return
+        except BaseException as e:
+            self._fail(e)
+            return
+        # Конец потока передается дальше, когда закончил последний поток стадии
+        with self._lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            try:
+                self._put(outbox, _DONE)
+            except StageCancelled:
+                pass
+
+    def _iter(self, inbox: queue.Queue) -> Iterator[Any]:
+        while True:
+            item = self._get(inbox)
+            if item is _DONE:
+                return
+            yield item
+
+    def _put(self, q: queue.Queue, item: Any) -> None:
+        while True:
+            if self._cancelled.is_set():
+                raise StageCancelled
+            try:
+                q.put(item, timeout=self.poll_interval)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        while True:
+            if self._cancelled.is_set():
+                raise StageCancelled
+            try:
+                return q.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+
+    def _fail(self, error: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._cancelled.set()
@@ -3,6 +3,8 @@ This __init__.py file makes the 'storage' directory a Python package
 and exposes the primary classes for easier importing.
 """
 from .base import Storage
+from .jsonl import JsonlStorage
 from .local import LocalStorage
+from .sqlite import SQLiteStorage
 
-__all__ = ["Storage", "LocalStorage"]
+__all__ = ["Storage", "LocalStorage", "JsonlStorage", "SQLiteStorage"]
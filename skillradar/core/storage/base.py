@@ -6,11 +6,60 @@ will have a consistent interface for saving and loading pipeline artifacts
 like raw and normalized data.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union
+from dataclasses import asdict, is_dataclass
+from dataclasses import fields as dataclass_fields
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Self,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from ..analysis.models import AnalysisResult
 from ..extract.models import ExtractionResult
+from ..fetch.models import RawVacancy
 from ..normalize.models import NormalizedVacancy
+from .catalog import SnapshotInfo
+
+NORMALIZED_FIELDS: Tuple[str, ...] = tuple(field.name for field in dataclass_fields(NormalizedVacancy))
+
+
+def check_fields(fields: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+    """
+    Validates a projection of NormalizedVacancy fields.
+
+    Returns:
+        The field names as a tuple, or None if no projection was requested.
+
+    Raises:
+        ValueError: If a name is not a NormalizedVacancy field.
+    """
+    if fields is None:
+        return None
+    unknown = [field for field in fields if field not in NORMALIZED_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown NormalizedVacancy fields: {', '.join(unknown)}")
+    return tuple(fields)
+
+
+def to_record(item: Any) -> Any:
+    """
+    Converts a raw item to the dictionary that is stored: RawVacancy
+    objects with ``to_dict``, other dataclasses with ``asdict``. Other
+    items are returned as is.
+    """
+    if isinstance(item, RawVacancy):
+        return item.to_dict()
+    if is_dataclass(item):
+        return asdict(item)
+    return item
 
 
 class Storage(ABC):
@@ -25,13 +74,14 @@ class Storage(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def save_raw(self, name: str, data: Union[Dict[str, Any], List[Any]]) -> None:
+    def save_raw(self, name: str, data: Union[Dict[str, Any], Iterable[Any]]) -> None:
         """
         Saves raw data (e.g., from an API response) to the storage.
 
         Args:
             name: A unique identifier for the data (e.g., 'vacancies_2025-12-20').
-            data: The Python object (dict or list) to be stored.
+            data: The Python object (dict or list) to be stored. Any other
+                iterable, such as a generator, is consumed item by item.
         """
         raise NotImplementedError
 
@@ -52,13 +102,14 @@ class Storage(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def save_normalized(self, name: str, data: List[NormalizedVacancy]) -> None:
+    def save_normalized(self, name: str, data: Iterable[NormalizedVacancy]) -> None:
         """
         Saves normalized data to the storage.
 
         Args:
             name: A unique identifier for the data.
-            data: A list of NormalizedVacancy objects to be stored.
+            data: NormalizedVacancy objects to be stored (a list or a
+                generator, which is consumed item by item).
         """
         raise NotImplementedError
 
@@ -78,6 +129,54 @@ class Storage(ABC):
         """
         raise NotImplementedError
 
+    def iter_normalized(
+        self, name: str, fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Union[NormalizedVacancy, Dict[str, Any]]]:
+        """
+        Yields the normalized vacancies of a snapshot one at a time.
+
+        The default implementation loads the whole snapshot first;
+        backends override it to read vacancies lazily.
+
+        Args:
+            name: The unique identifier of the snapshot.
+            fields: NormalizedVacancy field names to keep. If given, each
+                vacancy is yielded as a dictionary with just these fields,
+                and backends may skip reading the others.
+
+        Raises:
+            FileNotFoundError: If the data with the given name does not exist.
+            ValueError: If a field name is not a NormalizedVacancy field.
+        """
+        fields = check_fields(fields)
+        vacancies = self.load_normalized(name)
+        if fields is None:
+            return iter(vacancies)
+        return ({field: getattr(vacancy, field) for field in fields} for vacancy in vacancies)
+
+    def get_normalized(self, name: str, vacancy_id: str) -> Optional[NormalizedVacancy]:
+        """
+        Loads a single normalized vacancy by its ID.
+
+        The default implementation scans the whole snapshot; backends
+        with an index override it to read just the one vacancy.
+
+        Args:
+            name: The unique identifier of the snapshot.
+            vacancy_id: The ID of the vacancy.
+
+        Returns:
+            The vacancy, or None if the snapshot has no vacancy with this ID.
+
+        Raises:
+            FileNotFoundError: If the data with the given name does not exist.
+        """
+        found = None
+        for vacancy in self.load_normalized(name):
+            if vacancy.id == vacancy_id:
+                found = vacancy
+        return found
+
     @abstractmethod
     def save_analysis(self, result: AnalysisResult) -> None:
         """
@@ -91,3 +190,98 @@ class Storage(ABC):
         Saves the result of a single vacancy skill extraction.
         """
         raise NotImplementedError
+
+    def save_analyses_many(self, results: Iterable[AnalysisResult]) -> None:
+        """
+        Saves many analysis results at once.
+
+        The default implementation calls ``save_analysis`` for each result;
+        backends override it to write results in batches.
+        """
+        for result in results:
+            self.save_analysis(result)
+
+    def save_extractions_many(self, results: Iterable[ExtractionResult]) -> None:
+        """
+        Saves many extraction results at once.
+
+        The default implementation calls ``save_extraction`` for each result;
+        backends override it to write results in batches.
+        """
+        for result in results:
+            self.save_extraction(result)
+
+    @abstractmethod
+    def load_analyses(self) -> List[AnalysisResult]:
+        """
+        Loads all stored analysis results, one per vacancy.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_extractions(self) -> List[ExtractionResult]:
+        """
+        Loads all stored extraction results, one per vacancy.
+        """
+        raise NotImplementedError
+
+    def describe_snapshot(self, name: str, query: Optional[str] = None, region: Optional[str] = None) -> None:
+        """
+        Records what a snapshot was fetched for, so that it can be found
+        with ``list_snapshots`` and ``latest_snapshot``.
+
+        The default implementation does nothing.
+
+        Args:
+            name: The unique identifier of the snapshot.
+            query: The search query of the run.
+            region: The region of the run.
+        """
+
+    def list_snapshots(self, query: Optional[str] = None) -> List[SnapshotInfo]:
+        """
+        Lists the stored snapshots, oldest first, from the storage's
+        catalog; snapshot bodies are never read.
+
+        Args:
+            query: Only snapshots described with this search query.
+
+        Raises:
+            NotImplementedError: If the backend keeps no catalog.
+        """
+        raise NotImplementedError
+
+    def latest_snapshot(self, query: Optional[str] = None) -> Optional[SnapshotInfo]:
+        """
+        Returns the most recently created snapshot, optionally for a
+        search query, or None if there is none.
+        """
+        snapshots = self.list_snapshots(query)
+        return snapshots[-1] if snapshots else None
+
+    def flush(self) -> None:
+        """
+        Waits until all saves issued so far are written.
+
+        Backends that write synchronously have nothing to wait for.
+        """
+
+    def after_writes(self, callback: Callable[[], None]) -> None:
+        """
+        Calls ``callback`` once all saves issued so far are written.
+
+        Backends that write synchronously call it at once.
+        """
+        callback()
+
+    def close(self) -> None:
+        """
+        Writes pending data and releases the resources of the storage.
+        """
+        self.flush()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,105 @@
+"""Content-addressed store for large text fields.
+
+Vacancy descriptions are the bulk of every snapshot and rarely change
+between runs. The blob store keeps each distinct text once, in a file
+named after its SHA-256, so snapshots only need to hold a reference to it.
+"""
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+from . import paths
+
+# Key of the reference object that replaces a stored text in a snapshot
+REF_KEY = "$blob"
+
+
+class BlobStore:
+    """
+    Stores texts by the SHA-256 of their UTF-8 encoding.
+
+    Blobs live in ``<directory>/<first two hex digits>/<hash>``. Writing a
+    text that is already stored costs one ``utime`` call. Blobs are written
+    to a temporary file and renamed into place, so a blob is either
+    complete or absent.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """
+        Args:
+            directory: Root directory of the store. Defaults to ``paths.BLOB_DIR``.
+        """
+        self.directory = Path(directory or paths.BLOB_DIR)
+
+    def put(self, text: str) -> str:
+        """Stores a text if it is not stored yet and returns its hash."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._path(digest)
+        try:
+            # A reused blob gets a fresh mtime, so ``gc`` treats it as just
+            # written while the snapshot that references it is being saved
+            os.utime(blob_path)
+            return digest
+        except FileNotFoundError:
+            pass
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob_path.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, blob_path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """
+        Returns the text stored under a hash.
+
+        Raises:
+            FileNotFoundError: If no such blob exists.
+        """
+        return self._path(digest).read_text(encoding="utf-8")
+
+    def ref(self, text: str) -> Dict[str, str]:
+        """Stores a text and returns the reference that replaces it in a record."""
+        return {REF_KEY: self.put(text)}
+
+    def resolve(self, value: Any) -> Any:
+        """Returns the text a reference points to; other values are returned as is."""
+        if is_ref(value):
+            return self.get(value[REF_KEY])
+        return value
+
+    def gc(self, referenced: Iterable[str], grace: float = 3600.0) -> int:
+        """
+        Removes blobs that are not in ``referenced``.
+
+        Blobs written less than ``grace`` seconds ago are kept, because the
+        snapshot referencing them may still be being written.
+
+        Returns:
+            The number of removed blobs.
+        """
+        keep: Set[str] = set(referenced)
+        cutoff = time.time() - grace
+        removed = 0
+        if not self.directory.exists():
+            return 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name in keep or entry.stat().st_mtime > cutoff:
+                    continue
+                os.unlink(entry.path)
+                removed += 1
+        return removed
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / digest
+
+
+def is_ref(value: Any) -> bool:
+    """Whether a value is a blob reference."""
+    return isinstance(value, dict) and len(value) == 1 and REF_KEY in value
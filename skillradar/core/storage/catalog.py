@@ -0,0 +1,142 @@
+"""Manifest of the snapshots kept by a file-based storage.
+
+Finding runs by globbing the data directories and opening every snapshot
+gets slower with every run. The catalog is a small JSON Lines log next
+to the data: every save appends one line with what it learned about a
+snapshot (record count, file size, checksum, how long it took), and the
+catalog is listed by folding these lines, without touching a snapshot.
+
+Lines are only ever appended, each with a single ``write`` call, so
+several pipelines can update one catalog at the same time. A line torn
+by a crash is skipped when the catalog is read and cut off before the
+next line is appended.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import paths
+from .writer import drop_partial_line
+
+# Kinds of snapshot data a catalog line can describe
+KINDS = ("raw", "normalized")
+
+
+@dataclass
+class SnapshotInfo:
+    """
+    Catalog entry of a snapshot.
+
+    Fields of a part that has not been saved, and checksums of snapshots
+    that are appended to, are None.
+    """
+
+    name: str
+    created_at: str
+    updated_at: str
+    query: Optional[str] = None
+    region: Optional[str] = None
+    raw_count: Optional[int] = None
+    raw_bytes: Optional[int] = None
+    raw_sha256: Optional[str] = None
+    raw_seconds: Optional[float] = None
+    normalized_count: Optional[int] = None
+    normalized_bytes: Optional[int] = None
+    normalized_sha256: Optional[str] = None
+    normalized_seconds: Optional[float] = None
+
+
+_INFO_FIELDS = frozenset(field.name for field in fields(SnapshotInfo))
+# Fields the catalog maintains itself
+_SETTABLE_FIELDS = _INFO_FIELDS - {"name", "created_at", "updated_at"}
+
+
+class SnapshotCatalog:
+    """
+    Append-only catalog of snapshots stored in a JSON Lines file.
+
+    Each line holds a snapshot name, a timestamp and the fields the
+    update sets. A snapshot's entry is the union of its lines, later
+    values winning; ``created_at`` is the time of its first line.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Args:
+            path: The catalog file. Defaults to ``paths.CATALOG_PATH``.
+        """
+        self.path = Path(path or paths.CATALOG_PATH)
+        self._lock = threading.Lock()
+
+    def update(self, name: str, **values: Any) -> None:
+        """
+        Records new facts about a snapshot.
+
+        Args:
+            name: The snapshot name.
+            **values: SnapshotInfo fields to set, e.g. ``raw_count=100``.
+
+        Raises:
+            ValueError: If a value is not a settable SnapshotInfo field.
+        """
+        unknown = set(values) - _SETTABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown snapshot fields: {', '.join(sorted(unknown))}")
+        line = {"name": name, "at": _now(), **values}
+        data = (json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            drop_partial_line(self.path)
+            # O_APPEND keeps lines of concurrent writers from interleaving
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def snapshots(self, query: Optional[str] = None) -> List[SnapshotInfo]:
+        """
+        Returns the catalog entries, oldest snapshot first.
+
+        Args:
+            query: Only snapshots fetched with this search query.
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash
+                        continue
+                    at = record.pop("at")
+                    entry = entries.setdefault(record["name"], {"created_at": at})
+                    entry.update(record, updated_at=at)
+        except FileNotFoundError:
+            return []
+        infos = [SnapshotInfo(**{k: v for k, v in entry.items() if k in _INFO_FIELDS}) for entry in entries.values()]
+        if query is not None:
+            infos = [info for info in infos if info.query == query]
+        infos.sort(key=lambda info: (info.created_at, info.name))
+        return infos
+
+    def latest(self, query: Optional[str] = None) -> Optional[SnapshotInfo]:
+        """Returns the most recently created snapshot, optionally for a query, or None."""
+        infos = self.snapshots(query)
+        return infos[-1] if infos else None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def part_values(kind: str, **values: Any) -> Dict[str, Any]:
+    """Prefixes the values of a raw or normalized save with its kind, e.g. ``count`` -> ``raw_count``."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown snapshot kind: {kind}")
+    return {f"{kind}_{key}": value for key, value in values.items()}
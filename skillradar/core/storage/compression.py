@@ -0,0 +1,115 @@
+"""Compression codecs for snapshot files.
+
+Snapshots can be written with gzip or xz from the standard library, or
+with zstd when the optional ``zstandard`` package is installed
+(``pip install skill-radar[zstd]``). Readers detect the codec from the
+file's magic bytes, so a snapshot is loaded the same way whatever codec
+it was written with.
+"""
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import IO, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# File name suffix appended after '.json' for each codec
+SUFFIXES: Dict[str, str] = {"gzip": ".gz", "xz": ".xz", "zstd": ".zst"}
+
+# Default compression level for each codec
+DEFAULT_LEVELS: Dict[str, int] = {"gzip": 6, "xz": 6, "zstd": 3}
+
+_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+def check_codec(codec: Optional[str]) -> None:
+    """
+    Checks that a codec name is known and its implementation is available.
+
+    Raises:
+        ValueError: If the codec is unknown.
+        ImportError: If the codec is ``zstd`` and ``zstandard`` is not installed.
+    """
+    if codec is None:
+        return
+    if codec not in SUFFIXES:
+        raise ValueError(f"Unknown compression codec '{codec}', expected one of {sorted(SUFFIXES)}")
+    if codec == "zstd" and zstandard is None:
+        raise ImportError("zstd compression requires the 'zstandard' package: pip install skill-radar[zstd]")
+
+
+def detect_codec(path: Path) -> Optional[str]:
+    """Returns the codec a file was compressed with, or None for a plain file."""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, codec in _MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def open_text(path: Path, mode: str, codec: Optional[str] = None, level: Optional[int] = None) -> IO[str]:
+    """
+    Opens a possibly compressed file as a UTF-8 text stream.
+
+    Args:
+        path: The file to open.
+        mode: ``"r"`` or ``"w"``.
+        codec: Codec to write with. When reading, the codec is detected
+            from the file and this argument is ignored.
+        level: Compression level; the codec's default if omitted.
+    """
+    if mode == "r":
+        codec = detect_codec(path)
+    check_codec(codec)
+    if codec is None:
+        return open(path, mode, encoding="utf-8")
+    if level is None:
+        level = DEFAULT_LEVELS[codec]
+
+    # The streams are handed to the caller, who closes them through the wrapper
+    if codec == "gzip":
+        binary: IO[bytes] = gzip.open(path, mode + "b", compresslevel=level)  # noqa: SIM115
+    elif codec == "xz":
+        binary = lzma.open(path, mode + "b", preset=level if mode == "w" else None)  # noqa: SIM115
+    elif mode == "r":
+        binary = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)  # noqa: SIM115
+    else:
+        binary = zstandard.ZstdCompressor(level=level).stream_writer(open(path, "wb"), closefd=True)  # noqa: SIM115
+    return io.TextIOWrapper(binary, encoding="utf-8")
+
+
+def wrap_writer(binary: IO[bytes], codec: Optional[str] = None, level: Optional[int] = None) -> IO[str]:
+    """
+    Returns a UTF-8 text stream that writes to an open binary file
+    through a codec.
+
+    Closing the text stream finishes the compressed data; ``binary`` may
+    be closed with it or not, so the caller closes it afterwards.
+
+    Args:
+        binary: The file to write the (compressed) bytes to.
+        codec: Codec to write with, or None to write plain text.
+        level: Compression level; the codec's default if omitted.
+    """
+    check_codec(codec)
+    if codec is None:
+        return io.TextIOWrapper(binary, encoding="utf-8")
+    if level is None:
+        level = DEFAULT_LEVELS[codec]
+    # The caller closes the stream, which finishes the compressed data
+    if codec == "gzip":
+        compressed: IO[bytes] = gzip.GzipFile(fileobj=binary, mode="wb", compresslevel=level)  # noqa: SIM115
+    elif codec == "xz":
+        compressed = lzma.LZMAFile(binary, "wb", preset=level)  # noqa: SIM115
+    else:
+        compressed = zstandard.ZstdCompressor(level=level).stream_writer(binary, closefd=False)
+    return io.TextIOWrapper(compressed, encoding="utf-8")
@@ -0,0 +1,241 @@
+"""JSON Lines storage implementation.
+
+Records are written as one compact JSON document per line and appended
+as they arrive, so a run never holds its output in memory and a crashed
+run leaves every record written before the crash readable.
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from ..normalize.models import NormalizedVacancy
+from . import offsets
+from .base import check_fields, to_record
+from .blobs import BlobStore
+from .local import LocalStorage, to_vacancy
+from .writer import drop_partial_line
+
+
+class JsonlStorage(LocalStorage):
+    """
+    Stores raw and normalized vacancies as ``.jsonl`` files in the same
+    directories as LocalStorage.
+
+    Every record is serialized without indentation and appended to the
+    file as soon as it is produced; the file is flushed every
+    ``flush_every`` records. Readers stream the file line by line and
+    stop at a truncated last line left by an interrupted write.
+
+    Next to every snapshot a ``.jsonl.idx`` sidecar maps record IDs to
+    the position of their lines (see ``offsets``), so ``get_raw`` and
+    ``get_normalized`` read a single record without parsing the rest.
+
+    Raw data that is a single dictionary rather than a sequence of
+    records is stored as a plain JSON file, as in LocalStorage.
+    Analysis and extraction results are stored as in LocalStorage.
+    """
+
+    def __init__(
+        self,
+        flush_every: int = 100,
+        chunk_size: int = 1000,
+        blobs: Optional[BlobStore] = None,
+        root: Optional[Path] = None,
+        namespace: Optional[str] = None,
+        shard_depth: int = 0,
+    ) -> None:
+        """
+        Args:
+            flush_every: How many records to write between flushes to
+                the operating system.
+            chunk_size: Maximum number of results per chunk file, as in LocalStorage.
+            blobs: Store for descriptions, as in LocalStorage.
+            root: Directory for all data, as in LocalStorage.
+            namespace: Name of a separate data directory, as in LocalStorage.
+            shard_depth: Subdirectory levels for result files, as in LocalStorage.
+        """
+        super().__init__(chunk_size=chunk_size, blobs=blobs, root=root, namespace=namespace, shard_depth=shard_depth)
+        if flush_every < 1:
+            raise ValueError("flush_every must be at least 1")
+        self.flush_every = flush_every
+
+    def save_raw(self, name: str, data: Union[Dict[str, Any], Iterable[Any]]) -> None:
+        """
+        Saves raw records to ``<name>.jsonl`` in the raw data directory,
+        replacing an existing file. A dictionary is saved as ``<name>.json``.
+
+        Args:
+            name: The base name for the file.
+            data: The records to save. Dataclass items are converted to
+                dictionaries. A generator is consumed item by item.
+        """
+        if isinstance(data, dict):
+            super().save_raw(name, data)
+            return
+        self.ensure_dirs()
+        self._write("raw", name, data, "w")
+
+    def append_raw(self, name: str, data: Iterable[Any]) -> None:
+        """Appends raw records to ``<name>.jsonl``, creating it if needed."""
+        self.ensure_dirs()
+        self._write("raw", name, data, "a")
+
+    def load_raw(self, name: str) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Loads raw data saved under ``name``.
+
+        Returns:
+            The list of records, or the dictionary if one was saved.
+
+        Raises:
+            FileNotFoundError: If no data with the given name exists.
+        """
+        if not (self.raw_dir / f"{name}.jsonl").exists() and (self.raw_dir / f"{name}.json").exists():
+            return super().load_raw(name)
+        return list(self.iter_raw(name))
+
+    def get_raw(self, name: str, vacancy_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the raw record with the given ID from ``<name>.jsonl``, or None.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        return self._unpack(offsets.lookup(self.raw_dir / f"{name}.jsonl", vacancy_id))
+
+    def iter_raw(self, name: str) -> Iterator[Any]:
+        """
+        Yields raw records from ``<name>.jsonl`` one at a time.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        return (self._unpack(record) for record in _read(self.raw_dir / f"{name}.jsonl"))
+
+    def save_normalized(self, name: str, data: Iterable[NormalizedVacancy]) -> None:
+        """
+        Saves normalized vacancies to ``<name>.jsonl`` in the normalized
+        data directory, replacing an existing file.
+
+        Args:
+            name: The base name for the file.
+            data: The NormalizedVacancy objects to save.
+        """
+        self.ensure_dirs()
+        self._write("normalized", name, data, "w")
+
+    def append_normalized(self, name: str, data: Iterable[NormalizedVacancy]) -> None:
+        """Appends normalized vacancies to ``<name>.jsonl``, creating it if needed."""
+        self.ensure_dirs()
+        self._write("normalized", name, data, "a")
+
+    def load_normalized(self, name: str) -> List[NormalizedVacancy]:
+        """
+        Loads normalized vacancies from ``<name>.jsonl``.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        return list(self.iter_normalized(name))
+
+    def get_normalized(self, name: str, vacancy_id: str) -> Optional[NormalizedVacancy]:
+        """
+        Returns the normalized vacancy with the given ID from ``<name>.jsonl``,
+        or None. Only that vacancy's line is read and parsed.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        record = offsets.lookup(self.normalized_dir / f"{name}.jsonl", vacancy_id)
+        return None if record is None else NormalizedVacancy(**self._unpack(record))
+
+    def iter_normalized(
+        self, name: str, fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Union[NormalizedVacancy, Dict[str, Any]]]:
+        """
+        Yields normalized vacancies from ``<name>.jsonl`` one at a time.
+
+        Args:
+            name: The base name of the file.
+            fields: Field names to keep. If given, each vacancy is yielded
+                as a dictionary with just these fields.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If a field name is not a NormalizedVacancy field.
+        """
+        fields = check_fields(fields)
+        return (
+            to_vacancy(self._unpack(item, fields), fields) for item in _read(self.normalized_dir / f"{name}.jsonl")
+        )
+
+    def _write(self, kind: str, name: str, records: Iterable[Any], mode: str) -> None:
+        """
+        Writes records to a raw or normalized snapshot, then updates its
+        offset index and catalog entry.
+
+        The checksum is computed from the lines as they are written.
+        Appending does not compute one, which would mean reading the whole
+        file again, and counts the records that have an ID.
+        """
+        file_path = self._dir(kind) / f"{name}.jsonl"
+        started = time.perf_counter()
+        count = 0
+        entries: List[offsets.Entry] = []
+        digest = hashlib.sha256()
+        if mode == "a":
+            drop_partial_line(file_path)
+            if file_path.exists():
+                if not offsets.read_entries(file_path):
+                    offsets.rebuild_index(file_path)
+                entries = offsets.read_entries(file_path)
+        with open(file_path, mode + "b") as f:
+            offset = f.tell()
+            for count, record in enumerate(records, 1):
+                record = self._pack(to_record(record))
+                line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                line += b"\n"
+                f.write(line)
+                digest.update(line)
+                entry = offsets.entry_for(record, offset, len(line) - 1)
+                if entry:
+                    entries.append(entry)
+                offset += len(line)
+                if count % self.flush_every == 0:
+                    f.flush()
+        offsets.write_index(file_path, entries, offset)
+        if mode == "a":
+            self._record_save(kind, name, file_path, len(entries), started)
+        else:
+            self._record_save(kind, name, file_path, count, started, digest.hexdigest())
+
+
+def _read(file_path: Path) -> Iterator[Any]:
+    """
+    Opens a JSON Lines file and returns an iterator over its records.
+
+    The file is opened immediately, so a missing file raises
+    FileNotFoundError here rather than on the first ``next()``.
+    """
+    return _records(open(file_path, "r", encoding="utf-8"))
+
+
+def _records(f: IO[str]) -> Iterator[Any]:
+    """
+    Yields the records of an open JSON Lines file and closes it.
+
+    A last line without a trailing newline that fails to parse is the
+    remainder of an interrupted write and is skipped.
+    """
+    with f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if line.endswith("\n"):
+                    raise
+                return
@@ -1,56 +1,232 @@
 """Local file system storage implementation."""
+import hashlib
 import json
-from dataclasses import asdict, is_dataclass
-from typing import Any, Dict, List, Union
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict
+from itertools import islice
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from ..analysis.models import AnalysisResult
 from ..extract.models import ExtractionResult
 from ..normalize.models import NormalizedVacancy
+from . import compression as compression_module
 from . import paths
-from .base import Storage
+from .base import Storage, check_fields, to_record
+from .blobs import REF_KEY, BlobStore, is_ref
+from .catalog import SnapshotCatalog, SnapshotInfo, part_values
+from .writer import BackgroundWriter, atomic_open
+
+Result = TypeVar("Result", AnalysisResult, ExtractionResult)
+
+# Record fields that are moved to the blob store
+BLOB_FIELDS = ("description", "branded_description")
+
+# Directory under a storage root that holds one directory per namespace
+NAMESPACES_DIR = "namespaces"
+
+# Data kinds and the ``paths`` attributes of their default directories
+_DEFAULT_DIRS = {
+    "raw": "RAW_DIR",
+    "normalized": "NORMALIZED_DIR",
+    "analysis": "ANALYSIS_DIR",
+    "extraction": "EXTRACTION_DIR",
+}
 
 
 class LocalStorage(Storage):
     """
     Stores pipeline artifacts (raw, normalized data, etc.) on the
     local file system as JSON files.
+
+    Extraction and analysis results saved one at a time get a JSON file
+    per vacancy; results saved in bulk are written as JSON Lines chunk
+    files of up to ``chunk_size`` results each.
+
+    Every file is committed atomically: it is written to a temporary
+    file, synced to disk and renamed over the final path, so a crash never
+    leaves a half-written file under a snapshot's name.
+
+    With ``write_behind``, saves only queue the data and a background
+    thread writes it, so callers do not wait for the disk. Iterables are
+    queued in lists of up to ``chunk_size`` items, so a generator is never
+    held in memory as a whole. At most ``max_pending`` writes wait in the
+    queue; further saves block until one is written.
+    Loads wait for the queued writes first. ``flush`` waits for them
+    explicitly and ``close`` also stops the thread; errors of background
+    writes are raised from the next save, ``flush`` or ``close``.
+
+    Raw and normalized snapshots can be compressed with ``compression``
+    (``"gzip"``, ``"xz"`` or ``"zstd"``); the codec's suffix is appended to
+    the file name, e.g. ``vacancies.json.gz``. Loading detects the codec
+    and decompresses the file as a stream.
+
+    With a ``blobs`` store, the ``description`` and ``branded_description``
+    of every vacancy are saved in it once and snapshots hold only
+    ``{"$blob": <sha256>}`` references, which loading resolves. Unreferenced
+    blobs are removed by ``collect_garbage``.
+
+    Every snapshot save is recorded in a ``SnapshotCatalog`` with the
+    record count, file size, SHA-256 and duration of the write, which
+    ``list_snapshots`` and ``latest_snapshot`` read instead of the snapshots.
+
+    By default the data lives in the directories of ``paths``. With a
+    ``root`` it lives in ``<root>/raw``, ``<root>/normalized`` and so on,
+    e.g. on a fast local disk or a tmpfs. A ``namespace`` moves it to
+    ``<root>/namespaces/<namespace>/...`` with a catalog of its own, so
+    pipelines that use different namespaces (e.g. one per run ID) can
+    write in parallel without overwriting each other's snapshots.
+    Namespaces of a root share its blob store.
+
+    With ``shard_depth``, per-vacancy result files are spread over
+    ``shard_depth`` levels of subdirectories named after bytes of a hash
+    of the vacancy ID (``analysis/3f/a0/<id>.json``), which keeps
+    directories small when millions of vacancies are analyzed. Results
+    are loaded from either layout.
     """
 
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        compression: Optional[str] = None,
+        level: Optional[int] = None,
+        blobs: Optional[BlobStore] = None,
+        write_behind: bool = False,
+        max_pending: int = 16,
+        catalog: Optional[SnapshotCatalog] = None,
+        root: Optional[Path] = None,
+        namespace: Optional[str] = None,
+        shard_depth: int = 0,
+    ) -> None:
+        """
+        Args:
+            chunk_size: Maximum number of results per chunk file written
+                by ``save_extractions_many`` and ``save_analyses_many``, and
+                of records per queued write with ``write_behind``.
+            compression: Codec for new snapshots, or None to write plain JSON.
+            level: Compression level; the codec's default if omitted.
+            blobs: Store for descriptions, or None to keep them inline.
+            write_behind: Whether to write on a background thread.
+            max_pending: How many writes may wait for the background thread.
+            catalog: Catalog of the snapshots; ``catalog.jsonl`` in the data
+                directory if omitted.
+            root: Directory for all data; ``paths.DATA_DIR`` if omitted.
+            namespace: Name of a separate data directory under the root.
+            shard_depth: Subdirectory levels for per-vacancy result files.
+
+        Raises:
+            ValueError: If the codec, the namespace or the shard depth is invalid.
+            ImportError: If the codec is ``"zstd"`` and ``zstandard`` is not installed.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        compression_module.check_codec(compression)
+        if namespace is not None and (not namespace or namespace.startswith(".") or Path(namespace).name != namespace):
+            raise ValueError(f"Invalid namespace: {namespace!r}")
+        if not 0 <= shard_depth <= 4:
+            raise ValueError("shard_depth must be between 0 and 4")
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.level = level
+        self.blobs = blobs
+        self.catalog = catalog
+        self.root = Path(root) if root is not None else None
+        self.namespace = namespace
+        self.shard_depth = shard_depth
+        self._created_dirs: Optional[Tuple[Path, ...]] = None
+        # Shard directories this instance has created, so each costs one mkdir
+        self._shard_dirs: Set[Path] = set()
+        self._writer = BackgroundWriter(max_pending) if write_behind else None
+
     def ensure_dirs(self) -> None:
         """
         Creates the directories for all data types if they don't exist.
         The creation is recursive and suppresses errors if directories already exist.
+
+        The directories are created once per instance; later calls only
+        check that the configured paths have not changed.
         """
-        paths.RAW_DIR.mkdir(parents=True, exist_ok=True)
-        paths.NORMALIZED_DIR.mkdir(parents=True, exist_ok=True)
-        paths.ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
-        paths.EXTRACTION_DIR.mkdir(parents=True, exist_ok=True)
+        dirs = (self.raw_dir, self.normalized_dir, self.analysis_dir, self.extraction_dir)
+        if dirs == self._created_dirs:
+            return
+        for directory in dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+        self._created_dirs = dirs
 
-    def save_raw(self, name: str, data: Union[Dict[str, Any], List[Any]]) -> None:
+    @property
+    def data_dir(self) -> Path:
+        """The directory that holds the data of this storage's namespace."""
+        base = self.root if self.root is not None else paths.DATA_DIR
+        return base / NAMESPACES_DIR / self.namespace if self.namespace else base
+
+    @property
+    def raw_dir(self) -> Path:
+        """Directory of raw snapshots."""
+        return self._dir("raw")
+
+    @property
+    def normalized_dir(self) -> Path:
+        """Directory of normalized snapshots."""
+        return self._dir("normalized")
+
+    @property
+    def analysis_dir(self) -> Path:
+        """Directory of analysis results."""
+        return self._dir("analysis")
+
+    @property
+    def extraction_dir(self) -> Path:
+        """Directory of extraction results."""
+        return self._dir("extraction")
+
+    def _dir(self, kind: str) -> Path:
+        if self.root is None and self.namespace is None:
+            # Resolved on every call, so that the module paths can be changed at runtime
+            return getattr(paths, _DEFAULT_DIRS[kind])
+        return self.data_dir / kind
+
+    def save_raw(self, name: str, data: Union[Dict[str, Any], Iterable[Any]]) -> None:
         """
         Saves a Python object as a JSON file in the raw data directory.
 
-        If the data is a list of dataclass objects, they are converted to
-        dictionaries before serialization.
+        A dictionary is written as a JSON object. Any other iterable
+        (a list or a generator) is written as a JSON array one item at a
+        time, so a generator is consumed lazily and never held in memory
+        as a whole. Dataclass items are converted to dictionaries.
 
         The method ensures the target directory exists before writing.
         Files are saved with UTF-8 encoding and without escaping non-ASCII chars.
 
         Args:
             name: The base name for the file (e.g., 'vacancies_hh').
-                  '.json' extension will be appended.
-            data: The dictionary or list to save.
+                  '.json' extension will be appended, followed by the
+                  compression suffix if compression is enabled.
+            data: The dictionary or iterable to save.
         """
         self.ensure_dirs()
-        file_path = paths.RAW_DIR / f"{name}.json"
-
-        # Prepare data for JSON serialization (handle list of dataclasses)
-        json_data = data
-        if isinstance(data, list) and data and is_dataclass(data[0]):
-            json_data = [asdict(item) for item in data]
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        if isinstance(data, dict):
+            self._submit(self._write_object, name, data)
+        else:
+            self._save_array("raw", name, (to_record(item) for item in data))
 
     def load_raw(self, name: str) -> Union[Dict[str, Any], List[Any]]:
         """
@@ -65,26 +241,27 @@ class LocalStorage(Storage):
         Raises:
             FileNotFoundError: If the specified file does not exist.
         """
-        file_path = paths.RAW_DIR / f"{name}.json"
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        self.flush()
+        with compression_module.open_text(_snapshot_path(self.raw_dir, name), "r") as f:
+            first = _peek(f)
+            if first == "[":
+                return [self._unpack(item) for item in _iter_array(f, first)]
+            return json.loads(first + f.read())
 
-    def save_normalized(self, name: str, data: List[NormalizedVacancy]) -> None:
+    def save_normalized(self, name: str, data: Iterable[NormalizedVacancy]) -> None:
         """
-        Saves a list of normalized vacancies as a JSON file in the normalized
+        Saves normalized vacancies as a JSON file in the normalized
         data directory.
 
-        The Pydantic models are converted to dictionaries before serialization.
+        The dataclasses are converted to dictionaries and written one by
+        one, so ``data`` may be a generator.
 
         Args:
             name: The base name for the file. '.json' will be appended.
-            data: The list of NormalizedVacancy objects to save.
+            data: The NormalizedVacancy objects to save.
         """
         self.ensure_dirs()
-        file_path = paths.NORMALIZED_DIR / f"{name}.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json_data = [asdict(vacancy) for vacancy in data]
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        self._save_array("normalized", name, (asdict(vacancy) for vacancy in data))
 
     def load_normalized(self, name: str) -> List[NormalizedVacancy]:
         """
@@ -100,10 +277,228 @@ class LocalStorage(Storage):
         Raises:
             FileNotFoundError: If the specified file does not exist.
         """
-        file_path = paths.NORMALIZED_DIR / f"{name}.json"
-        with open(file_path, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
-            return [NormalizedVacancy(**item) for item in json_data]
+        return list(self.iter_normalized(name))
+
+    def iter_normalized(
+        self, name: str, fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Union[NormalizedVacancy, Dict[str, Any]]]:
+        """
+        Yields vacancies from a normalized snapshot while reading it, so
+        only one vacancy is held in memory at a time.
+
+        Args:
+            name: The base name of the file to load.
+            fields: Field names to keep. If given, each vacancy is yielded
+                as a dictionary with just these fields and no
+                NormalizedVacancy objects are built.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+            ValueError: If a field name is not a NormalizedVacancy field.
+        """
+        fields = check_fields(fields)
+        self.flush()
+        f = compression_module.open_text(_snapshot_path(self.normalized_dir, name), "r")
+        items = (self._unpack(item, fields) for item in _iter_array(f, _peek(f)))
+        return _read_vacancies(f, items, fields)
+
+    def collect_garbage(self, grace: float = 3600.0) -> int:
+        """
+        Removes blobs that no raw or normalized snapshot refers to.
+
+        Every snapshot of the storage root, in all namespaces, is read as a
+        stream to collect its references. Blobs younger than ``grace`` seconds are kept, because a snapshot
+        that refers to them may still be being written.
+
+        Returns:
+            The number of removed blobs.
+        """
+        self.flush()
+        referenced = set()
+        for directory in self._blob_sharing_dirs():
+            if not directory.exists():
+                continue
+            for entry in os.scandir(directory):
+                for record in _iter_snapshot_file(Path(entry.path)):
+                    if isinstance(record, dict):
+                        referenced.update(
+                            record[field][REF_KEY] for field in BLOB_FIELDS if is_ref(record.get(field))
+                        )
+        return self._blob_store().gc(referenced, grace)
+
+    def _pack(self, record: Any) -> Any:
+        """Moves the description fields of a record to the blob store."""
+        if self.blobs is None or not isinstance(record, dict):
+            return record
+        packed = dict(record)
+        for field in BLOB_FIELDS:
+            value = packed.get(field)
+            if isinstance(value, str) and value:
+                packed[field] = self.blobs.ref(value)
+        return packed
+
+    def _unpack(self, record: Any, fields: Optional[Sequence[str]] = None) -> Any:
+        """Replaces blob references in a record (only in ``fields``, if given) with their texts."""
+        if not isinstance(record, dict):
+            return record
+        for field in BLOB_FIELDS:
+            if (fields is None or field in fields) and is_ref(record.get(field)):
+                record[field] = self._blob_store().resolve(record[field])
+        return record
+
+    def _blob_store(self) -> BlobStore:
+        # Snapshots written with blobs stay readable by a storage without them
+        return self.blobs or BlobStore(self.root / "blobs" if self.root is not None else None)
+
+    def _blob_sharing_dirs(self) -> List[Path]:
+        """Snapshot directories of the root and of all its namespaces."""
+        if self.root is None:
+            dirs = [paths.RAW_DIR, paths.NORMALIZED_DIR]
+            base = paths.DATA_DIR
+        else:
+            dirs = [self.root / "raw", self.root / "normalized"]
+            base = self.root
+        namespaces = base / NAMESPACES_DIR
+        if namespaces.is_dir():
+            for entry in sorted(os.scandir(namespaces), key=lambda entry: entry.name):
+                if entry.is_dir():
+                    dirs.extend(Path(entry.path) / kind for kind in ("raw", "normalized"))
+        return dirs
+
+    @contextmanager
+    def _open_for_write(self, directory: Path, name: str, hasher: Optional[Any] = None) -> Iterator[IO[str]]:
+        """
+        Opens a snapshot file for an atomic write. Once the file is
+        committed, copies of the snapshot saved earlier with a different
+        codec are removed. ``hasher`` is updated with the written bytes.
+        """
+        file_path = self._snapshot_file(directory, name)
+        with atomic_open(file_path, self.compression, self.level, hasher) as f:
+            yield f
+        for stale in _snapshot_candidates(directory, name):
+            if stale != file_path and stale.exists():
+                stale.unlink()
+
+    def _snapshot_file(self, directory: Path, name: str) -> Path:
+        suffix = compression_module.SUFFIXES.get(self.compression, "") if self.compression else ""
+        return directory / f"{name}.json{suffix}"
+
+    def _write_object(self, name: str, data: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        digest = hashlib.sha256()
+        with self._open_for_write(self.raw_dir, name, digest) as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._record_save("raw", name, self._snapshot_file(self.raw_dir, name), None, started, digest.hexdigest())
+
+    def _save_array(self, kind: str, name: str, records: Iterable[Any]) -> None:
+        """
+        Writes records as a JSON array snapshot, now or on the background
+        thread. The background thread gets the records in lists of up to
+        ``chunk_size`` items and never runs the caller's generators.
+        """
+        if self._writer is None:
+            self._write_array(kind, name, records)
+            return
+        snapshot = _ArrayWrite(self, kind, name)
+        self._writer.submit(snapshot.open)
+        iterator = iter(records)
+        try:
+            while chunk := list(islice(iterator, self.chunk_size)):
+                self._writer.submit(snapshot.write, chunk)
+        except BaseException as e:
+            self._writer.submit(snapshot.abort, e)
+            raise
+        self._writer.submit(snapshot.commit)
+
+    def _write_array(self, kind: str, name: str, records: Iterable[Any]) -> None:
+        directory = self._dir(kind)
+        started = time.perf_counter()
+        digest = hashlib.sha256()
+        with self._open_for_write(directory, name, digest) as f:
+            count = _dump_array(f, (self._pack(record) for record in records))
+        self._record_save(kind, name, self._snapshot_file(directory, name), count, started, digest.hexdigest())
+
+    def _record_save(
+        self,
+        kind: str,
+        name: str,
+        file_path: Path,
+        count: Optional[int],
+        started: float,
+        sha256: Optional[str] = None,
+    ) -> None:
+        """
+        Adds a just written snapshot file to the catalog. ``started`` is
+        the ``perf_counter`` value at the start of the write, ``sha256``
+        the checksum computed while the file was written.
+        """
+        self._snapshot_catalog().update(name, **part_values(
+            kind,
+            count=count,
+            bytes=file_path.stat().st_size,
+            sha256=sha256,
+            seconds=round(time.perf_counter() - started, 3),
+        ))
+
+    def describe_snapshot(self, name: str, query: Optional[str] = None, region: Optional[str] = None) -> None:
+        """Records the search query and region of a snapshot in the catalog."""
+        self._snapshot_catalog().update(name, query=query, region=region)
+
+    def list_snapshots(self, query: Optional[str] = None) -> List[SnapshotInfo]:
+        """
+        Lists the snapshots in the catalog, oldest first. Snapshots saved
+        before the catalog existed are not listed.
+
+        Args:
+            query: Only snapshots described with this search query.
+        """
+        self.flush()
+        return self._snapshot_catalog().snapshots(query)
+
+    def _snapshot_catalog(self) -> SnapshotCatalog:
+        if self.catalog is not None:
+            return self.catalog
+        if self.root is None and self.namespace is None:
+            return SnapshotCatalog()
+        return SnapshotCatalog(self.data_dir / "catalog.jsonl")
+
+    def _submit(self, job: Callable[..., None], *args: Any) -> None:
+        """Runs a write job now, or queues it for the background thread."""
+        if self._writer is None:
+            job(*args)
+        else:
+            self._writer.submit(job, *args)
+
+    def after_writes(self, callback: Callable[[], None]) -> None:
+        """
+        Calls ``callback`` once the saves issued so far are committed.
+        With write-behind it runs on the background thread and is skipped
+        if one of the queued writes failed.
+        """
+        if self._writer is None:
+            callback()
+        else:
+            self._writer.submit_callback(callback)
+
+    def flush(self) -> None:
+        """Waits until the queued background writes are committed."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Commits the queued writes and stops the background thread."""
+        if self._writer is not None:
+            self._writer.close()
+
+    def _result_path(self, directory: Path, vacancy_id: str) -> Path:
+        """Returns the file of a per-vacancy result, creating its shard directories."""
+        if self.shard_depth:
+            digest = hashlib.blake2b(vacancy_id.encode("utf-8"), digest_size=self.shard_depth).hexdigest()
+            directory = directory.joinpath(*(digest[i:i + 2] for i in range(0, len(digest), 2)))
+            if directory not in self._shard_dirs:
+                directory.mkdir(parents=True, exist_ok=True)
+                self._shard_dirs.add(directory)
+        return directory / f"{vacancy_id}.json"
 
     def save_analysis(self, result: AnalysisResult) -> None:
         """
@@ -113,9 +508,7 @@ class LocalStorage(Storage):
             result: The AnalysisResult object to save.
         """
         self.ensure_dirs()
-        file_path = paths.ANALYSIS_DIR / f"{result.vacancy_id}.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(asdict(result), f, ensure_ascii=False, indent=2)
+        self._submit(_write_result, self._result_path(self.analysis_dir, result.vacancy_id), asdict(result))
 
     def save_extraction(self, result: ExtractionResult) -> None:
         """
@@ -125,6 +518,318 @@ class LocalStorage(Storage):
             result: The ExtractionResult object to save.
         """
         self.ensure_dirs()
-        file_path = paths.EXTRACTION_DIR / f"{result.vacancy_id}.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(asdict(result), f, ensure_ascii=False, indent=2)
+        self._submit(_write_result, self._result_path(self.extraction_dir, result.vacancy_id), asdict(result))
+
+    def save_extractions_many(self, results: Iterable[ExtractionResult]) -> None:
+        """
+        Saves extraction results in chunk files in the extraction directory.
+
+        Args:
+            results: The ExtractionResult objects to save. A generator is
+                consumed one chunk at a time.
+        """
+        self.ensure_dirs()
+        self._save_chunks(self.extraction_dir, (asdict(result) for result in results))
+
+    def save_analyses_many(self, results: Iterable[AnalysisResult]) -> None:
+        """
+        Saves analysis results in chunk files in the analysis directory.
+
+        Args:
+            results: The AnalysisResult objects to save. A generator is
+                consumed one chunk at a time.
+        """
+        self.ensure_dirs()
+        self._save_chunks(self.analysis_dir, (asdict(result) for result in results))
+
+    def _save_chunks(self, directory: Path, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Writes result records as JSON Lines files of up to ``chunk_size`` lines.
+
+        Each chunk is committed atomically, so readers never see a partially
+        written chunk. Chunk names start with a per-call prefix and a
+        sequence number, which keeps them in write order.
+        """
+        prefix = uuid.uuid4().hex[:12]
+        iterator = iter(records)
+        number = 0
+        while chunk := list(islice(iterator, self.chunk_size)):
+            self._submit(_write_chunk, directory / f"chunk-{prefix}-{number:05d}.jsonl", chunk)
+            number += 1
+
+    def load_extractions(self) -> List[ExtractionResult]:
+        """
+        Loads all extraction results, both per-vacancy files and chunks.
+        If a vacancy was saved more than once, the latest result wins.
+        """
+        self.flush()
+        return _load_results(self.extraction_dir, ExtractionResult)
+
+    def load_analyses(self) -> List[AnalysisResult]:
+        """
+        Loads all analysis results, both per-vacancy files and chunks.
+        If a vacancy was saved more than once, the latest result wins.
+        """
+        self.flush()
+        return _load_results(self.analysis_dir, AnalysisResult)
+
+
+def _write_result(file_path: Path, record: Dict[str, Any]) -> None:
+    with atomic_open(file_path) as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+
+
+def _write_chunk(file_path: Path, records: List[Dict[str, Any]]) -> None:
+    with atomic_open(file_path) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+
+
+class _ArrayWrite:
+    """
+    A JSON array snapshot written by several background jobs: ``open``,
+    ``write`` for every chunk of records, then ``commit`` or ``abort``.
+    A failed job removes the temporary file, and the jobs queued after it
+    do nothing.
+    """
+
+    def __init__(self, storage: LocalStorage, kind: str, name: str) -> None:
+        self.storage = storage
+        self.kind = kind
+        self.name = name
+        self.directory = storage._dir(kind)
+        self._context: Optional[ContextManager[IO[str]]] = None
+        self._file: Optional[IO[str]] = None
+        self._count = 0
+        self._started = 0.0
+        self._digest = hashlib.sha256()
+
+    def open(self) -> None:
+        self._started = time.perf_counter()
+        context = self.storage._open_for_write(self.directory, self.name, self._digest)
+        self._file = context.__enter__()
+        self._context = context
+        self._file.write("[")
+
+    def write(self, records: List[Any]) -> None:
+        if self._context is None:
+            return
+        try:
+            self._count = _dump_items(self._file, map(self.storage._pack, records), self._count)
+        except BaseException as e:
+            self.abort(e)
+            raise
+
+    def commit(self) -> None:
+        if self._context is None:
+            return
+        try:
+            self._file.write("\n]" if self._count else "]")
+        except BaseException as e:
+            self.abort(e)
+            raise
+        context, self._context = self._context, None
+        context.__exit__(None, None, None)
+        self.storage._record_save(
+            self.kind,
+            self.name,
+            self.storage._snapshot_file(self.directory, self.name),
+            self._count,
+            self._started,
+            self._digest.hexdigest(),
+        )
+
+    def abort(self, error: BaseException) -> None:
+        """Removes the temporary file; ``error`` is the reason the write stopped."""
+        if self._context is None:
+            return
+        context, self._context = self._context, None
+        context.__exit__(type(error), error, error.__traceback__)
+
+
+def _load_results(directory: Path, result_type: Type[Result]) -> List[Result]:
+    """
+    Loads per-vacancy ``.json`` files, in shard directories too, and
+    ``.jsonl`` chunks, oldest first.
+    """
+    if not directory.exists():
+        return []
+    files = list(_result_files(directory))
+    files.sort(key=lambda entry: (entry.stat().st_mtime_ns, entry.name))
+    results: Dict[str, Result] = {}
+    for entry in files:
+        with open(entry.path, "r", encoding="utf-8") as f:
+            if entry.name.endswith(".json"):
+                items: Iterable[Dict[str, Any]] = [json.load(f)]
+            else:
+                items = (json.loads(line) for line in f if line.strip())
+            for item in items:
+                result = result_type(**item)
+                # Re-inserting moves a re-saved vacancy after older results
+                results.pop(result.vacancy_id, None)
+                results[result.vacancy_id] = result
+    return list(results.values())
+
+
+def _result_files(directory: Path) -> Iterator[os.DirEntry]:
+    for entry in os.scandir(directory):
+        if entry.is_dir():
+            yield from _result_files(Path(entry.path))
+        elif entry.name.endswith((".json", ".jsonl")):
+            yield entry
+
+
+def to_vacancy(item: Dict[str, Any], fields: Optional[Tuple[str, ...]]) -> Union[NormalizedVacancy, Dict[str, Any]]:
+    """Builds a NormalizedVacancy from a stored record, or projects it to ``fields``."""
+    if fields is None:
+        return NormalizedVacancy(**item)
+    return {field: item.get(field) for field in fields}
+
+
+def _read_vacancies(
+    f: IO[str], items: Iterable[Dict[str, Any]], fields: Optional[Tuple[str, ...]]
+) -> Iterator[Union[NormalizedVacancy, Dict[str, Any]]]:
+    """Yields vacancies from the records of an open file and closes it."""
+    with f:
+        for item in items:
+            yield to_vacancy(item, fields)
+
+
+def _snapshot_candidates(directory: Path, name: str) -> List[Path]:
+    suffixes = [""] + list(compression_module.SUFFIXES.values())
+    return [directory / f"{name}.json{suffix}" for suffix in suffixes]
+
+
+def _snapshot_path(directory: Path, name: str) -> Path:
+    """
+    Returns the file of a snapshot, whichever codec it was written with.
+
+    Raises:
+        FileNotFoundError: If the snapshot does not exist.
+    """
+    for candidate in _snapshot_candidates(directory, name):
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"No such snapshot: {directory / name}.json")
+
+
+def _iter_snapshot_file(file_path: Path) -> Iterator[Any]:
+    """
+    Yields the records of a raw or normalized snapshot file in any of
+    the storage formats: a JSON array, possibly compressed, or JSON Lines.
+    Other files, such as offset indexes, yield nothing.
+    """
+    name = file_path.name
+    if name.endswith(".jsonl"):
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+        return
+    if not any(name.endswith(".json" + suffix) for suffix in ("", *compression_module.SUFFIXES.values())):
+        return
+    with compression_module.open_text(file_path, "r") as f:
+        first = _peek(f)
+        if first == "[":
+            try:
+                yield from _iter_array(f, first)
+            except (json.JSONDecodeError, EOFError):
+                # A snapshot that is still being written ends early
+                return
+
+
+def _peek(f: IO[str]) -> str:
+    """Reads and returns the first non-whitespace character of a stream."""
+    while True:
+        char = f.read(1)
+        if not char or not char.isspace():
+            return char
+
+
+def _iter_array(f: IO[str], first: str, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Yields the items of a JSON array from a text stream.
+
+    The stream is read in chunks of ``chunk_size`` characters and every
+    item is decoded as soon as it is complete, so the array is never held
+    in memory as text. ``first`` is the already consumed opening bracket.
+
+    Raises:
+        json.JSONDecodeError: If the stream is not a JSON array.
+    """
+    if first != "[":
+        raise json.JSONDecodeError("Expected a JSON array", first, 0)
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    # "first": an item or "]", "item": an item after ",", "next": "," or "]"
+    state = "first"
+
+    while True:
+        # Skip whitespace and separators, reading more text when the buffer runs out
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, position)
+            buffer = f.read(chunk_size)
+            position = 0
+            eof = not buffer
+            continue
+
+        char = buffer[position]
+        if char == "]" and state != "item":
+            return
+        if state == "next":
+            if char != ",":
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, position)
+            position += 1
+            state = "item"
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            item, end = None, -1
+        # An item that ends at the buffer boundary may be cut short (e.g. a number)
+        if end == -1 or (end == len(buffer) and not eof):
+            if eof:
+                raise json.JSONDecodeError("Truncated JSON array item", buffer, position)
+            more = f.read(chunk_size)
+            eof = not more
+            buffer = buffer[position:] + more
+            position = 0
+            continue
+        yield item
+        position = end
+        state = "next"
+
+
+def _dump_array(f: IO[str], items: Iterable[Any]) -> int:
+    """
+    Writes items as a JSON array one at a time and returns their number.
+
+    The output is identical to ``json.dump(list(items), f, indent=2)``,
+    but only one item is serialized in memory at any moment.
+    """
+    f.write("[")
+    count = _dump_items(f, items)
+    f.write("\n]" if count else "]")
+    return count
+
+
+def _dump_items(f: IO[str], items: Iterable[Any], count: int = 0) -> int:
+    """
+    Writes items of a JSON array after ``count`` items that are already
+    written and returns the new number of items.
+    """
+    for item in items:
+        f.write(",\n  " if count else "\n  ")
+        # JSON strings escape newlines, so every newline here is indentation
+        f.write(json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+        count += 1
+    return count
@@ -0,0 +1,165 @@
+"""Sidecar offset index for JSON Lines snapshots.
+
+The index maps a record ID to the byte offset and length of its line in
+the snapshot, so a single record is read by slicing a memory-mapped file
+instead of parsing the whole snapshot. The index itself is a sorted
+array of fixed-size entries that is also memory-mapped and binary
+searched, so neither file is ever parsed as a whole.
+
+Index layout: a header with a magic string and the size of the snapshot
+the index describes, followed by ``(id hash, offset, length)`` entries
+sorted by hash and then by offset.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"SRIDX001"
+_HEADER = struct.Struct("<8sQ")
+_ENTRY = struct.Struct("<QQI")
+
+# (id hash, offset, length)
+Entry = Tuple[int, int, int]
+
+
+def index_path(data_path: Path) -> Path:
+    """Returns the sidecar index file of a snapshot."""
+    return data_path.with_name(data_path.name + ".idx")
+
+
+def id_hash(record_id: Any) -> int:
+    """64-bit hash of a record ID, stable across processes."""
+    return int.from_bytes(hashlib.blake2b(str(record_id).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def entry_for(record: Any, offset: int, length: int) -> Optional[Entry]:
+    """Returns the index entry of a record, or None if it has no ID."""
+    if isinstance(record, dict) and record.get("id") is not None:
+        return id_hash(record["id"]), offset, length
+    return None
+
+
+def write_index(data_path: Path, entries: Iterable[Entry], data_size: int) -> None:
+    """
+    Writes the sidecar index of a snapshot atomically.
+
+    Args:
+        data_path: The snapshot file.
+        entries: Index entries in any order.
+        data_size: Size of the snapshot the entries describe.
+    """
+    path = index_path(data_path)
+    # A name of its own, so that concurrent writers of one snapshot never share a temp file
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, data_size))
+            for entry in sorted(entries):
+                f.write(_ENTRY.pack(*entry))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_entries(data_path: Path) -> List[Entry]:
+    """Returns all entries of an up-to-date index, or an empty list."""
+    with _open_index(data_path) as index:
+        if index is None:
+            return []
+        return [_ENTRY.unpack_from(index, _HEADER.size + i * _ENTRY.size) for i in range(_count(index))]
+
+
+def rebuild_index(data_path: Path) -> None:
+    """Scans a snapshot line by line and writes its index."""
+    entries = []
+    offset = 0
+    with open(data_path, "rb") as f:
+        for line in f:
+            if line.endswith(b"\n") and line.strip():
+                entry = entry_for(json.loads(line), offset, len(line) - 1)
+                if entry:
+                    entries.append(entry)
+            offset += len(line)
+    write_index(data_path, entries, offset)
+
+
+def lookup(data_path: Path, record_id: Any) -> Optional[Any]:
+    """
+    Reads the record with the given ID from a snapshot.
+
+    If the index is missing or describes a different version of the
+    snapshot, it is rebuilt first. When a snapshot holds several records
+    with the ID, the last one wins.
+
+    Raises:
+        FileNotFoundError: If the snapshot does not exist.
+    """
+    if os.path.getsize(data_path) == 0:
+        return None
+    for _ in range(2):
+        with _open_index(data_path) as index:
+            if index is not None:
+                return _find(data_path, index, str(record_id))
+        rebuild_index(data_path)
+    return None
+
+
+def _find(data_path: Path, index: mmap.mmap, record_id: str) -> Optional[Any]:
+    key = id_hash(record_id)
+    count = _count(index)
+    # Binary search for the first entry with a hash not less than the key
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if _ENTRY.unpack_from(index, _HEADER.size + middle * _ENTRY.size)[0] < key:
+            low = middle + 1
+        else:
+            high = middle
+    candidates = []
+    while low < count:
+        entry = _ENTRY.unpack_from(index, _HEADER.size + low * _ENTRY.size)
+        if entry[0] != key:
+            break
+        candidates.append(entry)
+        low += 1
+
+    if not candidates:
+        return None
+    with open(data_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Entries with equal hashes are sorted by offset, so the latest record comes last
+        for _, offset, length in reversed(candidates):
+            record = json.loads(data[offset:offset + length])
+            if str(record.get("id")) == record_id:
+                return record
+    return None
+
+
+def _count(index: mmap.mmap) -> int:
+    return (len(index) - _HEADER.size) // _ENTRY.size
+
+
+@contextmanager
+def _open_index(data_path: Path) -> Iterator[Optional[mmap.mmap]]:
+    """
+    Memory-maps the index of a snapshot and yields it, or None if the
+    index is missing or describes a different version of the snapshot.
+    """
+    try:
+        fd = os.open(index_path(data_path), os.O_RDONLY)
+    except FileNotFoundError:
+        yield None
+        return
+    with open(fd, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            magic, data_size = _HEADER.unpack_from(index, 0)
+            yield index if magic == MAGIC and data_size == os.path.getsize(data_path) else None
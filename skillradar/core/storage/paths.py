@@ -23,3 +23,21 @@ ANALYSIS_DIR: Path = DATA_DIR / "analysis"
 
 # ~/.skillradar/data/extraction
 EXTRACTION_DIR: Path = DATA_DIR / "extraction"
+
+# ~/.skillradar/data/index
+INDEX_DIR: Path = DATA_DIR / "index"
+
+# ~/.skillradar/cache
+CACHE_DIR: Path = APP_DIR / "cache"
+
+# ~/.skillradar/cache/http
+HTTP_CACHE_DIR: Path = CACHE_DIR / "http"
+
+# ~/.skillradar/data/blobs
+BLOB_DIR: Path = DATA_DIR / "blobs"
+
+# ~/.skillradar/data/catalog.jsonl
+CATALOG_PATH: Path = DATA_DIR / "catalog.jsonl"
+
+# ~/.skillradar/data/runs
+RUNS_DIR: Path = DATA_DIR / "runs"
@@ -0,0 +1,518 @@
+"""SQLite storage implementation.
+
+Keeps every snapshot in a single indexed database, so questions such as
+"how many vacancies mention Django in Moscow this week" are answered by
+one query instead of loading every JSON snapshot from disk.
+"""
+import json
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ..analysis.models import AnalysisResult
+from ..extract.models import ExtractionResult
+from ..normalize.models import NormalizedVacancy
+from . import paths
+from .base import NORMALIZED_FIELDS, Storage, check_fields, to_record
+from .catalog import SnapshotInfo
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    name TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    -- 'list' or 'object' once raw data is saved
+    raw_kind TEXT,
+    has_normalized INTEGER NOT NULL DEFAULT 0,
+    query TEXT,
+    region TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshots_created_at ON snapshots (created_at);
+
+CREATE TABLE IF NOT EXISTS raw_vacancies (
+    snapshot TEXT NOT NULL REFERENCES snapshots (name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    vacancy_id TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (snapshot, position)
+);
+CREATE INDEX IF NOT EXISTS raw_vacancies_vacancy_id ON raw_vacancies (vacancy_id);
+
+CREATE TABLE IF NOT EXISTS normalized_vacancies (
+    snapshot TEXT NOT NULL REFERENCES snapshots (name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    company_name TEXT,
+    description TEXT,
+    location TEXT,
+    -- casefold() of location: NOCASE only folds ASCII, and most locations are Cyrillic
+    location_key TEXT,
+    PRIMARY KEY (snapshot, position)
+);
+CREATE INDEX IF NOT EXISTS normalized_vacancies_id ON normalized_vacancies (id);
+CREATE INDEX IF NOT EXISTS normalized_vacancies_source ON normalized_vacancies (source);
+CREATE INDEX IF NOT EXISTS normalized_vacancies_location ON normalized_vacancies (location_key);
+
+CREATE TABLE IF NOT EXISTS vacancy_skills (
+    snapshot TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    skill_key TEXT NOT NULL,
+    FOREIGN KEY (snapshot, position) REFERENCES normalized_vacancies (snapshot, position) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS vacancy_skills_skill ON vacancy_skills (skill_key, snapshot);
+CREATE INDEX IF NOT EXISTS vacancy_skills_vacancy ON vacancy_skills (snapshot, position);
+
+CREATE TABLE IF NOT EXISTS extractions (
+    vacancy_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    vacancy_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+# Columns added to ``snapshots`` after its first version, created in older databases on connect
+_SNAPSHOT_MIGRATIONS = {"query": "TEXT", "region": "TEXT"}
+
+_NORMALIZED_COLUMNS = ("id", "title", "url", "source", "company_name", "description", "location")
+
+
+class SQLiteStorage(Storage):
+    """
+    Stores pipeline artifacts in an SQLite database.
+
+    The ``name`` passed to ``save_raw`` and ``save_normalized`` identifies a
+    snapshot; saving under an existing name replaces its data. Vacancies
+    are indexed by ID, source, location, snapshot and skill, and
+    ``count_vacancies`` runs aggregate queries over all snapshots.
+
+    The database runs in WAL mode, so readers in other processes are not
+    blocked by a write in progress. Rows are inserted with ``executemany``
+    in batches of ``batch_size``, consuming generators lazily.
+    One connection is shared by all threads of the instance.
+    """
+
+    def __init__(self, path: Optional[Path] = None, batch_size: int = 1000) -> None:
+        """
+        Args:
+            path: Database file. Defaults to ``skillradar.sqlite3`` in the data directory.
+            batch_size: Number of rows per ``executemany`` call.
+        """
+        self.path = path or paths.DATA_DIR / "skillradar.sqlite3"
+        self.batch_size = batch_size
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def ensure_dirs(self) -> None:
+        """Creates the directory that holds the database file."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+    def close(self) -> None:
+        """Closes the database connection. It is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def save_raw(self, name: str, data: Union[Dict[str, Any], Iterable[Any]]) -> None:
+        """
+        Saves raw data as the snapshot ``name``.
+
+        Each item of a sequence is stored as one row; a dictionary is
+        stored as a single row and loaded back as a dictionary.
+
+        Args:
+            name: The snapshot name.
+            data: The dictionary or iterable to save. Dataclass items are
+                converted to dictionaries.
+        """
+        is_object = isinstance(data, dict)
+        items: Iterable[Any] = [data] if is_object else data
+        rows = (
+            (position, _vacancy_id(item), json.dumps(item, ensure_ascii=False))
+            for position, item in enumerate(to_record(item) for item in items)
+        )
+        # The items may come from a slow generator (a pipeline that is still
+        # fetching): each batch is pulled without holding the lock and staged
+        # in a TEMP table, which does not lock the database for other writers.
+        # The snapshot is then replaced in one short transaction.
+        staging = f"raw_staging_{uuid.uuid4().hex}"
+        with self._lock:
+            self._connect().execute(f"CREATE TEMP TABLE {staging} (position INTEGER, vacancy_id TEXT, data TEXT)")
+        try:
+            for batch in _batches(rows, self.batch_size):
+                with self._transaction() as db:
+                    db.executemany(f"INSERT INTO {staging} VALUES (?, ?, ?)", batch)
+            with self._transaction() as db:
+                self._touch_snapshot(db, name)
+                db.execute(
+                    "UPDATE snapshots SET raw_kind = ? WHERE name = ?", ("object" if is_object else "list", name)
+                )
+                db.execute("DELETE FROM raw_vacancies WHERE snapshot = ?", (name,))
+                db.execute(
+                    f"INSERT INTO raw_vacancies SELECT ?, position, vacancy_id, data FROM {staging}", (name,)
+                )
+        finally:
+            with self._lock:
+                self._connect().execute(f"DROP TABLE IF EXISTS temp.{staging}")
+
+    def load_raw(self, name: str) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Loads the raw data of snapshot ``name``.
+
+        Raises:
+            FileNotFoundError: If the snapshot has no raw data.
+        """
+        with self._lock:
+            db = self._connect()
+            snapshot = db.execute("SELECT raw_kind FROM snapshots WHERE name = ?", (name,)).fetchone()
+            if snapshot is None or snapshot[0] is None:
+                raise FileNotFoundError(f"No raw data for snapshot '{name}' in {self.path}")
+            rows = db.execute(
+                "SELECT data FROM raw_vacancies WHERE snapshot = ? ORDER BY position", (name,)
+            ).fetchall()
+        items = [json.loads(row[0]) for row in rows]
+        return items[0] if snapshot[0] == "object" else items
+
+    def save_normalized(self, name: str, data: Iterable[NormalizedVacancy]) -> None:
+        """
+        Saves normalized vacancies as the snapshot ``name``, together with
+        one indexed row per vacancy skill.
+
+        Args:
+            name: The snapshot name.
+            data: The NormalizedVacancy objects to save.
+        """
+        skills: List[Tuple[str, int, str, str]] = []
+
+        def rows() -> Iterator[Tuple[Any, ...]]:
+            for position, vacancy in enumerate(data):
+                skills.extend((name, position, skill, skill.casefold()) for skill in vacancy.skills)
+                yield (
+                    (name, position)
+                    + tuple(getattr(vacancy, column) for column in _NORMALIZED_COLUMNS)
+                    + (_key(vacancy.location),)
+                )
+
+        placeholders = ", ".join("?" * (len(_NORMALIZED_COLUMNS) + 3))
+        with self._transaction() as db:
+            self._touch_snapshot(db, name)
+            db.execute("UPDATE snapshots SET has_normalized = 1 WHERE name = ?", (name,))
+            db.execute("DELETE FROM vacancy_skills WHERE snapshot = ?", (name,))
+            db.execute("DELETE FROM normalized_vacancies WHERE snapshot = ?", (name,))
+            for batch in _batches(rows(), self.batch_size):
+                db.executemany(f"INSERT INTO normalized_vacancies VALUES ({placeholders})", batch)
+                db.executemany("INSERT INTO vacancy_skills VALUES (?, ?, ?, ?)", skills)
+                skills.clear()
+
+    def load_normalized(self, name: str) -> List[NormalizedVacancy]:
+        """
+        Loads the normalized vacancies of snapshot ``name``.
+
+        Raises:
+            FileNotFoundError: If the snapshot has no normalized data.
+        """
+        return list(self.iter_normalized(name))
+
+    def iter_normalized(
+        self, name: str, fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Union[NormalizedVacancy, Dict[str, Any]]]:
+        """
+        Yields the normalized vacancies of snapshot ``name``, reading
+        ``batch_size`` rows at a time.
+
+        With ``fields``, only the requested columns are selected and the
+        skills table is only read if ``skills`` is requested.
+
+        Raises:
+            FileNotFoundError: If the snapshot has no normalized data.
+            ValueError: If a field name is not a NormalizedVacancy field.
+        """
+        fields = check_fields(fields)
+        with self._lock:
+            if self._connect().execute(
+                "SELECT 1 FROM snapshots WHERE name = ? AND has_normalized", (name,)
+            ).fetchone() is None:
+                raise FileNotFoundError(f"No normalized data for snapshot '{name}' in {self.path}")
+        return self._iter_normalized(name, fields)
+
+    def _iter_normalized(
+        self, name: str, fields: Optional[Tuple[str, ...]]
+    ) -> Iterator[Union[NormalizedVacancy, Dict[str, Any]]]:
+        wanted = NORMALIZED_FIELDS if fields is None else fields
+        columns = [column for column in _NORMALIZED_COLUMNS if column in wanted]
+        select = ", ".join(["position"] + columns)
+        position = -1
+        while True:
+            # Each page is read under the lock, so writes can run between pages
+            with self._lock:
+                db = self._connect()
+                rows = db.execute(
+                    f"SELECT {select} FROM normalized_vacancies"
+                    " WHERE snapshot = ? AND position > ? ORDER BY position LIMIT ?",
+                    (name, position, self.batch_size),
+                ).fetchall()
+                if not rows:
+                    return
+                skills: Dict[int, List[str]] = {}
+                if "skills" in wanted:
+                    for skill_position, skill in db.execute(
+                        "SELECT position, skill FROM vacancy_skills"
+                        " WHERE snapshot = ? AND position BETWEEN ? AND ? ORDER BY rowid",
+                        (name, rows[0][0], rows[-1][0]),
+                    ):
+                        skills.setdefault(skill_position, []).append(skill)
+            for row in rows:
+                values = dict(zip(columns, row[1:]))
+                if "skills" in wanted:
+                    values["skills"] = skills.get(row[0], [])
+                yield NormalizedVacancy(**values) if fields is None else {field: values[field] for field in fields}
+            position = rows[-1][0]
+
+    def get_normalized(self, name: str, vacancy_id: str) -> Optional[NormalizedVacancy]:
+        """
+        Loads one normalized vacancy of snapshot ``name`` through the ID index.
+
+        Raises:
+            FileNotFoundError: If the snapshot has no normalized data.
+        """
+        with self._lock:
+            db = self._connect()
+            if db.execute("SELECT 1 FROM snapshots WHERE name = ? AND has_normalized", (name,)).fetchone() is None:
+                raise FileNotFoundError(f"No normalized data for snapshot '{name}' in {self.path}")
+            row = db.execute(
+                f"SELECT position, {', '.join(_NORMALIZED_COLUMNS)} FROM normalized_vacancies"
+                " WHERE id = ? AND snapshot = ? ORDER BY position DESC LIMIT 1",
+                (vacancy_id, name),
+            ).fetchone()
+            if row is None:
+                return None
+            skills = [
+                skill for (skill,) in db.execute(
+                    "SELECT skill FROM vacancy_skills WHERE snapshot = ? AND position = ? ORDER BY rowid",
+                    (name, row[0]),
+                )
+            ]
+        return NormalizedVacancy(**dict(zip(_NORMALIZED_COLUMNS, row[1:])), skills=skills)
+
+    def save_analysis(self, result: AnalysisResult) -> None:
+        """Saves an analysis result, replacing an earlier one for the same vacancy."""
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?)",
+                (result.vacancy_id, json.dumps(result.data, ensure_ascii=False)),
+            )
+
+    def save_extraction(self, result: ExtractionResult) -> None:
+        """Saves an extraction result, replacing an earlier one for the same vacancy."""
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?)",
+                (result.vacancy_id, json.dumps(result.data, ensure_ascii=False)),
+            )
+
+    def save_analyses_many(self, results: Iterable[AnalysisResult]) -> None:
+        """Saves analysis results in batches within one transaction."""
+        with self._transaction() as db:
+            self._insert_many(db, "INSERT OR REPLACE INTO analyses VALUES (?, ?)", _result_rows(results))
+
+    def save_extractions_many(self, results: Iterable[ExtractionResult]) -> None:
+        """Saves extraction results in batches within one transaction."""
+        with self._transaction() as db:
+            self._insert_many(db, "INSERT OR REPLACE INTO extractions VALUES (?, ?)", _result_rows(results))
+
+    def load_analyses(self) -> List[AnalysisResult]:
+        """Loads all analysis results."""
+        return [AnalysisResult(vacancy_id=vacancy_id, data=data) for vacancy_id, data in self._load_results("analyses")]
+
+    def load_extractions(self) -> List[ExtractionResult]:
+        """Loads all extraction results."""
+        return [
+            ExtractionResult(vacancy_id=vacancy_id, data=data) for vacancy_id, data in self._load_results("extractions")
+        ]
+
+    def load_analysis(self, vacancy_id: str) -> Optional[AnalysisResult]:
+        """Returns the analysis result for a vacancy, or None."""
+        data = self._load_result("analyses", vacancy_id)
+        return None if data is None else AnalysisResult(vacancy_id=vacancy_id, data=data)
+
+    def load_extraction(self, vacancy_id: str) -> Optional[ExtractionResult]:
+        """Returns the extraction result for a vacancy, or None."""
+        data = self._load_result("extractions", vacancy_id)
+        return None if data is None else ExtractionResult(vacancy_id=vacancy_id, data=data)
+
+    def describe_snapshot(self, name: str, query: Optional[str] = None, region: Optional[str] = None) -> None:
+        """Records the search query and region of snapshot ``name``."""
+        with self._transaction() as db:
+            self._touch_snapshot(db, name)
+            db.execute("UPDATE snapshots SET query = ?, region = ? WHERE name = ?", (query, region, name))
+
+    def list_snapshots(self, query: Optional[str] = None) -> List[SnapshotInfo]:
+        """
+        Lists the snapshots, oldest first. Record counts come from the
+        primary key indexes; sizes, checksums and durations are not kept.
+
+        Args:
+            query: Only snapshots described with this search query.
+        """
+        sql = (
+            "SELECT name, created_at, query, region, raw_kind, has_normalized,"
+            " (SELECT COUNT(*) FROM raw_vacancies r WHERE r.snapshot = s.name),"
+            " (SELECT COUNT(*) FROM normalized_vacancies v WHERE v.snapshot = s.name)"
+            " FROM snapshots s"
+        )
+        params: List[Any] = []
+        if query is not None:
+            sql += " WHERE query = ?"
+            params.append(query)
+        with self._lock:
+            rows = self._connect().execute(sql + " ORDER BY created_at, name", params).fetchall()
+        return [
+            SnapshotInfo(
+                name=name,
+                created_at=created_at,
+                updated_at=created_at,
+                query=snapshot_query,
+                region=region,
+                raw_count=raw_count if raw_kind is not None else None,
+                normalized_count=normalized_count if has_normalized else None,
+            )
+            for name, created_at, snapshot_query, region, raw_kind, has_normalized, raw_count, normalized_count in rows
+        ]
+
+    def count_vacancies(
+        self,
+        *,
+        skill: Optional[str] = None,
+        location: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        snapshot: Optional[str] = None,
+    ) -> int:
+        """
+        Counts distinct vacancies matching all given filters.
+
+        Args:
+            skill: Skill the vacancy lists (case-insensitive).
+            location: Vacancy location (case-insensitive).
+            source: Vacancy source, e.g. ``"hh"``.
+            since: Only snapshots saved at or after this moment.
+            until: Only snapshots saved before this moment.
+            snapshot: Only this snapshot.
+        """
+        query = ["SELECT COUNT(DISTINCT v.id) FROM normalized_vacancies v"]
+        where: List[str] = []
+        params: List[Any] = []
+        if skill is not None:
+            query.append("JOIN vacancy_skills s ON s.snapshot = v.snapshot AND s.position = v.position")
+            where.append("s.skill_key = ?")
+            params.append(_key(skill))
+        if since is not None or until is not None:
+            query.append("JOIN snapshots n ON n.name = v.snapshot")
+            if since is not None:
+                where.append("n.created_at >= ?")
+                params.append(_timestamp(since))
+            if until is not None:
+                where.append("n.created_at < ?")
+                params.append(_timestamp(until))
+        if location is not None:
+            where.append("v.location_key = ?")
+            params.append(_key(location))
+        if source is not None:
+            where.append("v.source = ?")
+            params.append(source)
+        if snapshot is not None:
+            where.append("v.snapshot = ?")
+            params.append(snapshot)
+        if where:
+            query.append("WHERE " + " AND ".join(where))
+        with self._lock:
+            return self._connect().execute(" ".join(query), params).fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.ensure_dirs()
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode = WAL")
+            # With WAL, NORMAL keeps the database consistent on a crash and only risks the last commits
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.executescript(SCHEMA)
+            existing = {row[1] for row in connection.execute("PRAGMA table_info(snapshots)")}
+            for column, column_type in _SNAPSHOT_MIGRATIONS.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE snapshots ADD COLUMN {column} {column_type}")
+            self._connection = connection
+        return self._connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Runs the block in one transaction under the instance lock, rolling back on error."""
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def _insert_many(self, db: sqlite3.Connection, sql: str, rows: Iterable[Tuple[Any, ...]]) -> None:
+        for batch in _batches(rows, self.batch_size):
+            db.executemany(sql, batch)
+
+    @staticmethod
+    def _touch_snapshot(db: sqlite3.Connection, name: str) -> None:
+        db.execute(
+            "INSERT OR IGNORE INTO snapshots (name, created_at) VALUES (?, ?)",
+            (name, _timestamp(datetime.now(timezone.utc))),
+        )
+
+    def _load_results(self, table: str) -> List[Tuple[str, Any]]:
+        with self._lock:
+            rows = self._connect().execute(f"SELECT vacancy_id, data FROM {table} ORDER BY rowid").fetchall()
+        return [(vacancy_id, json.loads(data)) for vacancy_id, data in rows]
+
+    def _load_result(self, table: str, vacancy_id: str) -> Any:
+        with self._lock:
+            row = self._connect().execute(f"SELECT data FROM {table} WHERE vacancy_id = ?", (vacancy_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+
+def _batches(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _result_rows(results: Iterable[Any]) -> Iterator[Tuple[str, str]]:
+    return ((result.vacancy_id, json.dumps(result.data, ensure_ascii=False)) for result in results)
+
+
+def _vacancy_id(item: Any) -> Optional[str]:
+    if isinstance(item, dict) and item.get("id") is not None:
+        return str(item["id"])
+    return None
+
+
+def _key(value: Optional[str]) -> Optional[str]:
+    return None if value is None else value.strip().casefold()
+
+
+def _timestamp(moment: datetime) -> str:
+    # Timestamps are stored in UTC so that they compare correctly as strings
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(timezone.utc).isoformat(timespec="microseconds")
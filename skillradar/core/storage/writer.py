@@ -0,0 +1,207 @@
+"""Atomic file commits and a background writer thread for storage backends.
+
+Every file is written to a temporary file in the target directory,
+flushed to disk with ``fsync`` and renamed over the final path, so a
+crash leaves either the previous version of the file or the new one,
+never a half-written file under the final name.
+
+``BackgroundWriter`` runs such writes on a separate thread, so the
+pipeline does not wait for the disk. Its queue is bounded: when the disk
+falls behind, callers block until there is room again.
+"""
+import io
+import os
+import queue
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator, Optional
+
+from . import compression
+
+
+@contextmanager
+def atomic_open(
+    path: Path, codec: Optional[str] = None, level: Optional[int] = None, hasher: Optional[Any] = None
+) -> Iterator[IO[str]]:
+    """
+    Opens a text stream whose content replaces ``path`` atomically when
+    the block exits without an error. On error the temporary file is
+    removed and ``path`` is left untouched.
+
+    Args:
+        path: The final file path.
+        codec: Compression codec (see ``compression.open_text``).
+        level: Compression level.
+        hasher: A ``hashlib`` object updated with the bytes of the file as
+            they are written, so the checksum needs no second read.
+    """
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as binary:
+            target: IO[bytes] = binary if hasher is None else _HashingWriter(binary, hasher)
+            with compression.wrap_writer(target, codec, level) as f:
+                yield f
+        _fsync(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+class _HashingWriter(io.RawIOBase):
+    """Writes bytes to a file and feeds them to a hash on the way."""
+
+    def __init__(self, binary: IO[bytes], hasher: Any) -> None:
+        self._binary = binary
+        self._hasher = hasher
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._binary.write(data)
+        self._hasher.update(data)
+        return len(memoryview(data).cast("B"))
+
+
+def drop_partial_line(path: Path) -> None:
+    """
+    Truncates a JSON Lines file after its last newline, so lines appended
+    after an interrupted write start on a line of their own.
+    """
+    try:
+        with open(path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+            position = end
+            while position > 0:
+                size = min(64 * 1024, position)
+                position -= size
+                f.seek(position)
+                chunk = f.read(size)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    position += newline + 1
+                    break
+            f.truncate(position)
+    except FileNotFoundError:
+        return
+
+
+def _fsync(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory: Path) -> None:
+    # Makes the rename itself durable; not every platform can open a directory
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BackgroundWriter:
+    """
+    Runs write jobs one after another on a background thread.
+
+    ``submit`` blocks while ``max_pending`` jobs are already waiting.
+    An exception raised by a job is re-raised in the caller by the next
+    ``submit``, ``flush`` or ``close``; jobs queued after a failed one
+    still run, but callbacks queued with ``submit_callback`` are skipped
+    until the next ``flush``.
+    """
+
+    def __init__(self, max_pending: int = 16) -> None:
+        """
+        Args:
+            max_pending: How many jobs may wait in the queue.
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._failed = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting in the queue."""
+        return self._queue.qsize()
+
+    def submit(self, job: Callable[..., Any], *args: Any) -> None:
+        """
+        Queues ``job(*args)``, blocking while the queue is full.
+
+        Raises:
+            RuntimeError: If the writer is closed.
+        """
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        self._raise_error()
+        self._queue.put((job, args))
+
+    def submit_callback(self, callback: Callable[[], Any]) -> None:
+        """
+        Queues ``callback()`` to run after the jobs queued before it,
+        unless a job has failed since the last ``flush``.
+        """
+        self.submit(self._run_callback, callback)
+
+    def flush(self) -> None:
+        """Waits until every queued job has finished."""
+        self._queue.join()
+        # The failed jobs and the callbacks after them are all done
+        self._failed = False
+        self._raise_error()
+
+    def close(self) -> None:
+        """Finishes the queued jobs and stops the thread. Closing twice is a no-op."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                job, args = item
+                job(*args)
+            except BaseException as e:
+                self._failed = True
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _run_callback(self, callback: Callable[[], Any]) -> None:
+        if not self._failed:
+            callback()
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
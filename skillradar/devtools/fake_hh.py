@@ -0,0 +1,301 @@
+"""
+Локальная заглушка API hh.ru для тестов и бенчмарков.
+
+Сервер отдает эндпоинты ``vacancies``, ``vacancies/{id}`` и ``areas`` в том же
+формате, что и hh.ru, на синтетическом наборе вакансий. Задержку ответов,
+долю ошибок и ответов 429 можно настроить, поэтому на заглушке удобно
+измерять производительность загрузки и проверять поведение при сбоях,
+не обращаясь к настоящему API. Fetcher'ы направляются на нее через
+параметр ``base_url``::
+
+    with FakeHHServer(FakeHHConfig(vacancies=5000, latency=0.02)) as server:
+        fetcher = HHFetcher(base_url=server.base_url)
+
+Запуск отдельным процессом: ``python -m skillradar.devtools.fake_hh --port 8000``.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Self, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# ID страны, в которую входят все регионы заглушки
+COUNTRY_ID = "113"
+
+SKILLS = (
+    "Python", "Django", "FastAPI", "PostgreSQL", "Redis", "Docker", "Kubernetes",
+    "Git", "Linux", "SQL", "Kafka", "RabbitMQ", "asyncio", "pytest", "Celery",
+)
+
+_VACANCY_PATH = re.compile(r"^/vacancies/([^/]+)$")
+
+
+@dataclass(frozen=True)
+class FakeHHConfig:
+    """Настройки заглушки API."""
+
+    # Размер набора вакансий
+    vacancies: int = 1000
+    # Число регионов внутри страны; вакансии распределяются по ним поровну
+    regions: int = 10
+    # Задержка каждого ответа в секундах и случайная добавка к ней
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Доля ответов 503 и 429
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    # Значение заголовка Retry-After в ответах 429
+    retry_after: int = 1
+    # Максимальная глубина выдачи поиска, как у hh.ru
+    max_depth: int = 2000
+    # Длина описания вакансии в символах
+    description_size: int = 2000
+    # Период, на который распределены даты публикации
+    period: timedelta = timedelta(days=30)
+    seed: int = 0
+
+
+class FakeHHServer:
+    """
+    HTTP-сервер с заглушкой API hh.ru на свободном локальном порту.
+
+    Набор данных генерируется один раз при создании и детерминирован
+    для одного ``seed``. Поиск учитывает фильтры ``area``, ``date_from``
+    и ``date_to`` и, как hh.ru, не отдает результаты глубже ``max_depth``;
+    текст запроса игнорируется. Число ответов по статусам копится в ``stats``.
+    """
+
+    def __init__(self, config: Optional[FakeHHConfig] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or FakeHHConfig()
+        self.stats: Counter = Counter()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.areas = self._build_areas()
+        self._vacancies = self._build_vacancies()
+        self._by_id = {vacancy["id"]: vacancy for vacancy in self._vacancies}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Адрес API для параметра ``base_url`` fetcher'ов."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "FakeHHServer":
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер и закрывает сокет."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        """Обслуживает запросы в текущем потоке до прерывания."""
+        self._server.serve_forever()
+
+    def _build_areas(self) -> List[Dict[str, Any]]:
+        regions = [
+            {"id": str(i), "parent_id": COUNTRY_ID, "name": f"Регион {i}", "areas": []}
+            for i in range(1, self.config.regions + 1)
+        ]
+        return [{"id": COUNTRY_ID, "parent_id": None, "name": "Россия", "areas": regions}]
+
+    def _build_vacancies(self) -> List[Dict[str, Any]]:
+        """Генерирует вакансии, отсортированные от новых к старым, как выдача hh.ru."""
+        regions = self.areas[0]["areas"] or [self.areas[0]]
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        step = self.config.period / max(self.config.vacancies, 1)
+        words = [skill.lower() for skill in SKILLS] + ["опыт", "команда", "разработка", "сервис", "задачи"]
+        vacancies = []
+        for i in range(self.config.vacancies):
+            area = regions[i % len(regions)]
+            skills = self._random.sample(SKILLS, 4)
+            description = []
+            length = 0
+            while length < self.config.description_size:
+                word = self._random.choice(words)
+                description.append(word)
+                length += len(word) + 1
+            vacancies.append({
+                "id": str(100000 + i),
+                "name": f"{skills[0]} developer",
+                "area": {"id": area["id"], "name": area["name"]},
+                # Середина шага: самая старая вакансия не попадает на границу периода поиска
+                "published_at": (now - step * (i + 0.5)).replace(microsecond=0),
+                "description": "<p>" + " ".join(description)[: self.config.description_size] + "</p>",
+                "branded_description": None,
+                "key_skills": [{"name": skill} for skill in skills],
+            })
+        return vacancies
+
+    def _search(self, params: Dict[str, str]) -> Dict[str, Any]:
+        page = int(params.get("page", 0))
+        per_page = int(params.get("per_page", 20))
+        area = params.get("area")
+        date_from = _parse_date(params.get("date_from"))
+        date_to = _parse_date(params.get("date_to"))
+
+        found = [
+            vacancy for vacancy in self._vacancies
+            if (not area or area == COUNTRY_ID or vacancy["area"]["id"] == area)
+            and (date_from is None or vacancy["published_at"] >= date_from)
+            and (date_to is None or vacancy["published_at"] <= date_to)
+        ]
+        start = page * per_page
+        items = found[start:min(start + per_page, self.config.max_depth)]
+        return {
+            "items": [_snippet(vacancy) for vacancy in items],
+            "found": len(found),
+            "pages": -(-min(len(found), self.config.max_depth) // per_page) if per_page else 0,
+            "page": page,
+            "per_page": per_page,
+        }
+
+    def _respond(self, path: str, params: Dict[str, str]) -> Tuple[int, Optional[Any]]:
+        """Возвращает статус и тело ответа на запрос."""
+        if path == "/areas":
+            return 200, self.areas
+        if path == "/vacancies":
+            page = int(params.get("page", 0))
+            per_page = int(params.get("per_page", 20))
+            if page * per_page >= self.config.max_depth:
+                return 400, {"errors": [{"type": "bad_argument", "value": "page"}]}
+            return 200, self._search(params)
+        match = _VACANCY_PATH.match(path)
+        if match and match.group(1) in self._by_id:
+            return 200, _details(self._by_id[match.group(1)])
+        return 404, {"errors": [{"type": "not_found"}]}
+
+    def _roll(self) -> Tuple[float, Optional[int]]:
+        """Выбирает задержку ответа и, если выпало, статус сбоя."""
+        with self._lock:
+            delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+            roll = self._random.random()
+        if roll < self.config.throttle_rate:
+            return delay, 429
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            return delay, 503
+        return delay, None
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело пишутся отдельно: без TCP_NODELAY каждый ответ
+            # на keep-alive соединении ждал бы delayed ACK клиента
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                delay, failure = server._roll()
+                if delay:
+                    time.sleep(delay)
+
+                headers = {}
+                if failure is not None:
+                    status, payload = failure, None
+                    if failure == 429:
+                        headers["Retry-After"] = str(server.config.retry_after)
+                else:
+                    status, payload = server._respond(url.path, params)
+                with server._lock:
+                    server.stats[status] += 1
+
+                body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _format_date(value: datetime) -> str:
+    # Формат дат hh.ru: смещение без двоеточия
+    return value.strftime("%Y-%m-%dT%H:%M:%S%z")
+
+
+def _snippet(vacancy: Dict[str, Any]) -> Dict[str, Any]:
+    """Элемент поисковой выдачи."""
+    return {
+        "id": vacancy["id"],
+        "name": vacancy["name"],
+        "area": vacancy["area"],
+        "published_at": _format_date(vacancy["published_at"]),
+    }
+
+
+def _details(vacancy: Dict[str, Any]) -> Dict[str, Any]:
+    """Ответ эндпоинта деталей вакансии."""
+    return {**vacancy, "published_at": _format_date(vacancy["published_at"])}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальная заглушка API hh.ru")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--vacancies", type=int, default=FakeHHConfig.vacancies)
+    parser.add_argument("--regions", type=int, default=FakeHHConfig.regions)
+    parser.add_argument("--latency", type=float, default=FakeHHConfig.latency)
+    parser.add_argument("--jitter", type=float, default=FakeHHConfig.jitter)
+    parser.add_argument("--error-rate", type=float, default=FakeHHConfig.error_rate)
+    parser.add_argument("--throttle-rate", type=float, default=FakeHHConfig.throttle_rate)
+    parser.add_argument("--seed", type=int, default=FakeHHConfig.seed)
+    args = parser.parse_args()
+
+    config = FakeHHConfig(
+        vacancies=args.vacancies,
+        regions=args.regions,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    server = FakeHHServer(config, host=args.host, port=args.port)
+    print(f"Fake hh.ru API: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
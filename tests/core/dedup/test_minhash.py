@@ -0,0 +1,110 @@
+"""Tests for MinHash/LSH near-duplicate detection."""
+
+import random
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from skillradar.core.dedup.minhash import (
+    MinHashDeduplicator,
+    minhash,
+    similarity,
+    tokenize,
+)
+from skillradar.core.dedup.models import Duplicate
+from skillradar.core.normalize.models import NormalizedVacancy
+
+WORDS = [f"word{i}" for i in range(2000)]
+
+
+def text(seed: int, length: int = 200) -> List[str]:
+    return random.Random(seed).choices(WORDS, k=length)
+
+
+def edited(words: List[str], edits: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    words = list(words)
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return words
+
+
+def vacancy(vacancy_id: str, words: List[str], title: str = "Python developer") -> NormalizedVacancy:
+    return NormalizedVacancy(
+        id=vacancy_id, title=title, url="u", source="hh", description="<p>" + " ".join(words) + "</p>"
+    )
+
+
+def test_tokenize_drops_markup_and_case():
+    assert tokenize("<p>Python&nbsp;Developer, <b>Django</b>!</p>") == ["python", "developer", "django"]
+
+
+def test_signature_similarity_estimates_jaccard():
+    words = text(1)
+    assert similarity(minhash(words), minhash(words)) == 1.0
+    assert similarity(minhash(words), minhash(edited(words, 3))) > 0.8
+    assert similarity(minhash(words), minhash(text(2))) < 0.1
+    # Short texts fill the empty cells the same way
+    assert similarity(minhash(["go", "developer"]), minhash(["go", "developer"])) == 1.0
+
+
+def test_exact_and_near_duplicates_are_found(tmp_path: Path):
+    dedup = MinHashDeduplicator(tmp_path / "index.jsonl")
+    words = text(1)
+
+    assert dedup.check(vacancy("1", words)) is None
+    exact = dedup.check(NormalizedVacancy(
+        id="2", title="PYTHON developer", url="u", source="hh", description="<div>" + " ".join(words) + "</div>"
+    ))
+    near = dedup.check(vacancy("3", edited(words, 3)))
+    assert dedup.check(vacancy("4", text(2))) is None
+
+    assert exact == Duplicate(vacancy_id="2", duplicate_of="1", similarity=1.0)
+    assert near.duplicate_of == "1" and 0.8 <= near.similarity < 1.0
+    # A vacancy that is checked again keeps its group
+    assert dedup.check(vacancy("1", text(3))) is None
+    assert dedup.check(vacancy("3", [])) == near
+
+
+def test_index_is_kept_between_runs(tmp_path: Path):
+    path = tmp_path / "index.jsonl"
+    first = MinHashDeduplicator(path)
+    for i in range(50):
+        first.check(vacancy(str(i), text(i)))
+    first.save()
+    lines = path.read_text().splitlines()
+
+    second = MinHashDeduplicator(path)
+    repost = second.check(vacancy("100", edited(text(7), 2)))
+    assert second.check(vacancy("101", text(101))) is None
+    second.save()
+
+    assert repost.duplicate_of == "7"
+    assert len(second) == 52
+    assert path.read_text().splitlines()[:len(lines)] == lines
+    with pytest.raises(ValueError):
+        len(MinHashDeduplicator(path, shingle_size=3))
+
+
+def test_torn_index_tail_is_cut_off(tmp_path: Path):
+    path = tmp_path / "index.jsonl"
+    first = MinHashDeduplicator(path)
+    first.check(vacancy("1", text(1)))
+    first.save()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id":"2","exact":"')
+
+    second = MinHashDeduplicator(path)
+    assert second.check(vacancy("3", text(3))) is None
+    second.save()
+
+    third = MinHashDeduplicator(path)
+    assert len(third) == 2
+    assert third.check(vacancy("4", edited(text(3), 2))).duplicate_of == "3"
+
+
+@pytest.mark.parametrize("kwargs", [{"threshold": 0}, {"shingle_size": 0}, {"num_perm": 100, "bands": 16}])
+def test_invalid_parameters_are_rejected(tmp_path: Path, kwargs):
+    with pytest.raises(ValueError):
+        MinHashDeduplicator(tmp_path / "index.jsonl", **kwargs)
@@ -0,0 +1,97 @@
+"""Tests for the AsyncHHFetcher implementation."""
+
+import asyncio
+
+import pytest
+
+from skillradar.core.fetch.base import FetcherException
+from skillradar.core.fetch.ratelimit import AdaptiveRateLimiter
+from skillradar.core.fetch.session import HttpConfig
+
+httpx = pytest.importorskip("httpx")
+AsyncHHFetcher = pytest.importorskip("skillradar.core.fetch.hh_async").AsyncHHFetcher
+
+NO_RETRIES = HttpConfig(max_retries=0)
+
+
+def unlimited() -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(rate=10_000, burst=10_000, max_rate=10_000)
+
+
+def make_client(count: int, per_page: int = 100, failing_ids=()) -> "httpx.AsyncClient":
+    ids = [str(i) for i in range(1, count + 1)]
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request: "httpx.Request") -> "httpx.Response":
+        path = request.url.path
+        if path == "/vacancies":
+            page = int(request.url.params["page"])
+            items = ids[page * per_page:(page + 1) * per_page]
+            pages = -(-count // per_page)
+            return httpx.Response(200, json={"items": [{"id": i} for i in items], "pages": pages})
+
+        vacancy_id = path.rsplit("/", 1)[1]
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.001)
+        state["in_flight"] -= 1
+        if vacancy_id in failing_ids:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"id": vacancy_id, "name": f"Vacancy {vacancy_id}"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.state = state
+    return client
+
+
+def test_fetch_preserves_search_order():
+    client = make_client(count=250)
+    fetcher = AsyncHHFetcher(max_concurrency=20, client=client, limiter=unlimited())
+
+    vacancies = asyncio.run(fetcher.fetch(search_query="python", total_vacancies=230))
+
+    assert [v.id for v in vacancies] == [str(i) for i in range(1, 231)]
+    assert 1 < client.state["max_in_flight"] <= 20
+
+
+def test_failed_details_are_recorded_and_replaced():
+    client = make_client(count=10, failing_ids={"3"})
+    fetcher = AsyncHHFetcher(client=client, config=NO_RETRIES, limiter=unlimited())
+
+    vacancies = asyncio.run(fetcher.fetch(search_query="python", total_vacancies=5))
+
+    assert [v.id for v in vacancies] == ["1", "2", "4", "5", "6"]
+    assert isinstance(fetcher.errors["3"], FetcherException)
+
+
+def test_search_errors_are_mapped_to_fetcher_exception():
+    def handler(request: "httpx.Request") -> "httpx.Response":
+        raise httpx.ConnectError("refused", request=request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    fetcher = AsyncHHFetcher(client=client, config=NO_RETRIES, limiter=unlimited())
+
+    with pytest.raises(FetcherException, match="Ошибка сети"):
+        asyncio.run(fetcher.fetch(search_query="python", total_vacancies=5))
+
+
+def test_retries_transient_errors():
+    calls = {"count": 0}
+
+    def handler(request: "httpx.Request") -> "httpx.Response":
+        if request.url.path == "/vacancies":
+            return httpx.Response(200, json={"items": [{"id": "1"}], "pages": 1})
+        calls["count"] += 1
+        if calls["count"] < 3:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"id": "1", "name": "Vacancy 1"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    fetcher = AsyncHHFetcher(
+        client=client, config=HttpConfig(max_retries=3, backoff_factor=0), limiter=unlimited()
+    )
+
+    vacancies = asyncio.run(fetcher.fetch(search_query="python", total_vacancies=1))
+
+    assert [v.id for v in vacancies] == ["1"]
+    assert calls["count"] == 3
@@ -0,0 +1,225 @@
+"""Tests for the HHFetcher implementation."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+import requests
+
+from skillradar.core.fetch import hh, partition
+from skillradar.core.fetch.hh import HHFetcher
+from skillradar.core.fetch.index import VacancyIndex
+
+
+class FakeResponse:
+    def __init__(self, payload: Any, status_code: int = 200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def json(self) -> Any:
+        return self._payload
+
+
+class FakeHH:
+    """
+    A minimal in-memory stand-in for the hh.ru search and details endpoints,
+    used in place of a requests.Session.
+    """
+
+    def __init__(self, count: int, per_page: int = 100, failing_ids=(), delay: float = 0.0):
+        self.ids = [str(i) for i in range(1, count + 1)]
+        self.per_page = per_page
+        self.failing_ids = set(failing_ids)
+        self.delay = delay
+        self.published_at = {i: "2025-01-01T10:00:00+0300" for i in self.ids}
+        self.detail_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> FakeResponse:
+        path = url[len(hh.BASE_URL):]
+        if path == "vacancies":
+            page = params["page"]
+            items = self.ids[page * self.per_page:(page + 1) * self.per_page]
+            pages = -(-len(self.ids) // self.per_page)
+            return FakeResponse(
+                {"items": [{"id": i, "published_at": self.published_at[i]} for i in items], "pages": pages}
+            )
+
+        vacancy_id = path.rsplit("/", 1)[1]
+        with self._lock:
+            self.detail_requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if vacancy_id in self.failing_ids:
+                return FakeResponse({}, status_code=500)
+            return FakeResponse(
+                {"id": vacancy_id, "name": f"Vacancy {vacancy_id}", "key_skills": [{"name": "Python"}]}
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_fetch_preserves_search_order():
+    fake = FakeHH(count=150, delay=0.001)
+
+    vacancies = HHFetcher(max_workers=8, session=fake).fetch(search_query="python", total_vacancies=120)
+
+    assert [v.id for v in vacancies] == fake.ids[:120]
+    assert vacancies[0].key_skills == ["Python"]
+
+
+def test_fetch_limits_concurrency():
+    fake = FakeHH(count=40, delay=0.01)
+
+    HHFetcher(max_workers=4, session=fake).fetch(search_query="python", total_vacancies=40)
+
+    assert 1 < fake.max_in_flight <= 4
+
+
+def test_failed_details_are_recorded_and_replaced():
+    fetcher = HHFetcher(max_workers=3, session=FakeHH(count=10, failing_ids={"2", "5"}))
+
+    vacancies = fetcher.fetch(search_query="python", total_vacancies=7)
+
+    assert [v.id for v in vacancies] == ["1", "3", "4", "6", "7", "8", "9"]
+    assert set(fetcher.errors) == {"2", "5"}
+
+
+def test_max_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        HHFetcher(max_workers=0)
+
+
+def test_incremental_fetch_reuses_unchanged_vacancies(tmp_path: Path):
+    fake = FakeHH(count=20)
+    index_path = tmp_path / "index.json"
+    HHFetcher(session=fake, index=VacancyIndex(index_path)).fetch(search_query="python", total_vacancies=20)
+    assert fake.detail_requests == 20
+
+    fake.detail_requests = 0
+    fake.published_at["7"] = "2025-01-02T10:00:00+0300"
+    fetcher = HHFetcher(session=fake, index=VacancyIndex(index_path))
+    vacancies = fetcher.fetch(search_query="python", total_vacancies=20)
+
+    assert [v.id for v in vacancies] == fake.ids
+    assert fake.detail_requests == 1
+    assert fetcher.reused == 19
+
+
+class FakeHHWithAreas:
+    """
+    Search stand-in that honours area and publication date filters
+    and, like hh.ru, returns at most MAX_SEARCH_DEPTH results per search.
+    """
+
+    areas = [{"id": "113", "name": "Россия", "areas": [
+        {"id": "1", "name": "Москва", "areas": []},
+        {"id": "2", "name": "Санкт-Петербург", "areas": []},
+    ]}]
+
+    def __init__(self, per_area: Dict[str, int]):
+        now = datetime.now(timezone.utc)
+        self.vacancies = []
+        for area_id, count in per_area.items():
+            for i in range(count):
+                published = now - timedelta(hours=len(self.vacancies) + 1)
+                self.vacancies.append({"id": f"{area_id}-{i}", "area": area_id, "published_at": published})
+        # Filters of the search requests that loaded a page, not just the count
+        self.page_requests = []
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> FakeResponse:
+        path = url[len(hh.BASE_URL):]
+        if path == "areas":
+            return FakeResponse(self.areas)
+        if path.startswith("vacancies/"):
+            vacancy_id = path.rsplit("/", 1)[1]
+            return FakeResponse({"id": vacancy_id, "name": f"Vacancy {vacancy_id}"})
+
+        if params["per_page"] > 1:
+            self.page_requests.append(params)
+        found = [v for v in self.vacancies if self._matches(v, params)]
+        depth = partition.MAX_SEARCH_DEPTH
+        page, per_page = params["page"], params["per_page"]
+        start = page * per_page
+        items = found[start:min(start + per_page, depth)]
+        return FakeResponse({
+            "items": [{"id": v["id"], "published_at": v["published_at"].isoformat()} for v in items],
+            "found": len(found),
+            "pages": -(-min(len(found), depth) // per_page),
+        })
+
+    @staticmethod
+    def _matches(vacancy: Dict[str, Any], params: Dict[str, Any]) -> bool:
+        area = str(params.get("area", "113"))
+        if area != "113" and vacancy["area"] != area:
+            return False
+        if "date_from" in params and vacancy["published_at"] < datetime.fromisoformat(params["date_from"]):
+            return False
+        if "date_to" in params and vacancy["published_at"] > datetime.fromisoformat(params["date_to"]):
+            return False
+        return True
+
+
+def test_large_search_is_partitioned_by_area_and_date(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(partition, "MAX_SEARCH_DEPTH", 30)
+    fake = FakeHHWithAreas({"1": 70, "2": 20})
+
+    vacancies = HHFetcher(session=fake).fetch(search_query="python", total_vacancies=1000, region_id=113)
+
+    ids = [v.id for v in vacancies]
+    assert len(ids) == len(set(ids))
+    assert set(ids) == {v["id"] for v in fake.vacancies}
+
+
+def test_vacancies_of_the_parent_area_are_not_lost(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(partition, "MAX_SEARCH_DEPTH", 30)
+    # Vacancies attached to the country itself match no search by its regions
+    fake = FakeHHWithAreas({"1": 25, "2": 20, "113": 5})
+
+    vacancies = HHFetcher(session=fake).fetch(search_query="python", total_vacancies=1000, region_id=113)
+
+    assert sorted(v.id for v in vacancies) == sorted(v["id"] for v in fake.vacancies)
+
+
+def test_partitioned_search_loads_only_the_needed_sub_searches(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(partition, "MAX_SEARCH_DEPTH", 30)
+    fake = FakeHHWithAreas({"1": 300, "2": 300})
+
+    vacancies = HHFetcher(session=fake).fetch(search_query="python", total_vacancies=45, region_id=113)
+
+    assert len(vacancies) == 45
+    assert len(fake.page_requests) == 2
+
+
+def test_partitioning_can_be_disabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(partition, "MAX_SEARCH_DEPTH", 30)
+    fake = FakeHHWithAreas({"1": 70, "2": 20})
+
+    vacancies = HHFetcher(session=fake, partition_search=False).fetch(
+        search_query="python", total_vacancies=1000, region_id=113
+    )
+
+    assert len(vacancies) == 30
+
+
+def test_skipped_vacancies_are_not_fetched_again():
+    fake = FakeHH(count=150)
+
+    vacancies = list(
+        HHFetcher(session=fake).iter_fetch(search_query="python", total_vacancies=30, skip_ids=set(fake.ids[:100]))
+    )
+
+    assert [v.id for v in vacancies] == fake.ids[100:130]
+    assert fake.detail_requests == 30
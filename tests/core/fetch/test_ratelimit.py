@@ -0,0 +1,70 @@
+"""Tests for the adaptive rate limiter."""
+
+import threading
+import time
+
+import pytest
+
+from skillradar.core.fetch.ratelimit import AdaptiveRateLimiter, get_rate_limiter
+
+
+def test_burst_is_served_immediately_then_rate_applies():
+    limiter = AdaptiveRateLimiter(rate=20.0, burst=5, max_rate=20.0)
+
+    assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+    assert limiter.reserve() == pytest.approx(1 / 20, abs=0.01)
+    assert limiter.reserve() == pytest.approx(2 / 20, abs=0.01)
+
+
+def test_rate_halves_on_429_and_pauses_for_retry_after():
+    limiter = AdaptiveRateLimiter(rate=8.0, burst=1, min_rate=1.0)
+    limiter.reserve()
+
+    limiter.on_response(429, retry_after=2.0)
+
+    assert limiter.rate == 4.0
+    assert limiter.reserve() >= 2.0
+
+
+def test_rate_recovers_on_healthy_responses_after_cooldown():
+    limiter = AdaptiveRateLimiter(rate=4.0, max_rate=4.5, increase_step=0.25, cooldown=0.0)
+    limiter.on_response(429)
+    assert limiter.rate == 2.0
+
+    for _ in range(20):
+        limiter.on_response(200)
+
+    assert limiter.rate == 4.5
+
+
+def test_rate_does_not_grow_during_cooldown():
+    limiter = AdaptiveRateLimiter(rate=4.0, cooldown=60.0)
+    limiter.on_response(429)
+
+    limiter.on_response(200)
+
+    assert limiter.rate == 2.0
+
+
+def test_queue_depth_counts_waiting_threads():
+    limiter = AdaptiveRateLimiter(rate=5.0, burst=1, max_rate=5.0)
+    limiter.acquire()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+
+    assert limiter.queue_depth == 3
+
+    for thread in threads:
+        thread.join()
+    assert limiter.queue_depth == 0
+
+
+def test_default_limiter_is_shared():
+    assert get_rate_limiter() is get_rate_limiter()
+
+
+def test_rejects_rate_outside_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveRateLimiter(rate=100.0, max_rate=50.0)
@@ -0,0 +1,90 @@
+"""Tests for the region tree index and its cache."""
+
+from pathlib import Path
+
+from skillradar.core.fetch.hh import HHRegionFetcher
+from skillradar.core.fetch.regions import RegionIndex
+
+TREE = [
+    {"id": "113", "name": "Россия", "areas": [
+        {"id": "1", "name": "Москва", "areas": []},
+        {"id": "1620", "name": "Республика Марий Эл", "areas": [
+            {"id": "1621", "name": "Йошкар-Ола", "areas": []},
+        ]},
+    ]},
+    {"id": "5", "name": "Украина", "areas": [
+        {"id": "115", "name": "Киев", "areas": []},
+    ]},
+]
+
+
+class TreeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return TREE
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        return TreeResponse()
+
+
+def test_region_index_lookups():
+    index = RegionIndex(TREE)
+
+    assert len(index) == 6
+    assert index.name(1621) == "Йошкар-Ола"
+    assert index.parent("1621") == "1620"
+    assert index.parent("113") is None
+    assert index.children() == ("113", "5")
+    assert index.children("113") == ("1", "1620")
+    assert set(index.descendants("113")) == {"1", "1620", "1621"}
+    assert index.descendants("1") == ()
+    assert index.find("москва") == ("1",)
+    assert "115" in index and "999" not in index
+
+
+def test_region_fetcher_caches_in_memory():
+    session = CountingSession()
+    fetcher = HHRegionFetcher(session=session)
+
+    assert fetcher.fetch() == TREE
+    assert fetcher.index() is fetcher.index()
+    assert session.calls == 1
+
+
+def test_region_fetcher_persists_cache_between_instances(tmp_path: Path):
+    cache_path = tmp_path / "areas.json"
+    HHRegionFetcher(session=CountingSession(), cache_path=cache_path).fetch()
+
+    session = CountingSession()
+    index = HHRegionFetcher(session=session, cache_path=cache_path).index()
+
+    assert index.name("115") == "Киев"
+    assert session.calls == 0
+
+
+def test_region_fetcher_refreshes_expired_cache(tmp_path: Path):
+    cache_path = tmp_path / "areas.json"
+    HHRegionFetcher(session=CountingSession(), cache_path=cache_path).fetch()
+
+    session = CountingSession()
+    HHRegionFetcher(session=session, cache_path=cache_path, ttl=0).fetch()
+
+    assert session.calls == 1
+
+
+def test_region_fetcher_ignores_damaged_cache(tmp_path: Path):
+    cache_path = tmp_path / "areas.json"
+    for damaged in ('["not", "a", "dict"]', '{"areas": {}}', '{"fetched_at": "soon", "areas": []}', "{"):
+        cache_path.write_text(damaged, encoding="utf-8")
+        session = CountingSession()
+
+        assert HHRegionFetcher(session=session, cache_path=cache_path).fetch() == TREE
+        assert session.calls == 1
@@ -0,0 +1,112 @@
+"""Tests for the on-disk HTTP response cache."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from skillradar.core.fetch.cache import ResponseCache
+from skillradar.core.fetch.session import HttpConfig, build_session
+
+
+@pytest.fixture
+def etag_server():
+    """Serves a JSON body per path with an ETag and honours If-None-Match."""
+    state = {"requests": 0, "not_modified": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            etag = f'"{self.path}"'
+            if self.headers.get("If-None-Match") == etag:
+                state["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = ('{"path": "%s", "padding": "%s"}' % (self.path, "x" * 100)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_fresh_entries_are_served_from_cache(etag_server, tmp_path: Path):
+    url, state = etag_server
+    cache = ResponseCache(tmp_path, ttl=60)
+    session = build_session(HttpConfig(), cache=cache)
+
+    first = session.get(url + "vacancies", params={"text": "python"})
+    second = session.get(url + "vacancies", params={"text": "python"})
+    session.get(url + "vacancies", params={"text": "go"})
+
+    assert second.json() == first.json()
+    assert state["requests"] == 2
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_stale_entries_are_revalidated(etag_server, tmp_path: Path):
+    url, state = etag_server
+    session = build_session(HttpConfig(), cache=ResponseCache(tmp_path, ttl=0))
+    first = session.get(url + "areas")
+
+    # A new cache instance picks the entry up from disk
+    cache = ResponseCache(tmp_path, ttl=0)
+    second = build_session(HttpConfig(), cache=cache).get(url + "areas")
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert state["not_modified"] == 1
+    assert cache.stats.revalidated == 1
+
+
+def test_revalidation_closes_the_304_response(tmp_path: Path):
+    class NotModified(requests.Response):
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    url = "http://hh.test/areas"
+    cache = ResponseCache(tmp_path, ttl=0)
+    ok = requests.Response()
+    ok.status_code, ok.url, ok._content = 200, url, b"[]"
+    ok.headers["ETag"] = '"v1"'
+    cache.send(requests.Request("GET", url).prepare(), lambda request: ok)
+
+    not_modified = NotModified()
+    not_modified.status_code = 304
+    response = cache.send(requests.Request("GET", url).prepare(), lambda request: not_modified)
+
+    assert response.content == b"[]"
+    assert not_modified.closed
+
+
+def test_least_recently_used_entries_are_evicted(etag_server, tmp_path: Path):
+    url, _ = etag_server
+    cache = ResponseCache(tmp_path, max_bytes=300, ttl=60)
+    session = build_session(HttpConfig(), cache=cache)
+
+    session.get(url + "a")
+    session.get(url + "b")
+    session.get(url + "a")  # "a" becomes the most recently used entry
+    session.get(url + "c")
+
+    assert cache.size <= 300
+    assert cache.stats.evictions == 1
+    assert cache.get(ResponseCache.key_for("GET", url + "b")) is None
+    assert cache.get(ResponseCache.key_for("GET", url + "a")) is not None
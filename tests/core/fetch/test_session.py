@@ -0,0 +1,97 @@
+"""Tests for the shared HTTP session layer."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from skillradar.core.fetch.ratelimit import AdaptiveRateLimiter
+from skillradar.core.fetch.session import (
+    HttpConfig,
+    build_session,
+    get_session,
+    parse_retry_after,
+)
+
+
+@pytest.fixture
+def flaky_server():
+    """Serves 503 for the first `failures` requests, then 200."""
+    state = {"requests": 0, "failures": 2}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            if state["requests"] <= state["failures"]:
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_retries_transient_statuses(flaky_server):
+    url, state = flaky_server
+    session = build_session(HttpConfig(max_retries=3, backoff_factor=0))
+
+    r = session.get(url)
+
+    assert r.status_code == 200
+    assert r.json() == {"ok": True}
+    assert state["requests"] == 3
+
+
+def test_session_gives_up_after_max_retries(flaky_server):
+    url, state = flaky_server
+    state["failures"] = 10
+    session = build_session(HttpConfig(max_retries=1, backoff_factor=0))
+
+    r = session.get(url)
+
+    assert r.status_code == 503
+    assert state["requests"] == 2
+
+
+def test_session_reports_every_attempt_to_limiter(flaky_server):
+    url, _state = flaky_server
+    limiter = AdaptiveRateLimiter(rate=40.0, burst=10, min_rate=1.0, max_rate=40.0, cooldown=60.0)
+    session = build_session(HttpConfig(max_retries=3, backoff_factor=0), limiter=limiter)
+
+    session.get(url)
+
+    # Two throttled attempts halve the rate twice; the success is within cooldown
+    assert limiter.rate == 10.0
+
+
+def test_backoff_is_exponential_and_capped():
+    config = HttpConfig(backoff_factor=0.5, max_backoff=3.0)
+
+    assert [config.backoff(n) for n in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    assert config.backoff(0, retry_after="2") == 2.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("garbage") is None
+
+
+def test_default_session_is_shared():
+    assert get_session() is get_session()
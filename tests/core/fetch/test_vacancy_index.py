@@ -0,0 +1,60 @@
+"""Tests for the index of fetched vacancies."""
+
+import logging
+from pathlib import Path
+
+from skillradar.core.fetch.index import VacancyIndex
+from skillradar.core.fetch.models import RawVacancy
+
+
+def vacancy(vacancy_id: str, name: str = "Dev") -> RawVacancy:
+    return RawVacancy(id=vacancy_id, name=name, description=f"<p>{name}</p>", area={"name": "Москва"})
+
+
+def test_vacancies_are_read_back_by_stamp(tmp_path: Path):
+    index = VacancyIndex(tmp_path / "index.jsonl")
+    index.put(vacancy("1"), "2025-01-01")
+    index.put(vacancy("2"), "2025-01-01")
+    index.put(vacancy("1", "Senior Dev"), "2025-01-02")
+
+    restored = VacancyIndex(tmp_path / "index.jsonl")
+
+    assert len(restored) == 2
+    assert restored.get("1", "2025-01-02") == vacancy("1", "Senior Dev")
+    assert restored.get("1", "2025-01-01") is None
+    assert restored.get("3", "2025-01-01") is None
+
+
+def test_save_drops_stale_lines(tmp_path: Path):
+    path = tmp_path / "index.jsonl"
+    index = VacancyIndex(path)
+    index.put(vacancy("1"), "2025-01-01")
+    index.save()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+    for day in range(2, 5):
+        index.put(vacancy("1", f"Dev {day}"), f"2025-01-0{day}")
+    index.put(vacancy("2"), "2025-01-01")
+    index.save()
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    assert index.get("1", "2025-01-04") == vacancy("1", "Dev 4")
+    assert VacancyIndex(path).get("2", "2025-01-01") == vacancy("2")
+    assert [p.name for p in tmp_path.iterdir()] == ["index.jsonl"]
+
+
+def test_unreadable_lines_are_skipped(tmp_path: Path, caplog):
+    path = tmp_path / "index.jsonl"
+    VacancyIndex(path).put(vacancy("1"), "2025-01-01")
+    with open(path, "ab") as f:
+        f.write(b"\xff not json\n{\"id\": \"2\"}\n{\"id\": \"3\", \"sta")
+
+    with caplog.at_level(logging.WARNING):
+        index = VacancyIndex(path)
+        assert len(index) == 1
+    assert "Skipped 3 unreadable lines" in caplog.text
+
+    # The torn last line is cut off, so new lines start on a line of their own
+    index.put(vacancy("3"), "2025-01-01")
+    assert VacancyIndex(path).get("3", "2025-01-01") == vacancy("3")
+    assert VacancyIndex(path).get("1", "2025-01-01") == vacancy("1")
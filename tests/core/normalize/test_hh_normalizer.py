@@ -1,3 +1,4 @@
+from skillradar.core.fetch.models import RawVacancy
 from skillradar.core.normalize.hh import HhNormalizer
 from skillradar.core.normalize.models import NormalizedVacancy
 import pytest
@@ -141,3 +142,35 @@ def test_hh_normalizer_description_fallback_from_raw():
     normalized_vacancy = normalizer.normalize(raw_data)
     assert normalized_vacancy.description == "Description only in raw details."
     assert normalized_vacancy.company_name == "Another Employer"
+
+def test_hh_normalizer_accepts_raw_vacancy_and_its_stored_form():
+    raw = RawVacancy(
+        id="42",
+        name="Go Developer",
+        description="Main.",
+        branded_description="Branded.",
+        key_skills=["Go", "gRPC"],
+        area={"id": "2", "name": "Санкт-Петербург"},
+    )
+    normalizer = HhNormalizer()
+
+    from_object = normalizer.normalize(raw)
+
+    assert from_object == normalizer.normalize(raw.to_dict()) == NormalizedVacancy(
+        id="42",
+        title="Go Developer",
+        url="https://hh.ru/vacancy/42",
+        source="HeadHunter",
+        description="Main.\n\n---\n\nBranded.",
+        skills=["Go", "gRPC"],
+        location="Санкт-Петербург",
+    )
+    assert from_object.skills is raw.key_skills
+    with pytest.raises(ValueError, match="Missing required fields"):
+        normalizer.normalize(RawVacancy(id="", name="No ID"))
+
+    no_area = RawVacancy(id="43", name="Dev", description="d", area=None)
+    assert normalizer.normalize(no_area) == normalizer.normalize(no_area.to_dict())
+    assert normalizer.normalize(no_area.to_dict()).location is None
+    stored = dict(no_area.to_dict(), employer=None)
+    assert normalizer.normalize(stored).company_name is None
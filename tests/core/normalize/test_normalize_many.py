@@ -0,0 +1,50 @@
+"""Tests for bulk normalization."""
+
+import pytest
+
+from skillradar.core.normalize.hh import HhNormalizer
+from skillradar.core.normalize.models import NormalizationError
+
+
+def raw_vacancies(count: int, broken=()):
+    for i in range(count):
+        if i in broken:
+            yield {"id": str(i), "name": None}
+        else:
+            yield {"id": str(i), "name": f"Vacancy {i}", "key_skills": [{"name": "Python"}], "area": {"name": "Москва"}}
+
+
+def test_serial_keeps_order_and_collects_errors():
+    normalizer = HhNormalizer()
+
+    vacancies = list(normalizer.normalize_many(raw_vacancies(10, broken={3, 7}), chunk_size=4))
+
+    assert [v.id for v in vacancies] == ["0", "1", "2", "4", "5", "6", "8", "9"]
+    assert [(e.index, e.vacancy_id) for e in normalizer.errors] == [(3, "3"), (7, "7")]
+    assert normalizer.errors[0].message.startswith("ValueError: Missing required fields")
+
+
+def test_process_pool_matches_serial():
+    normalizer = HhNormalizer()
+    expected = list(normalizer.normalize_many(raw_vacancies(500, broken={0, 250}), chunk_size=7))
+    expected_errors = normalizer.errors
+
+    result = list(normalizer.normalize_many(raw_vacancies(500, broken={0, 250}), chunk_size=7, workers=2))
+
+    assert result == expected
+    assert normalizer.errors == expected_errors == [
+        NormalizationError(index=0, vacancy_id="0", message=expected_errors[0].message),
+        NormalizationError(index=250, vacancy_id="250", message=expected_errors[1].message),
+    ]
+
+
+def test_errors_are_reset_and_arguments_checked():
+    normalizer = HhNormalizer()
+    list(normalizer.normalize_many(raw_vacancies(2, broken={0})))
+    list(normalizer.normalize_many(raw_vacancies(2)))
+    assert normalizer.errors == []
+
+    with pytest.raises(ValueError):
+        normalizer.normalize_many([], chunk_size=0)
+    with pytest.raises(ValueError):
+        normalizer.normalize_many([], workers=0)
@@ -0,0 +1,94 @@
+"""Tests for the content-addressed description store."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.fetch.models import RawVacancy
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage import paths
+from skillradar.core.storage.blobs import BlobStore
+from skillradar.core.storage.jsonl import JsonlStorage
+from skillradar.core.storage.local import LocalStorage
+
+
+@pytest.fixture
+def blobs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> BlobStore:
+    monkeypatch.setattr(paths, "RAW_DIR", tmp_path / "raw")
+    monkeypatch.setattr(paths, "NORMALIZED_DIR", tmp_path / "normalized")
+    monkeypatch.setattr(paths, "ANALYSIS_DIR", tmp_path / "analysis")
+    monkeypatch.setattr(paths, "EXTRACTION_DIR", tmp_path / "extraction")
+    monkeypatch.setattr(paths, "CATALOG_PATH", tmp_path / "catalog.jsonl")
+    monkeypatch.setattr(paths, "BLOB_DIR", tmp_path / "blobs")
+    return BlobStore()
+
+
+def blob_count(store: BlobStore) -> int:
+    return sum(len(files) for _, _, files in os.walk(store.directory))
+
+
+def test_put_is_idempotent(blobs: BlobStore):
+    digest = blobs.put("<p>Описание</p>")
+
+    assert blobs.put("<p>Описание</p>") == digest
+    assert blobs.get(digest) == "<p>Описание</p>"
+    assert blob_count(blobs) == 1
+
+
+@pytest.mark.parametrize("storage_type", [LocalStorage, JsonlStorage])
+def test_snapshots_share_descriptions(blobs: BlobStore, storage_type):
+    storage = storage_type(blobs=blobs)
+    raw = [RawVacancy(id=str(i), name="Dev", description=f"<p>{i % 2}</p>", branded_description="<b>Brand</b>")
+           for i in range(10)]
+    normalized = [NormalizedVacancy(id=str(i), title="Dev", url="u", source="hh", description=f"{i % 2}")
+                  for i in range(10)]
+
+    for run in ("first", "second"):
+        storage.save_raw(run, raw)
+        storage.save_normalized(run, normalized)
+
+    assert blob_count(blobs) == 5
+    raw_text = next(paths.RAW_DIR.glob("first.json*")).read_text(encoding="utf-8")
+    assert "<p>0</p>" not in raw_text and "$blob" in raw_text
+    assert storage.load_raw("second")[3]["description"] == "<p>1</p>"
+    assert storage.load_normalized("second") == normalized
+    assert list(storage.iter_normalized("first", fields=["id", "description"]))[0] == {"id": "0", "description": "0"}
+
+
+def test_storage_without_blob_store_resolves_references(blobs: BlobStore):
+    LocalStorage(blobs=blobs).save_normalized("run", [NormalizedVacancy(id="1", title="T", url="u", source="hh",
+                                                                        description="text")])
+
+    assert LocalStorage().load_normalized("run")[0].description == "text"
+
+
+def test_collect_garbage_removes_unreferenced_blobs(blobs: BlobStore):
+    storage = LocalStorage(blobs=blobs)
+    storage.save_raw("old", [{"id": "1", "description": "old text"}])
+    storage.save_raw("new", [{"id": "2", "description": "new text"}])
+    (paths.RAW_DIR / "old.json").unlink()
+
+    assert storage.collect_garbage(grace=60) == 0
+    assert storage.collect_garbage(grace=0) == 1
+    assert blob_count(blobs) == 1
+    assert storage.load_raw("new") == [{"id": "2", "description": "new text"}]
+
+
+def test_put_refreshes_reused_blob(blobs: BlobStore):
+    digest = blobs.put("shared text")
+    blob_path = next(p for p in blobs.directory.rglob("*") if p.is_file())
+    os.utime(blob_path, (0, 0))
+
+    assert blobs.put("shared text") == digest
+    assert blobs.gc([], grace=60) == 0
+    assert blobs.get(digest) == "shared text"
+
+
+def test_dict_raw_data_is_not_packed(blobs: BlobStore):
+    LocalStorage(blobs=blobs).save_raw("meta", {"description": "query description"})
+
+    assert json.loads((paths.RAW_DIR / "meta.json").read_text(encoding="utf-8")) == {
+        "description": "query description"
+    }
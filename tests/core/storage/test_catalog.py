@@ -0,0 +1,109 @@
+"""Tests for the snapshot catalog."""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage import local, paths
+from skillradar.core.storage.catalog import SnapshotCatalog
+from skillradar.core.storage.jsonl import JsonlStorage
+from skillradar.core.storage.local import LocalStorage
+from skillradar.core.storage.sqlite import SQLiteStorage
+
+
+@pytest.fixture(autouse=True)
+def data_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    for attr in ("RAW_DIR", "NORMALIZED_DIR", "ANALYSIS_DIR", "EXTRACTION_DIR", "BLOB_DIR"):
+        monkeypatch.setattr(paths, attr, tmp_path / attr.lower())
+    monkeypatch.setattr(paths, "CATALOG_PATH", tmp_path / "catalog.jsonl")
+
+
+def vacancies(count: int):
+    return [NormalizedVacancy(id=str(i), title="Dev", url="u", source="hh") for i in range(count)]
+
+
+def test_saves_are_recorded_with_counts_sizes_and_checksums():
+    storage = LocalStorage()
+    storage.describe_snapshot("run", query="python", region="1")
+    storage.save_raw("run", ({"id": str(i)} for i in range(3)))
+    storage.save_normalized("run", vacancies(2))
+
+    [info] = storage.list_snapshots()
+    raw_file = paths.RAW_DIR / "run.json"
+    assert (info.name, info.query, info.region) == ("run", "python", "1")
+    assert (info.raw_count, info.normalized_count) == (3, 2)
+    assert info.raw_bytes == raw_file.stat().st_size
+    assert info.raw_sha256 == hashlib.sha256(raw_file.read_bytes()).hexdigest()
+    assert info.normalized_seconds >= 0
+    assert info.created_at <= info.updated_at
+
+
+@pytest.mark.parametrize("make_storage, file_name", [
+    (lambda: LocalStorage(compression="gzip"), "run.json.gz"),
+    (lambda: LocalStorage(compression="xz"), "run.json.xz"),
+    (lambda: LocalStorage(write_behind=True, chunk_size=2), "run.json"),
+    (JsonlStorage, "run.jsonl"),
+])
+def test_checksum_is_computed_while_writing(make_storage, file_name: str, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(hashlib, "file_digest", lambda *args: pytest.fail("snapshot was read back"))
+
+    with make_storage() as storage:
+        storage.save_normalized("run", vacancies(5))
+        info = storage.latest_snapshot()
+
+    file_bytes = (paths.NORMALIZED_DIR / file_name).read_bytes()
+    assert info.normalized_sha256 == hashlib.sha256(file_bytes).hexdigest()
+
+
+def test_latest_snapshot_filters_by_query_without_reading_snapshots(monkeypatch: pytest.MonkeyPatch):
+    storage = LocalStorage()
+    for name, query in (("first", "python"), ("second", "go"), ("third", "python")):
+        storage.describe_snapshot(name, query=query)
+        storage.save_normalized(name, vacancies(1))
+
+    monkeypatch.setattr(local, "_iter_array", lambda *args: pytest.fail("snapshot was read"))
+
+    assert [info.name for info in storage.list_snapshots()] == ["first", "second", "third"]
+    assert storage.latest_snapshot(query="python").name == "third"
+    assert storage.latest_snapshot(query="rust") is None
+
+
+def test_jsonl_append_updates_count_without_checksum():
+    storage = JsonlStorage()
+    storage.save_normalized("run", vacancies(2))
+    assert storage.latest_snapshot().normalized_sha256 is not None
+
+    storage.append_normalized("run", vacancies(5)[2:])
+
+    info = storage.latest_snapshot()
+    assert info.normalized_count == 5
+    assert info.normalized_sha256 is None
+    assert info.normalized_bytes == (paths.NORMALIZED_DIR / "run.jsonl").stat().st_size
+
+
+def test_catalog_skips_truncated_line_and_rejects_unknown_fields(tmp_path: Path):
+    catalog = SnapshotCatalog(tmp_path / "catalog.jsonl")
+    catalog.update("run", raw_count=1)
+    with open(catalog.path, "a", encoding="utf-8") as f:
+        f.write('{"name":"run","at":"2')
+
+    assert catalog.latest().raw_count == 1
+    catalog.update("run", raw_count=2)
+    assert catalog.latest().raw_count == 2
+    with pytest.raises(ValueError):
+        catalog.update("run", created_at="yesterday")
+
+
+def test_sqlite_lists_snapshots(tmp_path: Path):
+    storage = SQLiteStorage(tmp_path / "db.sqlite3")
+    storage.describe_snapshot("run", query="python", region="1")
+    storage.save_raw("run", [{"id": "1"}, {"id": "2"}])
+    storage.save_normalized("other", vacancies(3))
+
+    by_name = {info.name: info for info in storage.list_snapshots()}
+    assert (by_name["run"].query, by_name["run"].raw_count, by_name["run"].normalized_count) == ("python", 2, None)
+    assert by_name["other"].normalized_count == 3
+    assert storage.latest_snapshot(query="python").name == "run"
+    storage.close()
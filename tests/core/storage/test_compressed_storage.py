@@ -0,0 +1,62 @@
+"""Tests for compressed snapshots in LocalStorage."""
+
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.fetch.models import RawVacancy
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage import compression, paths
+from skillradar.core.storage.local import LocalStorage
+
+CODECS = [
+    "gzip",
+    "xz",
+    pytest.param("zstd", marks=pytest.mark.skipif(compression.zstandard is None, reason="zstandard not installed")),
+]
+
+
+@pytest.fixture(autouse=True)
+def data_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(paths, "RAW_DIR", tmp_path / "raw")
+    monkeypatch.setattr(paths, "NORMALIZED_DIR", tmp_path / "normalized")
+    monkeypatch.setattr(paths, "ANALYSIS_DIR", tmp_path / "analysis")
+    monkeypatch.setattr(paths, "EXTRACTION_DIR", tmp_path / "extraction")
+    monkeypatch.setattr(paths, "CATALOG_PATH", tmp_path / "catalog.jsonl")
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_compressed_round_trip(codec: str):
+    storage = LocalStorage(compression=codec, level=1)
+    raw = [RawVacancy(id=str(i), name="Разработчик", description="<p>Python</p>" * 50) for i in range(200)]
+    normalized = [NormalizedVacancy(id=str(i), title="Dev", url="u", source="hh", skills=["Go"]) for i in range(200)]
+
+    storage.save_raw("run", iter(raw))
+    storage.save_normalized("run", normalized)
+    storage.save_raw("meta", {"query": "python"})
+
+    raw_file = paths.RAW_DIR / f"run.json{compression.SUFFIXES[codec]}"
+    assert compression.detect_codec(raw_file) == codec
+    assert raw_file.stat().st_size < 200 * 50 * len("<p>Python</p>") / 10
+    assert [item["id"] for item in storage.load_raw("run")] == [v.id for v in raw]
+    assert storage.load_normalized("run") == normalized
+    assert storage.load_raw("meta") == {"query": "python"}
+
+
+def test_any_storage_reads_compressed_snapshots():
+    LocalStorage(compression="gzip").save_raw("run", [{"id": "1"}])
+
+    assert LocalStorage().load_raw("run") == [{"id": "1"}]
+
+
+def test_resaving_with_another_codec_replaces_old_file():
+    LocalStorage(compression="xz").save_normalized("run", [])
+    LocalStorage().save_normalized("run", [NormalizedVacancy(id="1", title="Dev", url="u", source="hh")])
+
+    assert [p.name for p in paths.NORMALIZED_DIR.iterdir()] == ["run.json"]
+    assert len(LocalStorage().load_normalized("run")) == 1
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        LocalStorage(compression="brotli")
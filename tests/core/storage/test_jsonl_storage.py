@@ -0,0 +1,119 @@
+"""Tests for the JsonlStorage implementation."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.fetch.models import RawVacancy
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage import offsets, paths
+from skillradar.core.storage.jsonl import JsonlStorage
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> JsonlStorage:
+    data_dir = tmp_path / "data"
+    monkeypatch.setattr(paths, "DATA_DIR", data_dir)
+    monkeypatch.setattr(paths, "RAW_DIR", data_dir / "raw")
+    monkeypatch.setattr(paths, "NORMALIZED_DIR", data_dir / "normalized")
+    monkeypatch.setattr(paths, "ANALYSIS_DIR", data_dir / "analysis")
+    monkeypatch.setattr(paths, "EXTRACTION_DIR", data_dir / "extraction")
+    monkeypatch.setattr(paths, "CATALOG_PATH", data_dir / "catalog.jsonl")
+    return JsonlStorage(flush_every=1)
+
+
+def test_save_raw_writes_one_compact_record_per_line(storage: JsonlStorage):
+    vacancies = (RawVacancy(id=str(i), name=f"Vacancy {i}", key_skills=["Python"]) for i in range(3))
+
+    storage.save_raw("run", vacancies)
+
+    lines = (paths.RAW_DIR / "run.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith('{"id":"0","name":"Vacancy 0"')
+    assert [item["id"] for item in storage.load_raw("run")] == ["0", "1", "2"]
+
+
+def test_raw_dict_round_trips(storage: JsonlStorage):
+    storage.save_raw("meta", {"query": "python"})
+
+    assert storage.load_raw("meta") == {"query": "python"}
+
+
+def test_records_are_on_disk_while_writing(storage: JsonlStorage):
+    def produce():
+        for i in range(3):
+            yield {"id": str(i)}
+            assert len(list(storage.iter_raw("run"))) == i + 1
+
+    storage.save_raw("run", produce())
+
+
+def test_normalized_round_trip_and_append(storage: JsonlStorage):
+    first = NormalizedVacancy(id="1", title="Dev", url="u1", source="hh", skills=["Python"], location="Москва")
+    second = NormalizedVacancy(id="2", title="QA", url="u2", source="hh")
+
+    storage.save_normalized("run", [first])
+    storage.append_normalized("run", [second])
+
+    assert storage.load_normalized("run") == [first, second]
+
+
+def test_truncated_last_line_is_skipped_and_repaired_on_append(storage: JsonlStorage):
+    storage.save_raw("run", [{"id": "1"}, {"id": "2"}])
+    with open(paths.RAW_DIR / "run.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"id": "3", "na')
+
+    assert [item["id"] for item in storage.iter_raw("run")] == ["1", "2"]
+
+    storage.append_raw("run", [{"id": "4"}])
+    assert [item["id"] for item in storage.iter_raw("run")] == ["1", "2", "4"]
+
+
+def test_missing_file_raises(storage: JsonlStorage):
+    with pytest.raises(FileNotFoundError):
+        storage.iter_normalized("missing")
+
+
+def test_get_normalized_reads_one_record_through_index(storage: JsonlStorage, monkeypatch: pytest.MonkeyPatch):
+    vacancies = [NormalizedVacancy(id=str(i), title=f"Dev {i}", url="u", source="hh") for i in range(50)]
+    storage.save_normalized("run", vacancies)
+    storage.append_normalized("run", [NormalizedVacancy(id="7", title="Updated", url="u", source="hh")])
+    assert (paths.NORMALIZED_DIR / "run.jsonl.idx").exists()
+
+    parsed = []
+    real_loads = json.loads
+    monkeypatch.setattr(json, "loads", lambda s, *a, **kw: parsed.append(s) or real_loads(s, *a, **kw))
+
+    assert storage.get_normalized("run", "42") == vacancies[42]
+    assert storage.get_normalized("run", "7").title == "Updated"
+    assert storage.get_normalized("run", "missing") is None
+    assert len(parsed) == 2
+
+
+def test_stale_index_is_rebuilt(storage: JsonlStorage):
+    storage.save_raw("run", [{"id": "1"}, {"id": "2"}])
+    with open(paths.RAW_DIR / "run.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"id":"3","name":"written by another tool"}\n')
+
+    assert storage.get_raw("run", "3") == {"id": "3", "name": "written by another tool"}
+    assert storage.get_raw("run", "1") == {"id": "1"}
+
+
+def test_concurrent_index_writes_use_their_own_temp_files(tmp_path: Path):
+    data_path = tmp_path / "run.jsonl"
+    data_path.write_bytes(b"x" * 10000)
+    entries = [offsets.entry_for({"id": str(i)}, i * 10, 9) for i in range(1000)]
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: offsets.write_index(data_path, entries, 10000), range(32)))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run.jsonl", "run.jsonl.idx"]
+    assert len(offsets.read_entries(data_path)) == 1000
+
+
+def test_iter_normalized_projects_fields(storage: JsonlStorage):
+    storage.save_normalized("run", [NormalizedVacancy(id="1", title="Dev", url="u", source="hh", skills=["Go"])])
+
+    assert list(storage.iter_normalized("run", fields=("id", "skills"))) == [{"id": "1", "skills": ["Go"]}]
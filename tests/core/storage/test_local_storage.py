@@ -38,6 +38,7 @@ def temp_storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalStorag
     paths.DATA_DIR = paths.APP_DIR / "data"
     paths.RAW_DIR = paths.DATA_DIR / "raw"
     paths.NORMALIZED_DIR = paths.DATA_DIR / "normalized"
+    monkeypatch.setattr(paths, "CATALOG_PATH", paths.DATA_DIR / "catalog.jsonl")
 
     return LocalStorage()
 
@@ -226,3 +227,19 @@ def test_save_and_load_raw_vacancy_with_empty_id(temp_storage: LocalStorage):
     expected_data = [asdict(v) for v in test_data]
     assert loaded_data == expected_data
 
+
+
+def test_iter_normalized_projects_fields(temp_storage: LocalStorage):
+    vacancies = [
+        NormalizedVacancy(id=str(i), title="Dev", url="u", source="hh", description="long text", skills=["Python"])
+        for i in range(3)
+    ]
+    temp_storage.save_normalized("run", vacancies)
+
+    iterator = temp_storage.iter_normalized("run", fields=["id", "skills"])
+
+    assert next(iterator) == {"id": "0", "skills": ["Python"]}
+    assert list(iterator) == [{"id": "1", "skills": ["Python"]}, {"id": "2", "skills": ["Python"]}]
+    assert list(temp_storage.iter_normalized("run")) == vacancies
+    with pytest.raises(ValueError):
+        temp_storage.iter_normalized("run", fields=["salary"])
@@ -84,3 +84,45 @@ def test_save_extraction(storage: LocalStorage):
         if expected_path.exists():
             expected_path.unlink()
 
+
+
+@pytest.fixture
+def tmp_storage(tmp_path, monkeypatch: pytest.MonkeyPatch) -> LocalStorage:
+    """Provides a LocalStorage instance writing to a temporary directory."""
+    monkeypatch.setattr(paths, "RAW_DIR", tmp_path / "raw")
+    monkeypatch.setattr(paths, "NORMALIZED_DIR", tmp_path / "normalized")
+    monkeypatch.setattr(paths, "ANALYSIS_DIR", tmp_path / "analysis")
+    monkeypatch.setattr(paths, "EXTRACTION_DIR", tmp_path / "extraction")
+    monkeypatch.setattr(paths, "CATALOG_PATH", tmp_path / "catalog.jsonl")
+    return LocalStorage(chunk_size=2)
+
+
+def test_save_extractions_many_writes_chunks(tmp_storage: LocalStorage):
+    results = (ExtractionResult(vacancy_id=str(i), data=[{"skill": "Python"}]) for i in range(5))
+
+    tmp_storage.save_extractions_many(results)
+
+    chunks = sorted(p.name for p in paths.EXTRACTION_DIR.iterdir())
+    assert len(chunks) == 3
+    assert all(name.endswith(".jsonl") for name in chunks)
+    assert [r.vacancy_id for r in tmp_storage.load_extractions()] == ["0", "1", "2", "3", "4"]
+
+
+def test_load_analyses_prefers_latest_result(tmp_storage: LocalStorage):
+    tmp_storage.save_analyses_many([AnalysisResult(vacancy_id="1", data={"v": 1}), AnalysisResult(vacancy_id="2")])
+    tmp_storage.save_analysis(AnalysisResult(vacancy_id="1", data={"v": 2}))
+
+    loaded = {r.vacancy_id: r.data for r in tmp_storage.load_analyses()}
+
+    assert loaded == {"1": {"v": 2}, "2": {}}
+
+
+def test_dirs_are_created_once_per_instance(tmp_storage: LocalStorage, monkeypatch: pytest.MonkeyPatch):
+    tmp_storage.save_analysis(AnalysisResult(vacancy_id="1"))
+    calls = []
+    monkeypatch.setattr(type(paths.RAW_DIR), "mkdir", lambda self, **kwargs: calls.append(self))
+
+    tmp_storage.save_analysis(AnalysisResult(vacancy_id="2"))
+    tmp_storage.save_extractions_many([ExtractionResult(vacancy_id="2")])
+
+    assert calls == []
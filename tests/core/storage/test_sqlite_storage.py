@@ -0,0 +1,129 @@
+"""Tests for the SQLiteStorage implementation."""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.analysis.models import AnalysisResult
+from skillradar.core.extract.models import ExtractionResult
+from skillradar.core.fetch.models import RawVacancy
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage.sqlite import SQLiteStorage
+
+
+@pytest.fixture
+def storage(tmp_path: Path):
+    storage = SQLiteStorage(tmp_path / "db" / "skillradar.sqlite3", batch_size=2)
+    yield storage
+    storage.close()
+
+
+def vacancy(vacancy_id: str, location: str, *skills: str) -> NormalizedVacancy:
+    return NormalizedVacancy(
+        id=vacancy_id, title=f"Dev {vacancy_id}", url=f"https://hh.ru/vacancy/{vacancy_id}",
+        source="hh", skills=list(skills), location=location,
+    )
+
+
+def test_raw_round_trip(storage: SQLiteStorage):
+    storage.save_raw("run", (RawVacancy(id=str(i), name=f"Vacancy {i}") for i in range(5)))
+    storage.save_raw("meta", {"query": "python"})
+
+    assert [item["id"] for item in storage.load_raw("run")] == ["0", "1", "2", "3", "4"]
+    assert storage.load_raw("meta") == {"query": "python"}
+
+
+def test_normalized_round_trip_and_replace(storage: SQLiteStorage):
+    vacancies = [vacancy("1", "Москва", "Python", "Django"), vacancy("2", "Казань"), vacancy("3", "Москва", "Go")]
+    storage.save_normalized("run", [vacancy("9", "Москва", "Java")])
+
+    storage.save_normalized("run", iter(vacancies))
+
+    assert storage.load_normalized("run") == vacancies
+    assert storage.count_vacancies(skill="java") == 0
+
+
+def test_missing_snapshot_raises(storage: SQLiteStorage):
+    storage.save_normalized("run", [])
+
+    with pytest.raises(FileNotFoundError):
+        storage.load_raw("run")
+    with pytest.raises(FileNotFoundError):
+        storage.load_normalized("missing")
+
+
+def test_count_vacancies_by_skill_location_and_date(storage: SQLiteStorage):
+    storage.save_normalized("monday", [vacancy("1", "Москва", "Python", "Django"), vacancy("2", "Казань", "Django")])
+    storage.save_normalized("tuesday", [vacancy("1", "Москва", "Django"), vacancy("3", "москва", "Django", "Go")])
+    now = datetime.now(timezone.utc)
+
+    assert storage.count_vacancies(skill="django", location="Москва", since=now - timedelta(days=7)) == 2
+    assert storage.count_vacancies(skill="Django") == 3
+    assert storage.count_vacancies(skill="Django", snapshot="monday") == 2
+    assert storage.count_vacancies(location="Казань", source="hh") == 1
+    assert storage.count_vacancies(since=now + timedelta(minutes=1)) == 0
+
+
+def test_database_uses_wal_and_indexes(storage: SQLiteStorage):
+    storage.save_normalized("run", [vacancy("1", "Москва", "Python")])
+
+    db = sqlite3.connect(storage.path)
+    assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM vacancy_skills WHERE skill_key = ?", ("python",)
+    ).fetchall()
+    db.close()
+    assert "vacancy_skills_skill" in str(plan)
+
+
+def test_analysis_and_extraction_results(storage: SQLiteStorage):
+    storage.save_analysis(AnalysisResult(vacancy_id="1", data={"seniority": "middle"}))
+    storage.save_extraction(ExtractionResult(vacancy_id="1", data=[{"skill": "Python"}]))
+    storage.save_extraction(ExtractionResult(vacancy_id="1", data=[{"skill": "Go"}]))
+
+    assert storage.load_analysis("1") == AnalysisResult(vacancy_id="1", data={"seniority": "middle"})
+    assert storage.load_extraction("1") == ExtractionResult(vacancy_id="1", data=[{"skill": "Go"}])
+    assert storage.load_analysis("2") is None
+
+
+def test_bulk_results_round_trip(storage: SQLiteStorage):
+    storage.save_extractions_many(ExtractionResult(vacancy_id=str(i), data=[{"skill": "Go"}]) for i in range(5))
+    storage.save_analyses_many([AnalysisResult(vacancy_id="1", data={"v": 1})])
+
+    assert [r.vacancy_id for r in storage.load_extractions()] == ["0", "1", "2", "3", "4"]
+    assert storage.load_analyses() == [AnalysisResult(vacancy_id="1", data={"v": 1})]
+
+
+def test_get_normalized_by_id(storage: SQLiteStorage):
+    storage.save_normalized("run", [vacancy("1", "Москва", "Python"), vacancy("2", "Казань", "Go", "SQL")])
+
+    assert storage.get_normalized("run", "2") == vacancy("2", "Казань", "Go", "SQL")
+    assert storage.get_normalized("run", "3") is None
+
+
+def test_iter_normalized_pages_and_projects(storage: SQLiteStorage):
+    vacancies = [vacancy(str(i), "Москва", "Python", str(i)) for i in range(5)]
+    storage.save_normalized("run", vacancies)
+
+    assert list(storage.iter_normalized("run")) == vacancies
+    assert [v["skills"] for v in storage.iter_normalized("run", fields=["skills"])][4] == ["Python", "4"]
+    assert list(storage.iter_normalized("run", fields=["id", "location"]))[0] == {"id": "0", "location": "Москва"}
+
+
+def test_snapshot_columns_are_added_to_an_existing_database(tmp_path: Path):
+    path = tmp_path / "old.sqlite3"
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "CREATE TABLE snapshots (name TEXT PRIMARY KEY, created_at TEXT NOT NULL,"
+            " raw_kind TEXT, has_normalized INTEGER NOT NULL DEFAULT 0)"
+        )
+        db.execute("INSERT INTO snapshots (name, created_at) VALUES ('old', '2025-01-01T00:00:00+00:00')")
+    db.close()
+
+    storage = SQLiteStorage(path)
+    storage.describe_snapshot("old", query="python")
+
+    assert storage.latest_snapshot(query="python").name == "old"
+    storage.close()
@@ -0,0 +1,101 @@
+"""Tests for storage roots, namespaces and result sharding."""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.analysis.models import AnalysisResult
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage import paths
+from skillradar.core.storage.blobs import BlobStore
+from skillradar.core.storage.jsonl import JsonlStorage
+from skillradar.core.storage.local import LocalStorage
+
+
+@pytest.fixture(autouse=True)
+def no_default_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Nothing may be written to the default directories when a root is given
+    monkeypatch.setattr(paths, "DATA_DIR", tmp_path / "default")
+    for attr in ("RAW_DIR", "NORMALIZED_DIR", "ANALYSIS_DIR", "EXTRACTION_DIR", "BLOB_DIR", "CATALOG_PATH"):
+        monkeypatch.setattr(paths, attr, tmp_path / "default" / attr.lower())
+
+
+def vacancy(vacancy_id: str, description: str = "") -> NormalizedVacancy:
+    return NormalizedVacancy(id=vacancy_id, title="Dev", url="u", source="hh", description=description)
+
+
+def test_root_holds_all_data(tmp_path: Path):
+    storage = LocalStorage(root=tmp_path / "fast")
+    storage.save_normalized("run", [vacancy("1")])
+    storage.save_analysis(AnalysisResult(vacancy_id="1"))
+
+    assert (tmp_path / "fast" / "normalized" / "run.json").exists()
+    assert (tmp_path / "fast" / "analysis" / "1.json").exists()
+    assert storage.latest_snapshot().name == "run"
+    assert not (tmp_path / "default").exists()
+
+
+def test_namespaces_write_the_same_names_in_parallel(tmp_path: Path):
+    def run(namespace: str) -> None:
+        storage = LocalStorage(root=tmp_path, namespace=namespace)
+        storage.save_normalized("vacancies_20250101_000000", [vacancy(namespace)])
+
+    namespaces = [f"run-{i}" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(run, namespaces))
+
+    for namespace in namespaces:
+        storage = LocalStorage(root=tmp_path, namespace=namespace)
+        assert [v.id for v in storage.load_normalized("vacancies_20250101_000000")] == [namespace]
+        assert len(storage.list_snapshots()) == 1
+
+
+@pytest.mark.parametrize("namespace", ["", "..", "a/b", ".hidden"])
+def test_invalid_namespace_is_rejected(tmp_path: Path, namespace: str):
+    with pytest.raises(ValueError):
+        LocalStorage(root=tmp_path, namespace=namespace)
+
+
+def test_sharded_results_are_loaded_with_flat_ones(tmp_path: Path):
+    flat = LocalStorage(root=tmp_path)
+    flat.save_analysis(AnalysisResult(vacancy_id="1", data={"v": "flat"}))
+    sharded = LocalStorage(root=tmp_path, shard_depth=2)
+    for i in range(1, 4):
+        sharded.save_analysis(AnalysisResult(vacancy_id=str(i), data={"v": "sharded"}))
+
+    shard_files = [f.relative_to(tmp_path / "analysis") for f in (tmp_path / "analysis").glob("*/*/*.json")]
+    assert len(shard_files) == 3
+    assert all(len(f.parts[0]) == 2 for f in shard_files)
+    assert {(r.vacancy_id, r.data["v"]) for r in flat.load_analyses()} == {
+        ("1", "sharded"), ("2", "sharded"), ("3", "sharded"),
+    }
+
+
+def test_shard_directories_are_created_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    storage = LocalStorage(root=tmp_path, shard_depth=1)
+    mkdir = Path.mkdir
+    created = []
+
+    def counting_mkdir(self, *args, **kwargs):
+        created.append(self)
+        mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+    for _ in range(3):
+        storage.save_analysis(AnalysisResult(vacancy_id="1", data={}))
+
+    shard_dirs = [directory for directory in created if directory.parent == tmp_path / "analysis"]
+    assert len(shard_dirs) == 1
+
+
+def test_garbage_collection_keeps_blobs_of_other_namespaces(tmp_path: Path):
+    blobs = BlobStore(tmp_path / "blobs")
+    JsonlStorage(root=tmp_path, namespace="a", blobs=blobs).save_normalized("run", [vacancy("1", "kept text")])
+    b = LocalStorage(root=tmp_path, namespace="b", blobs=blobs)
+    b.save_normalized("run", [vacancy("2", "dropped text")])
+    b.save_normalized("run", [])
+
+    assert b.collect_garbage(grace=0) == 1
+    assert blobs.get(hashlib.sha256(b"kept text").hexdigest()) == "kept text"
@@ -0,0 +1,132 @@
+"""Tests for atomic commits and background writes."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.analysis.models import AnalysisResult
+from skillradar.core.normalize.models import NormalizedVacancy
+from skillradar.core.storage import paths
+from skillradar.core.storage.local import LocalStorage
+from skillradar.core.storage.writer import BackgroundWriter, atomic_open
+
+
+@pytest.fixture(autouse=True)
+def data_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    for attr in ("RAW_DIR", "NORMALIZED_DIR", "ANALYSIS_DIR", "EXTRACTION_DIR", "BLOB_DIR"):
+        monkeypatch.setattr(paths, attr, tmp_path / attr.lower())
+    monkeypatch.setattr(paths, "CATALOG_PATH", tmp_path / "catalog.jsonl")
+
+
+def test_atomic_open_keeps_previous_file_on_error(tmp_path: Path):
+    target = tmp_path / "snapshot.json"
+    target.write_text("old", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(target) as f:
+            f.write("half-writ")
+            raise RuntimeError("crash")
+
+    assert target.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["snapshot.json"]
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_failed_save_leaves_no_snapshot(write_behind: bool):
+    def broken():
+        yield from ({"id": str(i)} for i in range(5))
+        raise RuntimeError("fetch failed")
+
+    with LocalStorage(chunk_size=2, write_behind=write_behind) as storage:
+        with pytest.raises(RuntimeError):
+            storage.save_raw("run", broken())
+        storage.flush()
+
+        assert list(paths.RAW_DIR.iterdir()) == []
+
+
+def test_background_writer_blocks_when_queue_is_full():
+    release = threading.Event()
+    done = []
+    writer = BackgroundWriter(max_pending=1)
+    writer.submit(release.wait)
+    writer.submit(done.append, 1)
+
+    submitted = threading.Event()
+    thread = threading.Thread(target=lambda: (writer.submit(done.append, 2), submitted.set()))
+    thread.start()
+    assert not submitted.wait(0.1)
+
+    release.set()
+    thread.join(1)
+    writer.close()
+    assert done == [1, 2]
+
+
+def test_background_writer_reraises_job_errors():
+    def fail():
+        raise OSError("disk full")
+
+    writer = BackgroundWriter()
+    writer.submit(fail)
+
+    with pytest.raises(OSError, match="disk full"):
+        writer.flush()
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit(print)
+
+
+def test_callbacks_after_a_failed_job_are_skipped():
+    calls = []
+
+    def fail():
+        raise OSError("disk full")
+
+    writer = BackgroundWriter()
+    writer.submit(fail)
+    writer.submit_callback(lambda: calls.append("after failure"))
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.submit_callback(lambda: calls.append("after flush"))
+    writer.close()
+
+    assert calls == ["after flush"]
+
+
+def test_write_behind_storage_round_trips():
+    vacancy = NormalizedVacancy(id="1", title="Dev", url="u", source="hh", skills=["Python"])
+
+    with LocalStorage(write_behind=True, max_pending=2) as storage:
+        storage.save_raw("run", ({"id": str(i)} for i in range(3)))
+        storage.save_normalized("run", [vacancy])
+        storage.save_analysis(AnalysisResult(vacancy_id="1", data={"seniority": "middle"}))
+
+        assert storage.load_raw("run") == [{"id": "0"}, {"id": "1"}, {"id": "2"}]
+        assert storage.load_normalized("run") == [vacancy]
+        assert [result.vacancy_id for result in storage.load_analyses()] == ["1"]
+
+    assert (paths.NORMALIZED_DIR / "run.json").exists()
+
+
+def test_write_behind_queues_generators_in_chunks():
+    produced = []
+    release = threading.Event()
+
+    def vacancies():
+        for i in range(100):
+            produced.append(i)
+            yield {"id": str(i)}
+
+    with LocalStorage(chunk_size=10, write_behind=True, max_pending=1) as storage:
+        storage._submit(release.wait)
+        saver = threading.Thread(target=storage.save_raw, args=("run", vacancies()))
+        saver.start()
+        saver.join(0.2)
+        # The writer is busy, so the save waits with one chunk in hand
+        assert len(produced) == 10
+        release.set()
+        saver.join(5)
+
+        assert storage.load_raw("run") == [{"id": str(i)} for i in range(100)]
@@ -0,0 +1,53 @@
+"""Tests for the pipeline run journal."""
+
+from pathlib import Path
+
+import pytest
+
+from skillradar.core.checkpoint import RunCheckpoint
+from skillradar.core.normalize.models import NormalizationError, NormalizedVacancy
+
+
+def test_journal_is_read_back(tmp_path: Path):
+    checkpoint = RunCheckpoint("run", tmp_path)
+    assert not checkpoint.started
+    vacancy = NormalizedVacancy(id="1", title="Dev", url="u", source="hh", skills=["Go"])
+    checkpoint.start("vacancies_1", {"search_query": "go", "areas": ("1", "2")})
+    checkpoint.record_fetched(0, {"id": "1", "name": "Dev"})
+    checkpoint.record_fetched(1, {"id": "2", "name": "QA"})
+    checkpoint.record_normalized(0, vacancy)
+    checkpoint.record_failed(NormalizationError(index=1, vacancy_id="2", message="ValueError: bad"))
+    checkpoint.record_done("analyze", 0)
+
+    restored = RunCheckpoint("run", tmp_path)
+
+    assert restored.started and not restored.finished
+    assert restored.snapshot == "vacancies_1"
+    assert restored.fetched_ids() == {"1", "2"}
+    assert restored.normalized == {0: vacancy}
+    assert restored.errors[1].vacancy_id == "2"
+    assert restored.done == {"analyze": {0}}
+    restored.check_params({"search_query": "go", "areas": ["1", "2"]})
+    with pytest.raises(ValueError):
+        restored.check_params({"search_query": "go"})
+
+
+def test_torn_last_line_is_skipped(tmp_path: Path):
+    checkpoint = RunCheckpoint("run", tmp_path)
+    checkpoint.start("vacancies_1", {})
+    checkpoint.record_fetched(0, {"id": "1"})
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"fetched":1,"raw":{"id"')
+
+    resumed = RunCheckpoint("run", tmp_path)
+    assert resumed.fetched_ids() == {"1"}
+
+    # The torn tail is cut off, so the first record after the crash survives
+    resumed.record_fetched(1, {"id": "2"})
+    assert RunCheckpoint("run", tmp_path).fetched_ids() == {"1", "2"}
+
+
+@pytest.mark.parametrize("run_id", ["", "../x", "a/b", ".hidden"])
+def test_invalid_run_id_is_rejected(tmp_path: Path, run_id: str):
+    with pytest.raises(ValueError):
+        RunCheckpoint(run_id, tmp_path)
@@ -0,0 +1,320 @@
+"""Tests for the Pipeline orchestration."""
+
+import threading
+from pathlib import Path
+from typing import Collection, Iterator, List, Optional
+
+import pytest
+
+from skillradar.core.analysis.base import BaseAnalyzer
+from skillradar.core.analysis.models import AnalysisResult
+from skillradar.core.checkpoint import RunCheckpoint
+from skillradar.core.dedup.minhash import MinHashDeduplicator
+from skillradar.core.extract.base import BaseExtractor
+from skillradar.core.extract.models import ExtractionResult
+from skillradar.core.fetch.base import VacancyFetcher
+from skillradar.core.fetch.models import RawVacancy
+from skillradar.core.normalize.hh import HhNormalizer
+from skillradar.core.pipeline import Pipeline
+from skillradar.core.stages import StageCancelled
+from skillradar.core.storage import local, paths
+from skillradar.core.storage.local import LocalStorage
+from skillradar.core.storage.sqlite import SQLiteStorage
+
+
+class StreamingFetcher(VacancyFetcher):
+    """Yields vacancies one by one and records when each one was produced."""
+
+    def __init__(self, count: int, events: List[str]):
+        self.count = count
+        self.events = events
+
+    def fetch(self, **kwargs) -> List[RawVacancy]:
+        raise AssertionError("Pipeline should consume iter_fetch")
+
+    def iter_fetch(self, **kwargs) -> Iterator[RawVacancy]:
+        for i in range(1, self.count + 1):
+            self.events.append(f"fetch {i}")
+            yield RawVacancy(id=str(i), name=f"Vacancy {i}", description="text", area={"name": "Москва"})
+
+
+class FlakyFetcher(VacancyFetcher):
+    """Serves vacancies 1..count in search order and dies after ``fail_after`` of them."""
+
+    def __init__(self, count: int, fail_after: Optional[int] = None):
+        self.count = count
+        self.fail_after = fail_after
+        self.fetched: List[str] = []
+
+    def fetch(self, **kwargs) -> List[RawVacancy]:
+        raise AssertionError("Pipeline should consume iter_fetch")
+
+    def iter_fetch(
+        self, *, search_query: str, total_vacancies: int, skip_ids: Collection[str] = (), **kwargs
+    ) -> Iterator[RawVacancy]:
+        ids = [str(i) for i in range(1, self.count + 1) if str(i) not in skip_ids][:total_vacancies]
+        for vacancy_id in ids:
+            if self.fail_after is not None and len(self.fetched) == self.fail_after:
+                raise ConnectionError("connection reset")
+            self.fetched.append(vacancy_id)
+            yield RawVacancy(id=vacancy_id, name=f"Vacancy {vacancy_id}", description="text")
+
+
+class KeywordExtractor(BaseExtractor):
+    def extract(self, vacancy_id: str, text: str) -> ExtractionResult:
+        return ExtractionResult(vacancy_id=vacancy_id, data=[{"skill": word} for word in text.split()])
+
+
+class LengthAnalyzer(BaseAnalyzer):
+    def analyze(self, vacancy_id: str, text: str) -> AnalysisResult:
+        return AnalysisResult(vacancy_id=vacancy_id, data={"length": len(text)})
+
+
+class RecordingNormalizer(HhNormalizer):
+    def __init__(self, events: List[str]):
+        self.events = events
+
+    def normalize(self, raw_data):
+        self.events.append(f"normalize {raw_data.id}")
+        return super().normalize(raw_data)
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalStorage:
+    data_dir = tmp_path / "data"
+    monkeypatch.setattr(paths, "DATA_DIR", data_dir)
+    monkeypatch.setattr(paths, "RAW_DIR", data_dir / "raw")
+    monkeypatch.setattr(paths, "NORMALIZED_DIR", data_dir / "normalized")
+    monkeypatch.setattr(paths, "ANALYSIS_DIR", data_dir / "analysis")
+    monkeypatch.setattr(paths, "EXTRACTION_DIR", data_dir / "extraction")
+    monkeypatch.setattr(paths, "CATALOG_PATH", data_dir / "catalog.jsonl")
+    return LocalStorage()
+
+
+def test_run_normalizes_while_fetching(storage: LocalStorage):
+    normalized = threading.Event()
+
+    class WaitingFetcher(StreamingFetcher):
+        def iter_fetch(self, **kwargs) -> Iterator[RawVacancy]:
+            for i, vacancy in enumerate(super().iter_fetch(**kwargs)):
+                # The second vacancy is only fetched once the first one went through normalize
+                if i == 1:
+                    assert normalized.wait(5)
+                yield vacancy
+
+    class SignallingNormalizer(HhNormalizer):
+        def normalize(self, raw_data):
+            result = super().normalize(raw_data)
+            normalized.set()
+            return result
+
+    pipeline = Pipeline(fetcher=WaitingFetcher(3, []), normalizer=SignallingNormalizer(), storage=storage)
+
+    vacancies = pipeline.run(search_query="python", total_vacancies=3)
+
+    assert [v.id for v in vacancies] == ["1", "2", "3"]
+
+
+def test_run_keeps_fetch_order_with_parallel_stages(storage: LocalStorage):
+    events: List[str] = []
+    pipeline = Pipeline(
+        fetcher=StreamingFetcher(50, events),
+        normalizer=RecordingNormalizer(events),
+        storage=storage,
+        extractor=KeywordExtractor(),
+        analyzer=LengthAnalyzer(),
+        normalize_workers=4,
+        extract_workers=2,
+        analyze_workers=3,
+        queue_size=2,
+    )
+
+    vacancies = pipeline.run(search_query="python", total_vacancies=50)
+
+    assert [v.id for v in vacancies] == [str(i) for i in range(1, 51)]
+    assert sorted(r.vacancy_id for r in storage.load_extractions()) == sorted(v.id for v in vacancies)
+    assert {r.data["length"] for r in storage.load_analyses()} == {4}
+
+
+def test_stage_error_stops_run(storage: LocalStorage):
+    class FailingAnalyzer(BaseAnalyzer):
+        def analyze(self, vacancy_id: str, text: str) -> AnalysisResult:
+            raise RuntimeError("analyzer is down")
+
+    pipeline = Pipeline(
+        fetcher=StreamingFetcher(1000, []), normalizer=HhNormalizer(), storage=storage, analyzer=FailingAnalyzer()
+    )
+
+    with pytest.raises(RuntimeError, match="analyzer is down"):
+        pipeline.run(search_query="python", total_vacancies=1000)
+    assert list(paths.NORMALIZED_DIR.glob("*.json")) == []
+
+
+def test_cancel_stops_run(storage: LocalStorage):
+    class CancellingAnalyzer(BaseAnalyzer):
+        def analyze(self, vacancy_id: str, text: str) -> AnalysisResult:
+            pipeline.cancel()
+            return AnalysisResult(vacancy_id=vacancy_id)
+
+    pipeline = Pipeline(
+        fetcher=StreamingFetcher(10**6, []), normalizer=HhNormalizer(), storage=storage, analyzer=CancellingAnalyzer()
+    )
+
+    with pytest.raises(StageCancelled):
+        pipeline.run(search_query="python", total_vacancies=10**6)
+    assert list(paths.RAW_DIR.glob("*.json")) == []
+
+
+def test_run_saves_raw_and_normalized_snapshots(storage: LocalStorage):
+    pipeline = Pipeline(fetcher=StreamingFetcher(2, []), normalizer=HhNormalizer(), storage=storage)
+
+    vacancies = pipeline.run(search_query="python", total_vacancies=2)
+
+    [raw_file] = paths.RAW_DIR.glob("vacancies_*.json")
+    name = raw_file.stem
+    assert [item["id"] for item in storage.load_raw(name)] == ["1", "2"]
+    assert storage.load_normalized(name) == vacancies
+    assert vacancies[0].location == "Москва"
+
+
+def test_renormalize_rewrites_normalized_snapshot(storage: LocalStorage):
+    storage.save_raw("archive", [{"id": "1", "name": "Dev", "area": {"name": "Казань"}}, {"id": "2"}])
+    pipeline = Pipeline(fetcher=StreamingFetcher(0, []), normalizer=HhNormalizer(), storage=storage)
+
+    vacancies = pipeline.renormalize("archive", workers=2, chunk_size=1)
+
+    assert storage.load_normalized("archive") == vacancies
+    assert [v.location for v in vacancies] == ["Казань"]
+    assert [(e.index, e.vacancy_id) for e in pipeline.errors] == [(1, "2")]
+
+
+def test_interrupted_run_resumes_from_checkpoint(storage: LocalStorage, tmp_path: Path):
+    events: List[str] = []
+    first = Pipeline(
+        fetcher=FlakyFetcher(10, fail_after=6),
+        normalizer=RecordingNormalizer(events),
+        storage=storage,
+        analyzer=LengthAnalyzer(),
+        checkpoint_dir=tmp_path / "runs",
+    )
+    with pytest.raises(ConnectionError):
+        first.run(run_id="nightly", search_query="python", total_vacancies=8)
+    # What was fetched before the failure is saved; the normalized snapshot is not
+    [snapshot] = storage.list_snapshots()
+    assert len(storage.load_raw(snapshot.name)) == 6
+    assert list(paths.NORMALIZED_DIR.glob("*.json")) == []
+
+    events.clear()
+    fetcher = FlakyFetcher(10)
+    second = Pipeline(
+        fetcher=fetcher,
+        normalizer=RecordingNormalizer(events),
+        storage=storage,
+        analyzer=LengthAnalyzer(),
+        checkpoint_dir=tmp_path / "runs",
+    )
+    vacancies = second.run(run_id="nightly", search_query="python", total_vacancies=8)
+
+    assert fetcher.fetched == ["7", "8"]
+    assert events == ["normalize 7", "normalize 8"]
+    assert [v.id for v in vacancies] == [str(i) for i in range(1, 9)]
+    [snapshot] = storage.list_snapshots()
+    assert [item["id"] for item in storage.load_raw(snapshot.name)] == [str(i) for i in range(1, 9)]
+    assert storage.load_normalized(snapshot.name) == vacancies
+    assert len(storage.load_analyses()) == 8
+
+
+def test_finished_or_changed_run_is_not_resumed(storage: LocalStorage, tmp_path: Path):
+    pipeline = Pipeline(
+        fetcher=FlakyFetcher(3), normalizer=HhNormalizer(), storage=storage, checkpoint_dir=tmp_path / "runs"
+    )
+    pipeline.run(run_id="done", search_query="python", total_vacancies=3)
+
+    with pytest.raises(ValueError, match="already finished"):
+        pipeline.run(run_id="done", search_query="python", total_vacancies=3)
+
+    pipeline.fetcher = FlakyFetcher(3, fail_after=1)
+    with pytest.raises(ConnectionError):
+        pipeline.run(run_id="broken", search_query="python", total_vacancies=3)
+    with pytest.raises(ValueError, match="cannot resume"):
+        pipeline.run(run_id="broken", search_query="java", total_vacancies=3)
+
+
+def test_done_marks_wait_for_background_writes(storage: LocalStorage, tmp_path: Path, monkeypatch):
+    write_result = local._write_result
+    calls = []
+
+    def disk_full_once(file_path: Path, record) -> None:
+        calls.append(file_path)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        write_result(file_path, record)
+
+    monkeypatch.setattr(local, "_write_result", disk_full_once)
+    background = LocalStorage(write_behind=True)
+    pipeline = Pipeline(
+        fetcher=FlakyFetcher(5),
+        normalizer=HhNormalizer(),
+        storage=background,
+        analyzer=LengthAnalyzer(),
+        checkpoint_dir=tmp_path / "runs",
+    )
+
+    with pytest.raises(OSError, match="disk full"):
+        pipeline.run(run_id="nightly", search_query="python", total_vacancies=5)
+    background.close()
+
+    # Nothing is marked done after the failed write, so a resumed run analyzes those vacancies again
+    checkpoint = RunCheckpoint("nightly", tmp_path / "runs")
+    assert checkpoint.done == {}
+    assert not checkpoint.finished
+
+
+def test_dedup_stage_drops_reposts(storage: LocalStorage, tmp_path: Path):
+    class RepostingFetcher(StreamingFetcher):
+        def iter_fetch(self, **kwargs) -> Iterator[RawVacancy]:
+            texts = ["Python backend, Django and PostgreSQL, remote work", "Go developer for a payments team"]
+            for i in range(1, self.count + 1):
+                yield RawVacancy(id=str(i), name="Developer", description=texts[i % 2], area={"name": f"Area {i}"})
+
+    pipeline = Pipeline(
+        fetcher=RepostingFetcher(6, []),
+        normalizer=HhNormalizer(),
+        storage=storage,
+        analyzer=LengthAnalyzer(),
+        deduplicator=MinHashDeduplicator(tmp_path / "minhash.jsonl"),
+    )
+
+    vacancies = pipeline.run(search_query="python", total_vacancies=6)
+
+    assert [v.id for v in vacancies] == ["1", "2"]
+    assert sorted((d.vacancy_id, d.duplicate_of) for d in pipeline.duplicates) == [
+        ("3", "1"), ("4", "2"), ("5", "1"), ("6", "2"),
+    ]
+    assert sorted(r.vacancy_id for r in storage.load_analyses()) == ["1", "2"]
+    [snapshot] = storage.list_snapshots()
+    assert len(storage.load_raw(snapshot.name)) == 6
+
+
+def test_sqlite_storage_does_not_block_result_stages(tmp_path: Path):
+    storage = SQLiteStorage(tmp_path / "db.sqlite3", batch_size=16)
+    pipeline = Pipeline(
+        fetcher=StreamingFetcher(200, []),
+        normalizer=HhNormalizer(),
+        storage=storage,
+        extractor=KeywordExtractor(),
+        queue_size=4,
+    )
+    result: List[List] = []
+    # The raw snapshot used to be written in one transaction that the extract stage waited for
+    runner = threading.Thread(
+        target=lambda: result.append(pipeline.run(search_query="python", total_vacancies=200)), daemon=True
+    )
+    runner.start()
+    runner.join(30)
+
+    assert not runner.is_alive(), "pipeline deadlocked"
+    [vacancies] = result
+    [snapshot] = storage.list_snapshots()
+    assert len(storage.load_raw(snapshot.name)) == len(vacancies) == 200
+    assert len(storage.load_extractions()) == 200
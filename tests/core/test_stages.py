@@ -0,0 +1,118 @@
+"""Tests for the staged execution engine."""
+
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from skillradar.core.stages import Stage, StageCancelled, StageEngine
+
+
+def test_stages_transform_and_drop_items():
+    engine = StageEngine([
+        Stage("double", lambda x: x * 2, workers=3, queue_size=1),
+        Stage("odd_tens", lambda x: x if x % 20 else None, workers=2),
+    ])
+
+    assert sorted(engine.run(range(100))) == [x * 2 for x in range(100) if (x * 2) % 20]
+
+
+def test_stream_stage_sees_the_whole_stream():
+    seen: List[int] = []
+
+    def collect(items: Iterator[int], emit) -> None:
+        for item in items:
+            emit(item)
+            seen.append(item)
+
+    engine = StageEngine([Stage("collect", collect, stream=True), Stage("inc", lambda x: x + 1)])
+
+    assert list(engine.run(range(5))) == [1, 2, 3, 4, 5]
+    assert seen == [0, 1, 2, 3, 4]
+
+
+def test_bounded_queues_hold_back_the_source():
+    produced: List[int] = []
+    release = threading.Event()
+
+    def source() -> Iterator[int]:
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    def slow(x: int) -> int:
+        release.wait(5)
+        return x
+
+    engine = StageEngine([Stage("slow", slow, queue_size=2)])
+    results = engine.run(source())
+    consumer = threading.Thread(target=lambda: list(results))
+    consumer.start()
+    time.sleep(0.3)
+    # One item is in the stage, two wait in its queue, one is held by the source thread
+    assert len(produced) <= 4
+    release.set()
+    consumer.join(5)
+    assert len(produced) == 100
+
+
+def test_stage_error_is_raised_and_stops_the_source():
+    produced: List[int] = []
+
+    def source() -> Iterator[int]:
+        for i in range(10**6):
+            produced.append(i)
+            yield i
+
+    def fail(x: int) -> int:
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    engine = StageEngine([Stage("fail", fail, queue_size=1)], poll_interval=0.01)
+
+    with pytest.raises(ValueError, match="bad item"):
+        list(engine.run(source()))
+    assert len(produced) < 10
+
+
+def test_cancel_raises_stage_cancelled():
+    engine = StageEngine([Stage("identity", lambda x: x)], poll_interval=0.01)
+    results = engine.run(iter(range(10**6)))
+
+    with pytest.raises(StageCancelled):
+        for item in results:
+            if item == 10:
+                engine.cancel()
+
+
+def test_closing_the_consumer_stops_the_stages():
+    engine = StageEngine([Stage("identity", lambda x: x, workers=2)], poll_interval=0.01)
+    results = engine.run(iter(range(10**6)))
+
+    assert next(results) is not None
+    results.close()
+
+    assert engine.cancelled
+    assert not [t for t in threading.enumerate() if t.name.startswith("stage-")]
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": 0}, {"queue_size": 0}, {"stream": True, "workers": 2}])
+def test_invalid_stage_is_rejected(kwargs):
+    with pytest.raises(ValueError):
+        Stage("bad", lambda x: x, **kwargs)
+
+
+def test_source_error_is_raised_after_the_stages_drain():
+    processed: List[int] = []
+
+    def source() -> Iterator[int]:
+        yield from range(5)
+        raise ConnectionError("connection reset")
+
+    engine = StageEngine([Stage("record", processed.append, queue_size=10)])
+
+    with pytest.raises(ConnectionError):
+        list(engine.run(source()))
+    assert processed == [0, 1, 2, 3, 4]
@@ -0,0 +1,47 @@
+"""End-to-end tests for HHFetcher against the local hh.ru stand-in."""
+
+import pytest
+import requests
+
+from skillradar.core.fetch import partition
+from skillradar.core.fetch.hh import HHFetcher
+from skillradar.core.fetch.ratelimit import AdaptiveRateLimiter
+from skillradar.core.fetch.session import HttpConfig, build_session
+from skillradar.devtools.fake_hh import FakeHHConfig, FakeHHServer
+
+
+def fast_session() -> requests.Session:
+    limiter = AdaptiveRateLimiter(rate=10_000.0, burst=10_000, min_rate=10_000.0, max_rate=10_000.0)
+    return build_session(HttpConfig(backoff_factor=0, max_retries=5), limiter=limiter)
+
+
+def test_fetcher_downloads_details_from_fake_server():
+    with FakeHHServer(FakeHHConfig(vacancies=150, description_size=100)) as server:
+        fetcher = HHFetcher(max_workers=4, session=fast_session(), base_url=server.base_url)
+        vacancies = fetcher.fetch(search_query="python", total_vacancies=120)
+
+    assert len(vacancies) == 120
+    assert len({v.id for v in vacancies}) == 120
+    assert all(len(v.key_skills) == 4 for v in vacancies)
+    assert vacancies[0].area["id"] == "1"
+
+
+def test_injected_failures_are_retried():
+    config = FakeHHConfig(vacancies=60, error_rate=0.1, throttle_rate=0.1, retry_after=0, seed=1)
+    with FakeHHServer(config) as server:
+        fetcher = HHFetcher(max_workers=4, session=fast_session(), base_url=server.base_url)
+        vacancies = fetcher.fetch(search_query="python", total_vacancies=60)
+
+    assert len(vacancies) + len(fetcher.errors) == 60
+    assert server.stats[429] and server.stats[503]
+
+
+def test_search_deeper_than_limit_is_partitioned(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(partition, "MAX_SEARCH_DEPTH", 40)
+    config = FakeHHConfig(vacancies=200, regions=3, max_depth=40, description_size=10)
+    with FakeHHServer(config) as server:
+        fetcher = HHFetcher(session=fast_session(), base_url=server.base_url)
+        vacancies = fetcher.fetch(search_query="python", total_vacancies=500)
+
+    assert len({v.id for v in vacancies}) == 200
+    assert server.stats[400] == 0